@@ -15,19 +15,18 @@
 # limitations under the License.
 #
 
-from nomad.config.models.plugins import SchemaPackageEntryPoint
-from pydantic import Field
+"""Hall measurement schema, readers and parsers for Lake Shore files.
 
+The schema entry point is created on first access. Importing the readers of this
+package therefore does not load the nomad config.
+"""
 
-class HallEntryPoint(SchemaPackageEntryPoint):
+ENTRY_POINTS = ("HallEntryPoint", "schema")
 
-    def load(self):
-        from lakeshore_nomad_plugin.hall.schema import m_package
 
-        return m_package
+def __getattr__(name: str):
+    if name in ENTRY_POINTS:
+        from lakeshore_nomad_plugin.hall import entry_point
 
-
-schema = HallEntryPoint(
-    name="HallSchema",
-    description="Schema package for Hall measurement definitions.",
-)
+        return getattr(entry_point, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,178 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""HDF5 sidecar files holding the result arrays of large measurements.
+
+The arrays of all results of a measurement are moved from the archive dict into
+a chunked and compressed HDF5 file next to the archive. Each result keeps a
+reference to its HDF5 group in `array_file` and the size, minimum and maximum
+of its arrays in `array_summary`. The arrays are read on access with
+`result_array`.
+"""
+
+import io
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from lakeshore_nomad_plugin.hall import measurement as hall_measurement
+
+SIDECAR_SUFFIX = ".h5"
+COMPRESSION = "gzip"
+
+
+def iter_results(hall_data: dict) -> Iterator[Tuple[str, dict]]:
+    """Yields the HDF5 group path and the dict of every result of a measurement.
+
+    Args:
+        hall_data (dict): The `HallMeasurement` as dict.
+
+    Yields:
+        Iterator[Tuple[str, dict]]: The group path and the results dict.
+    """
+    for index, result in enumerate(hall_data.get("results", [])):
+        yield f"/results/{index}", result
+    for step, measurement in enumerate(hall_data.get("measurements", [])):
+        for index, result in enumerate(measurement.get("results", [])):
+            yield f"/measurements/{step}/results/{index}", result
+
+
+def result_arrays(result: dict) -> Dict[str, np.ndarray]:
+    """Returns the non-empty float arrays of a results dict."""
+    arrays = {}
+    for name, value in result.items():
+        if not isinstance(value, (list, np.ndarray)) or not len(value):
+            continue
+        array = np.asarray(value)
+        if array.ndim == 1 and array.dtype.kind == "f":
+            arrays[name] = array
+    return arrays
+
+
+def array_bytes(hall_data: dict) -> int:
+    """Returns the size of all result arrays of a measurement in bytes."""
+    return sum(
+        array.nbytes
+        for _, result in iter_results(hall_data)
+        for array in result_arrays(result).values()
+    )
+
+
+def summarize(array: np.ndarray) -> Dict[str, Any]:
+    """Returns the size, minimum and maximum of an array, ignoring NaN."""
+    if np.isnan(array).all():
+        return {"size": int(array.size), "min": None, "max": None}
+    return {
+        "size": int(array.size),
+        "min": float(np.nanmin(array)),
+        "max": float(np.nanmax(array)),
+    }
+
+
+def result_unit(result: dict, name: str) -> Optional[str]:
+    """Returns the unit of a result quantity from the `m_def` of the result."""
+    section_class = getattr(
+        hall_measurement, result.get("m_def", "").rsplit(".", 1)[-1], None
+    )
+    if section_class is None:
+        return None
+    quantity = section_class.m_def.all_quantities.get(name)
+    if quantity is None or quantity.unit is None:
+        return None
+    return str(quantity.unit)
+
+
+def store_arrays(hall_data: dict, filename: str) -> bytes:
+    """
+    Moves the result arrays of a measurement into an HDF5 file.
+
+    The arrays are removed from `hall_data` and replaced by the reference to
+    their group in `filename` and their summary.
+
+    Args:
+        hall_data (dict): The `HallMeasurement` as dict, changed in place.
+        filename (str): The upload path of the HDF5 file.
+
+    Returns:
+        bytes: The content of the HDF5 file.
+    """
+    import h5py
+
+    buffer = io.BytesIO()
+    with h5py.File(buffer, "w") as file:
+        for path, result in iter_results(hall_data):
+            arrays = result_arrays(result)
+            if not arrays:
+                continue
+            group = file.require_group(path)
+            summary = {}
+            for name, array in arrays.items():
+                dataset = group.create_dataset(
+                    name,
+                    data=array.astype(np.float64, copy=False),
+                    chunks=True,
+                    compression=COMPRESSION,
+                )
+                unit = result_unit(result, name)
+                if unit is not None:
+                    dataset.attrs["units"] = unit
+                summary[name] = summarize(array)
+                del result[name]
+            result["array_file"] = f"{filename}#{path}"
+            result["array_summary"] = summary
+    return buffer.getvalue()
+
+
+def read_array(context, reference: str, name: str) -> np.ndarray:
+    """
+    Reads a single array from an HDF5 sidecar file.
+
+    Args:
+        context: The upload context providing `raw_file`.
+        reference (str): The `array_file` reference of the results.
+        name (str): The name of the array.
+
+    Returns:
+        np.ndarray: The array in the unit of its quantity.
+    """
+    import h5py
+
+    filename, path = reference.split("#", 1)
+    with context.raw_file(filename, "rb") as raw_file:
+        with h5py.File(raw_file, "r") as file:
+            return file[path][name][()]
+
+
+def result_array(section, name: str, context=None) -> Any:
+    """
+    Returns an array of a results section, wherever it is stored.
+
+    Args:
+        section (ArrayResults): The results section.
+        name (str): The name of the array quantity.
+        context (optional): The upload context. Defaults to the context of the
+            section.
+
+    Returns:
+        Any: The array, as pint quantity if the quantity has a unit.
+    """
+    value = getattr(section, name)
+    if value is not None or section.array_file is None:
+        return value
+    array = read_array(context or section.m_context, section.array_file, name)
+    unit = section.m_def.all_quantities[name].unit
+    return array if unit is None else array * unit
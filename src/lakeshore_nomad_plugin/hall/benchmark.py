@@ -0,0 +1,488 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Benchmarks of the parse, populate and serialize pipeline.
+
+Every stage of the pipeline is timed separately on each file, and its
+throughput and peak memory are recorded. The results are written as a JSON
+baseline which can be compared against the baseline of another release:
+
+    python -m lakeshore_nomad_plugin.hall.benchmark tests/data/hall/*.txt \\
+        --scale 1 16 --output benchmarks/baselines/0.0.1.json
+
+    python -m lakeshore_nomad_plugin.hall.benchmark tests/data/hall/*.txt \\
+        --scale 1 16 --compare benchmarks/baselines/0.0.1.json
+
+Production sized files are generated with `--synthetic-steps`, e.g.
+`--synthetic-steps 100 1000`.
+
+The startup cost of the plugin modules is checked against `IMPORT_BUDGETS` with
+`--import-times`, which prints the `python -X importtime` breakdown.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lakeshore_nomad_plugin.hall import reader, synthetic, utils
+from lakeshore_nomad_plugin.hall.cache import plugin_version
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    parse_file,
+    populate_archive,
+)
+from lakeshore_nomad_plugin.hall.rawfile import read_text
+from lakeshore_nomad_plugin.hall.schema import HallMeasurement
+
+STAGES = (
+    "parse_file",
+    "populate_archive",
+    "parse_txt",
+    "get_measurements",
+    "get_instrument",
+    "m_to_dict",
+    "create_archive",
+)
+STEP_HEADER = re.compile(r"<Step\s*\d+:")
+MEGABYTE = 1024**2
+
+# The import time in seconds allowed for the modules which are loaded without
+# parsing anything, e.g. by the nomad entry points or the reader CLIs.
+IMPORT_BUDGETS = {
+    "lakeshore_nomad_plugin.hall": 0.5,
+    "lakeshore_nomad_plugin.hall.measurement_parser": 3.0,
+    "lakeshore_nomad_plugin.hall.reader": 1.0,
+    "lakeshore_nomad_plugin.hall.timestamps": 1.0,
+}
+# Heavy dependencies which the functions using them import on first use
+LAZY_IMPORTS = (
+    "pandas",
+    "yaml",
+    "pytz",
+    "h5py",
+    "nomad.units",
+    "nomad.datamodel",
+    "lakeshore_nomad_plugin.hall.instrument",
+    "lakeshore_nomad_plugin.hall.measurement",
+)
+IMPORT_TIME_LINE = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StageResult:
+    """The timing of one pipeline stage on one file.
+
+    Args:
+        file (str): The name of the benchmarked file.
+        stage (str): The name of the stage, one of `STAGES`.
+        lines (int): The number of lines of the file.
+        bytes (int): The size of the file.
+        seconds (float): The best time of all rounds.
+        peak_memory (int): The peak of traced memory allocations in bytes.
+    """
+
+    file: str
+    stage: str
+    lines: int
+    bytes: int
+    seconds: float
+    peak_memory: int
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds else float("inf")
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes / MEGABYTE / self.seconds if self.seconds else float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(
+            asdict(self),
+            lines_per_second=self.lines_per_second,
+            mb_per_second=self.mb_per_second,
+        )
+
+
+class DirectoryContext:
+    """A minimal upload context which writes archives into a local directory."""
+
+    upload_id = "benchmark"
+
+    class Upload:
+        def process_updated_raw_file(self, filename, allow_modify=False):
+            pass
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.upload = self.Upload()
+
+    def raw_path_exists(self, path: str) -> bool:
+        return os.path.exists(os.path.join(self.directory, path))
+
+    def raw_file(self, path: str, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+
+def measure(function: Callable[[], Any], rounds: int) -> Tuple[float, int, Any]:
+    """Times a function and traces its peak memory in an extra round.
+
+    Args:
+        function (Callable[[], Any]): The benchmarked function.
+        rounds (int): The number of timed rounds.
+
+    Returns:
+        Tuple[float, int, Any]: The best time, the memory peak and the last result.
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def is_measurement_file(text: str) -> bool:
+    return "[Measurements]" in text
+
+
+def benchmark_file(
+    path: str, rounds: int = 3, file_type: str = "yaml"
+) -> List[StageResult]:
+    """Runs all pipeline stages which apply to a file.
+
+    Measurement files go through `parse_file`, `populate_archive`, `parse_txt`
+    and `get_measurements`, HMS configuration files through `parse_txt` and
+    `get_instrument`. Both are serialized with `m_to_dict` and `create_archive`.
+
+    Args:
+        path (str): The path of the Lake Shore file.
+        rounds (int, optional): The number of timed rounds per stage. Defaults to 3.
+        file_type (str, optional): The archive file type. Defaults to "yaml".
+
+    Returns:
+        List[StageResult]: The result of every stage in pipeline order.
+    """
+    with open(path, "rb") as file:
+        size = len(file.read())
+    text = read_text(path)
+    lines = text.count("\n") + (not text.endswith("\n"))
+    name = os.path.basename(path)
+    results = []
+
+    def run(stage: str, function: Callable[[], Any]) -> Any:
+        seconds, peak, result = measure(function, rounds)
+        results.append(StageResult(name, stage, lines, size, seconds, peak))
+        return result
+
+    if is_measurement_file(text):
+        data = run("parse_file", lambda: parse_file(path))
+        measurements = run("populate_archive", lambda: populate_archive(data))
+        template = run("parse_txt", lambda: reader.parse_txt(path))
+        run("get_measurements", lambda: list(utils.get_measurements(template)))
+        section = HallMeasurement(name=name, measurements=measurements)
+    else:
+        template = run("parse_txt", lambda: reader.parse_txt(path))
+        section = run("get_instrument", lambda: utils.get_instrument(template, logger))
+    entry_dict = run("m_to_dict", lambda: section.m_to_dict(with_root_def=True))
+
+    with tempfile.TemporaryDirectory() as directory:
+        context = DirectoryContext(directory)
+        archives = iter(range(sys.maxsize))
+        run(
+            "create_archive",
+            lambda: utils.create_archive(
+                {"data": entry_dict},
+                context,
+                f"{name}.{next(archives)}.archive.{file_type}",
+                file_type,
+                logger,
+            ),
+        )
+    return results
+
+
+def scale_measurement_file(source: str, target: str, repeat: int) -> str:
+    """Writes a measurement file with the steps of `source` repeated and renumbered.
+
+    Args:
+        source (str): The path of a real measurement file.
+        target (str): The path of the scaled file.
+        repeat (int): How often the steps are repeated.
+
+    Returns:
+        str: The path of the scaled file.
+    """
+    with open(source, "rb") as file:
+        content = file.read().decode("iso-8859-1")
+    match = STEP_HEADER.search(content)
+    header, steps = content[: match.start()], content[match.start() :]
+    counter = iter(range(1, sys.maxsize))
+    with open(target, "wb") as file:
+        file.write(header.encode("iso-8859-1"))
+        for _ in range(repeat):
+            renumbered = STEP_HEADER.sub(lambda _: f"<Step {next(counter)}:", steps)
+            file.write(renumbered.encode("iso-8859-1"))
+    return target
+
+
+def run_benchmarks(
+    files: Sequence[str],
+    scales: Sequence[int] = (1,),
+    rounds: int = 3,
+    file_type: str = "yaml",
+    synthetic_steps: Sequence[int] = (),
+) -> Dict[str, Any]:
+    """Benchmarks all files at all scales.
+
+    Measurement files are scaled by repeating their steps, HMS configuration
+    files are only benchmarked as they are. In addition, a synthetic measurement
+    file is generated and benchmarked for every number of `synthetic_steps`.
+
+    Returns:
+        Dict[str, Any]: The baseline with the environment and all stage results.
+    """
+    results: List[StageResult] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for path in files:
+            for scale in scales:
+                if scale == 1:
+                    results.extend(benchmark_file(path, rounds, file_type))
+                    continue
+                with open(path, "rb") as file:
+                    if b"[Measurements]" not in file.read():
+                        continue
+                stem, extension = os.path.splitext(os.path.basename(path))
+                scaled = scale_measurement_file(
+                    path, os.path.join(directory, f"{stem}_x{scale}{extension}"), scale
+                )
+                results.extend(benchmark_file(scaled, rounds, file_type))
+        for steps in synthetic_steps:
+            generated = synthetic.write_measurement_file(
+                os.path.join(directory, f"synthetic_{steps}_steps.txt"),
+                synthetic.MeasurementSpec(steps=steps),
+            )
+            results.extend(benchmark_file(generated, rounds, file_type))
+    return {
+        "version": plugin_version(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "rounds": rounds,
+        "file_type": file_type,
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25
+) -> List[str]:
+    """Lists the stages which are slower or need more memory than in the baseline.
+
+    Args:
+        baseline (Dict[str, Any]): A baseline written by `run_benchmarks`.
+        current (Dict[str, Any]): The current results.
+        tolerance (float, optional): The allowed relative increase. Defaults to 0.25.
+
+    Returns:
+        List[str]: One message per regression.
+    """
+    previous = {
+        (result["file"], result["stage"]): result for result in baseline["results"]
+    }
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["file"], result["stage"]))
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_memory"):
+            if result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['file']} {result['stage']}: {metric} "
+                    f"{old[metric]:.6g} -> {result[metric]:.6g}"
+                )
+    return regressions
+
+
+@dataclass
+class ImportTime:
+    """The `python -X importtime` record of one module.
+
+    Args:
+        module (str): The name of the module.
+        seconds (float): The time spent on the module itself.
+        cumulative (float): The time including the imports of the module.
+        depth (int): The nesting level of the import.
+        parent (Optional[str]): The module importing it.
+    """
+
+    module: str
+    seconds: float
+    cumulative: float
+    depth: int
+    parent: Optional[str] = None
+
+
+def import_times(module: str) -> List[ImportTime]:
+    """Imports a module in a fresh interpreter and records its import times.
+
+    Args:
+        module (str): The name of the module.
+
+    Returns:
+        List[ImportTime]: The records in the order the imports finished, the
+        module itself is the last record.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records: List[ImportTime] = []
+    # The imports of a module finish before the module, so the records without a
+    # parent yet are the children of the next record one level up.
+    pending: Dict[int, List[ImportTime]] = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        seconds, cumulative, indent, name = match.groups()
+        record = ImportTime(
+            name, int(seconds) / 1e6, int(cumulative) / 1e6, len(indent) // 2
+        )
+        for child in pending.pop(record.depth + 1, []):
+            child.parent = name
+        pending.setdefault(record.depth, []).append(record)
+        records.append(record)
+    return records
+
+
+def check_imports(
+    budgets: Optional[Dict[str, float]] = None, lazy: Sequence[str] = LAZY_IMPORTS
+) -> List[str]:
+    """Lists the modules which import too slowly or which load a lazy dependency
+    from a module of this plugin.
+
+    Args:
+        budgets (Optional[Dict[str, float]], optional): The allowed import time
+            in seconds by module. Defaults to `IMPORT_BUDGETS`.
+        lazy (Sequence[str], optional): The modules which the plugin must not
+            import at module level. Defaults to `LAZY_IMPORTS`.
+
+    Returns:
+        List[str]: One message per violation.
+    """
+    if budgets is None:
+        budgets = IMPORT_BUDGETS
+    violations = []
+    for module, budget in budgets.items():
+        records = import_times(module)
+        total = records[-1].cumulative
+        if total > budget:
+            violations.append(f"{module}: {total:.3f} s > {budget:.3f} s")
+        for record in records:
+            if record.module in lazy and (record.parent or "").startswith(
+                "lakeshore_nomad_plugin"
+            ):
+                violations.append(f"{record.parent}: imports {record.module}")
+    return violations
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Lake Shore files to benchmark.")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1])
+    parser.add_argument(
+        "--synthetic-steps",
+        type=int,
+        nargs="+",
+        default=[],
+        help="Also benchmark generated measurement files with these step counts.",
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--file-type", choices=["yaml", "json"], default="yaml")
+    parser.add_argument("--output", help="Write the results as JSON baseline.")
+    parser.add_argument("--compare", help="Compare against a JSON baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--import-times",
+        action="store_true",
+        help="Check the import times of the plugin modules instead.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_times:
+        for module in IMPORT_BUDGETS:
+            records = import_times(module)
+            print(f"{module}: {records[-1].cumulative * 1000:.1f} ms")
+            for record in sorted(records, key=lambda record: -record.cumulative)[1:6]:
+                print(f"    {record.module:<52} {record.cumulative * 1000:10.1f} ms")
+        violations = check_imports()
+        for violation in violations:
+            print(f"REGRESSION {violation}")
+        return 1 if violations else 0
+
+    logging.disable(logging.WARNING)
+    current = run_benchmarks(
+        args.files, args.scale, args.rounds, args.file_type, args.synthetic_steps
+    )
+    for result in current["results"]:
+        print(
+            f"{result['file']:<54} {result['stage']:<18} "
+            f"{result['seconds'] * 1000:10.3f} ms "
+            f"{result['lines_per_second']:12.0f} lines/s "
+            f"{result['mb_per_second']:8.2f} MB/s "
+            f"{result['peak_memory'] / MEGABYTE:8.2f} MB peak"
+        )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(json.load(file), current, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
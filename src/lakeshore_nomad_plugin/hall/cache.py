@@ -0,0 +1,201 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""On-disk cache of parse results keyed by the content of the raw files.
+
+Entries are keyed by the SHA-256 of the raw file, the kind of result, the
+cache format version and the plugin version, so reprocessing an unchanged file
+skips parsing while a change of the parse results invalidates all entries. The
+least recently used entries are evicted once the cache exceeds its size limit.
+
+Entries are pickles, which can run arbitrary code when they are loaded. The
+cache directory must therefore only be writable by the processes running the
+parsers and must not be shared with untrusted writers.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from typing import Any, Callable, Optional
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+ENTRY_SUFFIX = ".pickle"
+CHUNK_SIZE = 1024**2
+# Bump whenever the parse results change, e.g. their keys, values or units, as
+# the plugin version is not bumped with every change
+CACHE_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=None)
+def plugin_version() -> str:
+    """Returns the installed version of the plugin."""
+    try:
+        return metadata.version("lakeshore-nomad-plugin")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def content_hash(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """A directory of pickled parse results with size-based eviction.
+
+    Loading an entry unpickles it, so the directory must not be writable by
+    untrusted users.
+
+    Args:
+        directory (str): The cache directory, created if missing.
+        max_bytes (int, optional): The size limit of all entries.
+            Defaults to `DEFAULT_MAX_BYTES`.
+        version (Optional[str], optional): The version the entries belong to.
+            Defaults to the installed plugin version.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        version: Optional[str] = None,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or plugin_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, path: str, kind: str) -> str:
+        """Returns the cache key of a raw file for one kind of parse result."""
+        name = f"{content_hash(path)}/{kind}/{CACHE_FORMAT_VERSION}/{self.version}"
+        return hashlib.sha256(name.encode()).hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def load(self, key: str) -> Any:
+        """Loads a cached result.
+
+        Args:
+            key (str): The cache key.
+
+        Raises:
+            KeyError: If there is no readable entry for the key.
+
+        Returns:
+            Any: The cached result.
+        """
+        entry = self._entry(key)
+        try:
+            with open(entry, "rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        except Exception:
+            # Truncated or otherwise unreadable entries are dropped
+            self._remove(entry)
+            raise KeyError(key) from None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return value
+
+    def store(self, key: str, value: Any) -> None:
+        """Stores a result and evicts old entries if the cache is too large."""
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._entry(key))
+        except BaseException:
+            self._remove(temporary)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries exceeding `max_bytes`."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                if not item.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(entry)
+            total -= size
+
+    @staticmethod
+    def _remove(entry: str) -> None:
+        try:
+            os.remove(entry)
+        except FileNotFoundError:
+            pass
+
+    def get_or_parse(self, path: str, kind: str, parse: Callable[[str], Any]) -> Any:
+        """Returns the cached result for a raw file or parses and caches it.
+
+        Args:
+            path (str): The path of the raw file.
+            kind (str): The kind of parse result, e.g. `measurement`.
+            parse (Callable[[str], Any]): Parses the raw file into a picklable result.
+
+        Returns:
+            Any: The parse result.
+        """
+        key = self.key(path, kind)
+        try:
+            return self.load(key)
+        except KeyError:
+            pass
+        value = parse(path)
+        self.store(key, value)
+        return value
+
+
+def open_cache(
+    directory: Optional[str], max_bytes: int = DEFAULT_MAX_BYTES
+) -> Optional[ParseCache]:
+    """Returns the parse cache in `directory` or None if caching is disabled."""
+    if not directory:
+        return None
+    return ParseCache(directory, max_bytes)
+
+
+def cached_parse(
+    cache: Optional[ParseCache], path: str, kind: str, parse: Callable[[str], Any]
+) -> Any:
+    """Parses a raw file through the cache if there is one."""
+    if cache is None:
+        return parse(path)
+    return cache.get_or_parse(path, kind, parse)
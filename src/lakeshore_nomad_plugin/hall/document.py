@@ -0,0 +1,270 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Typed intermediate representation of the files of the Lake Shore software.
+
+A file is tokenized once by `hall.tokenizer` into its sections, the steps of
+the `[Measurements]` section and the contact sets of the IV curve steps. Each
+block keeps its items in file order: the key value quantities with their
+units, free text lines and the table blocks decoded into NumPy columns.
+
+The nested dicts of `measurement_parser.parse_file` and the flat template of
+`reader.parse_txt`, which `get_measurements` and `get_instrument` read, are
+both built from this representation.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from lakeshore_nomad_plugin.hall import tokenizer, utils
+from lakeshore_nomad_plugin.hall.rawfile import open_lines
+from lakeshore_nomad_plugin.hall.table import DecodedTable, decode_table
+from lakeshore_nomad_plugin.hall.trace import LineTrace
+
+Item = Union[tokenizer.KeyValue, tokenizer.Text, DecodedTable]
+
+# The line categories of the trace by token type
+TOKEN_CATEGORIES = {
+    tokenizer.Section: utils.SECTION,
+    tokenizer.Step: utils.MEASUREMENT,
+    tokenizer.KeyValue: utils.KEY,
+    tokenizer.Table: utils.MEAS_HEADER,
+    tokenizer.ContactSet: utils.KEY,
+    tokenizer.ContactSets: utils.KEY,
+    tokenizer.Text: utils.IGNORED,
+}
+
+
+@dataclass
+class Block:
+    """A named block of a file with its items in file order.
+
+    Args:
+        name (str): The name of the block.
+        items (List[Item]): The quantities, text lines and decoded tables.
+    """
+
+    name: str
+    items: List[Item] = field(default_factory=list)
+
+    def add(self, token: tokenizer.Token) -> None:
+        """Adds a key value, text or table token, decoding tables."""
+        if isinstance(token, tokenizer.Table):
+            self.items.append(decode_table(token))
+        else:
+            self.items.append(token)
+
+    @property
+    def quantities(self) -> Dict[str, tokenizer.KeyValue]:
+        """The key value quantities by key, the last one winning."""
+        return {
+            item.key: item
+            for item in self.items
+            if isinstance(item, tokenizer.KeyValue)
+        }
+
+    @property
+    def tables(self) -> List[DecodedTable]:
+        """The decoded table blocks."""
+        return [item for item in self.items if isinstance(item, DecodedTable)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the items as dict with `_unit` suffixed keys for the units.
+
+        Quantities are kept as written, table columns as arrays or lists of
+        strings and text lines are keyed by themselves.
+        """
+        dictionary: Dict[str, Any] = {}
+        for item in self.items:
+            if isinstance(item, tokenizer.KeyValue):
+                dictionary[item.key] = item.value
+                if item.unit is not None:
+                    dictionary[f"{item.key}_unit"] = item.unit
+            elif isinstance(item, tokenizer.Text):
+                dictionary[item.line] = item.line
+            else:
+                for name, unit, column in item.columns():
+                    dictionary[name] = column
+                    if unit is not None:
+                        dictionary[f"{name}_unit"] = unit
+        return dictionary
+
+
+@dataclass
+class ContactSet(Block):
+    """A contact set of an IV curve step, e.g. `R12,12`."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"Name": self.name, **super().to_dict()}
+
+
+@dataclass
+class Step(Block):
+    """A `<Step n: name>` block of the `[Measurements]` section.
+
+    Args:
+        number (str): The number of the step as written.
+        contact_sets (List[ContactSet]): The contact sets of an IV curve step.
+    """
+
+    number: str = ""
+    contact_sets: List[ContactSet] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        """The unique key of the step, e.g. `IV Curve Measurement (1)`."""
+        return f"{self.name} ({self.number})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        dictionary = super().to_dict()
+        if self.contact_sets:
+            dictionary["Contact Sets"] = [
+                contact_set.to_dict() for contact_set in self.contact_sets
+            ]
+        return dictionary
+
+
+@dataclass
+class Section(Block):
+    """A `[section]` with the items before its first step and its steps.
+
+    Args:
+        steps (List[Step]): The steps of the section.
+    """
+
+    steps: List[Step] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        dictionary = super().to_dict()
+        for step in self.steps:
+            dictionary[step.key] = step.to_dict()
+        return dictionary
+
+
+@dataclass
+class Document:
+    """All sections of a file in file order.
+
+    Args:
+        sections (List[Section]): The sections with their steps.
+    """
+
+    sections: List[Section] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the nested dicts of `measurement_parser.parse_file`."""
+        return {section.name: section.to_dict() for section in self.sections}
+
+
+def traced_tokens(
+    lines: Iterable[str], trace: LineTrace
+) -> Iterator[tokenizer.Token]:
+    """Tokenizes lines and records every token with the line completing it.
+
+    Args:
+        lines (Iterable[str]): The lines of the file.
+        trace (LineTrace): The trace to record into.
+
+    Yields:
+        Iterator[tokenizer.Token]: The tokens of `tokenizer.tokenize`.
+    """
+    current = [0, ""]
+
+    def counted() -> Iterator[str]:
+        for current[0], current[1] in enumerate(lines, start=1):
+            yield current[1]
+
+    start = time.perf_counter()
+    for token in tokenizer.tokenize(counted()):
+        trace.record(
+            TOKEN_CATEGORIES[type(token)],
+            current[0],
+            current[1],
+            time.perf_counter() - start,
+        )
+        if isinstance(token, tokenizer.Table):
+            trace.count("data", len(token.rows))
+        elif isinstance(token, tokenizer.ContactSet):
+            for item in token.items:
+                if isinstance(item, tokenizer.Table):
+                    trace.count("data", len(item.rows))
+        yield token
+        start = time.perf_counter()
+
+
+def iter_blocks(
+    lines: Iterable[str], trace: Optional[LineTrace] = None
+) -> Iterator[Union[Section, Step]]:
+    """Builds the sections and steps of a file from its lines.
+
+    Every block is yielded as soon as it ends, so only the block being read is
+    held in memory. A section is yielded with the items before its first step
+    and without its steps, which follow it one by one.
+
+    Args:
+        lines (Iterable[str]): The lines of the file.
+        trace (Optional[LineTrace], optional): Records the tokens of the lines.
+            Defaults to None.
+
+    Yields:
+        Iterator[Union[Section, Step]]: The blocks in file order.
+    """
+    tokens = tokenizer.tokenize(lines) if trace is None else traced_tokens(lines, trace)
+    block: Optional[Union[Section, Step]] = None
+    for token in tokens:
+        if isinstance(token, (tokenizer.Section, tokenizer.Step)):
+            if block is not None:
+                yield block
+            if isinstance(token, tokenizer.Section):
+                block = Section(token.name)
+            else:
+                block = Step(token.name, number=token.number)
+        elif isinstance(token, tokenizer.ContactSet):
+            contact_set = ContactSet(token.name)
+            for item in token.items:
+                contact_set.add(item)
+            block.contact_sets.append(contact_set)
+        elif not isinstance(token, tokenizer.ContactSets):
+            block.add(token)
+    if block is not None:
+        yield block
+
+
+def read_document(
+    path: str, encoding: Optional[str] = None, trace: Optional[LineTrace] = None
+) -> Document:
+    """Reads a Lake Shore measurement or HMS configuration file.
+
+    Args:
+        path (str): The path of the file.
+        encoding (Optional[str], optional): The encoding of the file. Detected
+            from the bytes if not given. Defaults to None.
+        trace (Optional[LineTrace], optional): Records the tokens of the lines.
+            Defaults to None.
+
+    Returns:
+        Document: The sections and steps of the file.
+    """
+    document = Document()
+    with open_lines(path, encoding) as lines:
+        for block in iter_blocks(lines, trace):
+            if isinstance(block, Section):
+                document.sections.append(block)
+            else:
+                document.sections[-1].steps.append(block)
+    return document
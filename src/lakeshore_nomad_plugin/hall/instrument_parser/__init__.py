@@ -15,11 +15,27 @@
 # limitations under the License.
 #
 
+from typing import Literal, Optional
+
 from nomad.config.models.plugins import ParserEntryPoint
 from pydantic import Field
 
 
 class HallInstrumentParserEntryPoint(ParserEntryPoint):
+    parse_cache_dir: Optional[str] = Field(
+        None,
+        description="Directory of the on-disk parse cache. Caching is disabled if not \
+        set. The entries are pickles, so the directory must not be writable by \
+        untrusted users.",
+    )
+    parse_cache_size: int = Field(
+        256 * 1024**2, description="Size limit of the parse cache in bytes."
+    )
+    archive_file_type: Literal["yaml", "json"] = Field(
+        "yaml",
+        description="File type of the generated archives. JSON is faster to write.",
+    )
+
     def load(self):
         from lakeshore_nomad_plugin.hall.instrument_parser.parser import HallInstrumentParser
 
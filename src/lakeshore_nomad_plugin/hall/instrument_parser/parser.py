@@ -16,6 +16,8 @@
 # limitations under the License.
 #
 
+from typing import Optional
+
 from nomad.metainfo import (
     MSection,
     Quantity,
@@ -34,11 +36,18 @@ from lakeshore_nomad_plugin.hall.schema import (
     HallInstrument,
 )
 from lakeshore_nomad_plugin.hall.utils import (
+    archive_file_type,
     get_hash_ref,
     create_archive,
     get_instrument,
 )
 from lakeshore_nomad_plugin.hall import reader as hall_reader
+from lakeshore_nomad_plugin.hall.sniff import HMS_CONFIGURATION, sniff_file
+from lakeshore_nomad_plugin.hall.cache import (
+    DEFAULT_MAX_BYTES,
+    cached_parse,
+    open_cache,
+)
 
 
 class RawFileLakeshoreInstrument(EntryData):
@@ -51,21 +60,52 @@ class RawFileLakeshoreInstrument(EntryData):
 
 
 class HallInstrumentParser(MatchingParser):
+    def __init__(
+        self,
+        parse_cache_dir: Optional[str] = None,
+        parse_cache_size: int = DEFAULT_MAX_BYTES,
+        archive_file_type: str = "yaml",
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.parse_cache = open_cache(parse_cache_dir, parse_cache_size)
+        self.archive_file_type = archive_file_type
+
+    def is_mainfile(
+        self,
+        filename: str,
+        mime: str,
+        buffer: bytes,
+        decoded_buffer: str,
+        compression: Optional[str] = None,
+    ):
+        # Unrelated text files are rejected from their first line before the
+        # content pattern is searched.
+        if sniff_file(filename, buffer) != HMS_CONFIGURATION:
+            return False
+        return super().is_mainfile(filename, mime, buffer, decoded_buffer, compression)
+
     def parse(self, mainfile: str, archive: EntryArchive, logger) -> None:
         data_file = mainfile.split("/")[-1]
         data_file_with_path = mainfile.split("raw/")[-1]
-        filetype = "yaml"
 
         instrument_data = HallInstrument()
 
         logger.info("Parsing hall measurement instrument file.")
-        with archive.m_context.raw_file(
-            data_file_with_path, "r", encoding="unicode_escape"
-        ) as f:
-            data_template = hall_reader.parse_txt(f.name)
+        with archive.m_context.raw_file(data_file_with_path, "rb") as f:
+            if sniff_file(f.name) != HMS_CONFIGURATION:
+                logger.warning(f"{data_file} is not a HMS configuration file.")
+                return
+            data_template = cached_parse(
+                self.parse_cache, f.name, "template", hall_reader.parse_txt
+            )
             self.instrument = get_instrument(data_template, logger)
 
-        instrument_filename = f"{data_file[:-5]}_instrument.archive.{filetype}"
+        instrument_stem = f"{data_file[:-5]}_instrument"
+        filetype = archive_file_type(
+            archive.m_context, instrument_stem, self.archive_file_type
+        )
+        instrument_filename = f"{instrument_stem}.archive.{filetype}"
         instrument_archive = EntryArchive(
             data=instrument_data,
             m_context=archive.m_context,
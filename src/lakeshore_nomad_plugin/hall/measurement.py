@@ -16,7 +16,8 @@
 # limitations under the License.
 #
 import numpy as np
-from nomad.metainfo import MSection, Quantity, SubSection, Datetime, Section
+from nomad.metainfo import MSection, Quantity, SubSection, Datetime, Section, JSON
+from nomad.datamodel.hdf5 import HDF5Reference
 from nomad.datamodel.data import EntryData, ArchiveSection
 
 from nomad.datamodel.metainfo.annotations import (
@@ -41,7 +42,21 @@ from nomad.datamodel.metainfo.basesections import (
 )
 
 
-class IVResults(MeasurementResult):
+class ArrayResults(MeasurementResult):
+    """Results whose arrays can be stored in an HDF5 file next to the archive"""
+
+    array_file = Quantity(
+        type=HDF5Reference,
+        description="The HDF5 group holding the arrays of the results, \
+        if they are not stored in the archive.",
+    )
+    array_summary = Quantity(
+        type=JSON,
+        description="The size, minimum and maximum of the arrays in `array_file`.",
+    )
+
+
+class IVResults(ArrayResults):
     """Container for IV-Curve measurement data"""
 
     m_def = Section(
@@ -97,7 +112,7 @@ class IVResults(MeasurementResult):
     )
 
 
-class VariableFieldResults(MeasurementResult):
+class VariableFieldResults(ArrayResults):
     """Container for variable magnetic field data"""
 
     m_def = Section(
@@ -172,7 +187,7 @@ class VariableFieldResults(MeasurementResult):
     )
 
 
-class VariableTemperatureResults(MeasurementResult):
+class VariableTemperatureResults(ArrayResults):
     """Container for variable hall temperature data"""
 
     m_def = Section(
@@ -0,0 +1,259 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Batch conversion of Lake Shore measurement files in a process pool.
+
+Every file is converted into the dict of its `HallMeasurement` section by the
+same code as `HallMeasurementsParser.parse`. A file which fails to convert is
+reported in its result and does not affect the other files. If a worker process
+dies, e.g. because it runs out of memory, the files left unfinished by the
+broken pool are converted again in a fresh one:
+
+    python -m lakeshore_nomad_plugin.hall.measurement_parser.batch \\
+        tests/data/hall --workers 4 --output archives
+"""
+
+import argparse
+import glob
+import logging
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from lakeshore_nomad_plugin.hall.cache import DEFAULT_MAX_BYTES, open_cache
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    build_measurement_dict,
+)
+from lakeshore_nomad_plugin.hall.sniff import LAKESHORE_MEASUREMENT, sniff_file
+from lakeshore_nomad_plugin.hall.utils import serialize_archive
+
+logger = logging.getLogger(__name__)
+
+WORKER_DIED = "The worker process died while converting the file."
+
+
+@dataclass
+class ConversionResult:
+    """The outcome of converting one measurement file.
+
+    Args:
+        path (str): The path of the measurement file.
+        measurement (Optional[Dict]): The `HallMeasurement` as dict.
+        error (Optional[str]): The error message if the conversion failed.
+    """
+
+    path: str
+    measurement: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def measurement_name(path: str) -> str:
+    """Returns the measurement name the parser uses for a file."""
+    return f"{os.path.splitext(os.path.basename(path))[0]}_meas"
+
+
+def convert_file(
+    path: str,
+    parse_cache_dir: Optional[str] = None,
+    parse_cache_size: int = DEFAULT_MAX_BYTES,
+) -> ConversionResult:
+    """Converts a single measurement file and captures any error.
+
+    Args:
+        path (str): The path of the measurement file.
+        parse_cache_dir (Optional[str], optional): The directory of the parse
+            cache. Defaults to None.
+        parse_cache_size (int, optional): The size limit of the parse cache.
+
+    Returns:
+        ConversionResult: The measurement dict or the error of the file.
+    """
+    try:
+        cache = open_cache(parse_cache_dir, parse_cache_size)
+        measurement = build_measurement_dict(
+            path, measurement_name(path), logger, cache
+        )
+    except Exception as error:
+        logger.debug("Converting %s failed", path, exc_info=True)
+        message = "".join(traceback.format_exception_only(type(error), error))
+        return ConversionResult(path, error=message.strip())
+    return ConversionResult(path, measurement=measurement)
+
+
+def convert_in_pool(
+    paths: Sequence[str],
+    workers: Optional[int],
+    parse_cache_dir: Optional[str] = None,
+    parse_cache_size: int = DEFAULT_MAX_BYTES,
+) -> List[Optional[ConversionResult]]:
+    """Converts measurement files in one process pool.
+
+    Returns:
+        List[Optional[ConversionResult]]: One result per file in the order of
+            `paths`, None for the files left unfinished by a broken pool.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(convert_file, path, parse_cache_dir, parse_cache_size)
+            for path in paths
+        ]
+        results: List[Optional[ConversionResult]] = []
+        for path, future in zip(paths, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                results.append(None)
+            except Exception as error:
+                results.append(ConversionResult(path, error=repr(error)))
+    return results
+
+
+def convert_files(
+    paths: Sequence[str],
+    workers: Optional[int] = None,
+    parse_cache_dir: Optional[str] = None,
+    parse_cache_size: int = DEFAULT_MAX_BYTES,
+) -> List[ConversionResult]:
+    """Converts measurement files in parallel.
+
+    A worker process which dies breaks the pool and all files it has not
+    finished yet. These files are converted again in a fresh pool. If no file
+    finished before the pool broke, the first unfinished file is converted on
+    its own first, so a file killing every worker converting it is reported
+    with `WORKER_DIED` instead of breaking the pool again and again.
+
+    Args:
+        paths (Sequence[str]): The paths of the measurement files.
+        workers (Optional[int], optional): The number of worker processes.
+            Defaults to the number of CPUs, `1` converts in this process.
+        parse_cache_dir (Optional[str], optional): The directory of the parse
+            cache shared by all workers. Defaults to None.
+        parse_cache_size (int, optional): The size limit of the parse cache.
+
+    Returns:
+        List[ConversionResult]: One result per file in the order of `paths`.
+    """
+    if workers == 1 or len(paths) < 2:
+        return [
+            convert_file(path, parse_cache_dir, parse_cache_size) for path in paths
+        ]
+    results: List[Optional[ConversionResult]] = [None] * len(paths)
+    pending = list(range(len(paths)))
+    while pending:
+        converted = convert_in_pool(
+            [paths[index] for index in pending],
+            workers,
+            parse_cache_dir,
+            parse_cache_size,
+        )
+        for index, result in zip(pending, converted):
+            results[index] = result
+        unfinished = [index for index in pending if results[index] is None]
+        if unfinished and len(unfinished) == len(pending):
+            index = unfinished.pop(0)
+            (result,) = convert_in_pool(
+                [paths[index]], 1, parse_cache_dir, parse_cache_size
+            )
+            results[index] = result or ConversionResult(paths[index], error=WORKER_DIED)
+        if unfinished:
+            logger.warning(
+                "A worker process died, converting %d files again", len(unfinished)
+            )
+        pending = unfinished
+    return results
+
+
+def find_measurement_files(directory: str, pattern: str = "*.txt") -> List[str]:
+    """Lists the Lake Shore measurement files of a directory.
+
+    Files are selected like the parser does, by their name and by a
+    `[Sample parameters]` section followed by `[Measurements]` at their start.
+
+    Args:
+        directory (str): The directory to search.
+        pattern (str, optional): The glob of the file names. Defaults to "*.txt".
+
+    Returns:
+        List[str]: The sorted paths of the measurement files.
+    """
+    return [
+        path
+        for path in sorted(glob.glob(os.path.join(directory, pattern)))
+        if sniff_file(path) == LAKESHORE_MEASUREMENT
+    ]
+
+
+def convert_directory(
+    directory: str,
+    workers: Optional[int] = None,
+    pattern: str = "*.txt",
+    parse_cache_dir: Optional[str] = None,
+    parse_cache_size: int = DEFAULT_MAX_BYTES,
+) -> List[ConversionResult]:
+    """Converts all measurement files of a directory in parallel.
+
+    Returns:
+        List[ConversionResult]: One result per measurement file.
+    """
+    return convert_files(
+        find_measurement_files(directory, pattern),
+        workers,
+        parse_cache_dir,
+        parse_cache_size,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", help="Directory of Lake Shore files.")
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--parse-cache-dir", default=None)
+    parser.add_argument("--file-type", choices=["yaml", "json"], default="json")
+    parser.add_argument("--output", help="Write the archives into this directory.")
+    args = parser.parse_args(argv)
+
+    results = convert_directory(
+        args.directory, args.workers, args.pattern, args.parse_cache_dir
+    )
+    for result in results:
+        if not result.ok:
+            print(f"FAILED {result.path}: {result.error}")
+            continue
+        print(f"OK {result.path}")
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
+            filename = os.path.join(
+                args.output, f"{result.measurement['name']}.archive.{args.file_type}"
+            )
+            with open(filename, "wb") as file:
+                file.write(
+                    serialize_archive({"data": result.measurement}, args.file_type)
+                )
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,9 +17,8 @@
 #
 
 
-from typing import Dict, List
-from datetime import datetime, timedelta
-import re
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import timedelta
 import numpy as np
 
 from nomad.metainfo import (
@@ -35,8 +34,23 @@ from nomad.datamodel.data import EntryData
 from nomad.datamodel.datamodel import EntryArchive, EntryMetadata
 
 
-from nomad.units import ureg
 from lakeshore_nomad_plugin.hall import reader as hall_reader
+from lakeshore_nomad_plugin.hall.arrays import (
+    SIDECAR_SUFFIX,
+    array_bytes,
+    store_arrays,
+)
+from lakeshore_nomad_plugin.hall.cache import (
+    DEFAULT_MAX_BYTES,
+    ParseCache,
+    cached_parse,
+    open_cache,
+)
+from lakeshore_nomad_plugin.hall.document import Section, iter_blocks, read_document
+from lakeshore_nomad_plugin.hall.rawfile import open_lines
+from lakeshore_nomad_plugin.hall.sniff import LAKESHORE_MEASUREMENT, sniff_file
+from lakeshore_nomad_plugin.hall.timestamps import TimestampParser, step_times
+from lakeshore_nomad_plugin.hall.units import base_unit_factor
 
 from lakeshore_nomad_plugin.hall.schema import (
     ExperimentLakeshoreHall,
@@ -46,6 +60,7 @@ from lakeshore_nomad_plugin.hall.schema import (
 )
 
 from lakeshore_nomad_plugin.hall.utils import (
+    archive_file_type,
     get_hash_ref,
     create_archive,
     get_measurements,
@@ -63,358 +78,184 @@ from lakeshore_nomad_plugin.hall.measurement import (
 )
 
 
-def parse_file(filepath):
-    with open(filepath, "r", encoding="ISO-8859-1") as file:
-        content = file.read()
+def iter_steps(filepath) -> Iterator[Tuple[str, Dict]]:
+    """Yields the steps of the `[Measurements]` section of a file one at a time.
 
-    sections_pattern = r"\[(.*?)\](.*?)(?=\n\[|\Z)"
-    sections = re.findall(sections_pattern, content, re.DOTALL)
+    Args:
+        filepath: The path of the measurement file.
 
-    data_dict = {}
-    for section_name, section_content in sections:
-        data_dict[section_name] = {}
+    Yields:
+        Iterator[Tuple[str, Dict]]: The step key, e.g. `IV Curve Measurement (1)`,
+            and the parsed step.
+    """
+    section = None
+    with open_lines(filepath) as lines:
+        for block in iter_blocks(lines):
+            if isinstance(block, Section):
+                section = block.name
+            elif section == "Measurements":
+                yield block.key, block.to_dict()
 
-        if section_name == "Measurements":
-            steps_pattern = r"<Step\s*\d+:\s*(.*?)>(.*?)(?=\n<Step|\Z)"
-            steps = re.findall(steps_pattern, section_content, re.DOTALL)
-            steps_number = re.findall(r"<Step\s*(\d+):", section_content)
 
-            for step_number, (step_name, step_content) in zip(steps_number, steps):
-                step_dict = {}
-
-                contact_sets_pattern = (
-                    r"(Contact Sets:.*?)(?=\n\nContact Sets:|\n\n<|\Z)"
-                )
-                contact_sets_content = re.findall(
-                    contact_sets_pattern, step_content, re.DOTALL
-                )
-                if contact_sets_content:
-                    params_lists = []
-                    for contact_set_content in contact_sets_content:
-                        lines = contact_set_content.strip().split("\n")
-                        contact_set = {"Name": re.split(r"[=|:]", lines[0])[1].strip()}
-                        for index, line in enumerate(lines[1:]):
-                            parts = re.split(r"[=|:]", line, maxsplit=1)
-                            if len(parts) == 2:
-                                key, value = parts
-                                value = value.strip()
-                                if "[" in key and "]" in key:
-                                    base_key, unit = key.split("[", 1)
-                                    base_key = base_key.strip()
-                                    unit = unit.split("]", 1)[0].strip()
-                                    contact_set[base_key] = value
-                                    contact_set[f"{base_key}_unit"] = unit
-                                elif "[" in value and "]" in value:
-                                    contact_set[key.strip()] = value.split("[")[
-                                        0
-                                    ].strip()
-                                    contact_set[f"{key.strip()}_unit"] = (
-                                        value.split("[")[1].split("]")[0].strip()
-                                    )
-                                else:
-                                    contact_set[key.strip()] = value
-                            else:
-                                data_rows = [
-                                    row.split("\t") for row in lines[index + 1 :]
-                                ]
-                                for col_no, parameter in enumerate(data_rows[0]):
-                                    contact_set[parameter.split("[")[0].strip()] = [
-                                        value[col_no]
-                                        for value in data_rows[1:]
-                                        if value
-                                    ]
-                                    contact_set[
-                                        f"{parameter.split('[')[0].strip()}_unit"
-                                    ] = (parameter.split("[")[1].split("]")[0].strip())
-                                break
-                        params_lists.append(contact_set)
-
-                current_chunk = []
-                for line in step_content.split("\n"):
-                    line = line.strip()
-                    if line:
-                        current_chunk.append(line)
-                    if not line:
-                        if current_chunk:
-                            if "Contact Sets" in current_chunk[0]:
-                                step_dict["Contact Sets"] = params_lists
-                                break
-                            for index, line in enumerate(current_chunk):
-                                parts = re.split(r"[=|:]", line, maxsplit=1)
-                                if len(parts) == 2:
-                                    key, value = parts
-                                    value = value.strip()
-                                    if "[" in key and "]" in key:
-                                        base_key, unit = key.split("[", 1)
-                                        base_key = base_key.strip()
-                                        unit = unit.split("]", 1)[0].strip()
-                                        step_dict[base_key] = value
-                                        step_dict[f"{base_key}_unit"] = unit
-                                    elif "[" in value and "]" in value:
-                                        step_dict[key.strip()] = value.split("[")[
-                                            0
-                                        ].strip()
-                                        step_dict[f"{key.strip()}_unit"] = (
-                                            value.split("[")[1].split("]")[0].strip()
-                                        )
-                                    else:
-                                        step_dict[key.strip()] = value
-                                elif (
-                                    "Field Reversal with Positive field first" in parts
-                                ):
-                                    step_dict[
-                                        "Field Reversal with Positive field first"
-                                    ] = "Field Reversal with Positive field first"
-                                else:
-                                    data_rows = [
-                                        row.split("\t") for row in current_chunk
-                                    ]
-                                    for parameter in data_rows[0]:
-                                        step_dict[parameter.split("[")[0].strip()] = [
-                                            value[0] for value in data_rows[1:] if value
-                                        ]
-                                        step_dict[
-                                            f"{parameter.split('[')[0].strip()}_unit"
-                                        ] = (
-                                            parameter.split("[")[1]
-                                            .split("]")[0]
-                                            .strip()
-                                        )
-                                    break
-                            current_chunk = []
-                data_dict[section_name][f"{step_name} ({step_number})"] = step_dict
-        else:
-            step_dict = {}
-            for index, line in enumerate(
-                line for line in section_content.split("\n") if line.strip()
-            ):
-                parts = re.split(r"[=|:]", line, maxsplit=1)
-                if len(parts) == 2:
-                    key, value = parts
-                    value = value.strip()
-                    if "[" in key and "]" in key:
-                        base_key, unit = key.split("[", 1)
-                        base_key = base_key.strip()
-                        unit = unit.split("]", 1)[0].strip()
-                        step_dict[base_key] = value
-                        step_dict[f"{base_key}_unit"] = unit
-                    elif "[" in value and "]" in value:
-                        step_dict[key.strip()] = value.split("[")[0].strip()
-                        step_dict[f"{key.strip()}_unit"] = (
-                            value.split("[")[1].split("]")[0].strip()
-                        )
-                    else:
-                        step_dict[key.strip()] = value
-                else:
-                    step_dict[line] = line
-
-            data_dict[section_name] = step_dict
-
-    return data_dict
+def parse_file(filepath):
+    return read_document(filepath).to_dict()
 
 
 def fill_quantity(dictionary: Dict, key: str):
-    if f"{key}_unit" in dictionary:
-        if "Â" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace("Â", "")
-        if "Sec" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace("Sec", "s")
-        if "µA" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = "uA"
-        if "cm³" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace(
-                "cm³", "cm ** 3"
-            )
-        if "cm²" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace(
-                "cm²", "cm ** 2"
-            )
-        if "VS" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace(
-                "VS", "volt * second"
-            )
-        if "ohm cm" in dictionary[f"{key}_unit"]:
-            dictionary[f"{key}_unit"] = dictionary[f"{key}_unit"].replace(
-                "ohm cm", "ohm * cm"
-            )
-    if dictionary[key] == "ERROR":
+    value = dictionary[key]
+    if isinstance(value, np.ndarray):
+        if np.isnan(value).all():
+            return None
+    elif value == "ERROR":
         return None
-    if dictionary[key] == "On" or dictionary[key] == "Yes":
+    elif value == "On" or value == "Yes":
         return True
-    if isinstance(dictionary[key], list):
-        modified_list = [None if item == "ERROR" else item for item in dictionary[key]]
-        if not all(item is None for item in modified_list):
-            return (
-                np.array(modified_list, dtype=np.float64)
-                * ureg(dictionary[f"{key}_unit"]).to_base_units().magnitude
-                if key in dictionary and f"{key}_unit" in dictionary
-                else np.array(modified_list, dtype=np.float64)
-            )
-        else:
-            return None
-    return (
-        np.float64(dictionary[key])
-        * ureg(dictionary[f"{key}_unit"]).to_base_units().magnitude
-        if key in dictionary and f"{key}_unit" in dictionary
-        else np.float64(dictionary[key])
-    )
+    else:
+        value = np.float64(value)
+    if f"{key}_unit" in dictionary:
+        return value * base_unit_factor(dictionary[f"{key}_unit"])
+    return value
 
 
 def calc_best_fit_values(contact_set: Dict):
     if (
-        contact_set["Current"]
+        len(contact_set["Current"])
         and contact_set["Best Fit Resistance"]
         and contact_set["Best Fit Offset"]
     ):
-        return np.array(contact_set["Current"], dtype=np.float64) * np.float64(
+        return contact_set["Current"] * np.float64(
             contact_set["Best Fit Resistance"]
         ) + np.float64(contact_set["Best Fit Offset"])
     return None
 
 
-def populate_archive(data: Dict):
-    # data = parse_file(
-    #     "/home/andrea/NOMAD/PLUGINS/lakeshore-nomad-plugin/tests/data/hall/21-032-G_Hall-RT.txt"
-    # )
-    measurement_objects = []
-    for meas_step_key, meas_step in data["Measurements"].items():
-        if "Variable Temperature Measurement" in meas_step_key:
-            measurement_objects.append(
-                VariableTemperatureMeasurement(
-                    name=f'{meas_step_key}: range {meas_step["Starting Temperature"]} {meas_step["Starting Temperature_unit"]} -> {meas_step["Ending Temperature"]} {meas_step["Ending Temperature_unit"]}',
-                    start_time=meas_step["Start Time"],
-                    time_completed=(
-                        meas_step["Time Completed"]
-                        if "Time Completed" in meas_step
-                        else (
-                            meas_step["Skipped at"]
-                            if "Skipped at" in meas_step
-                            else None
-                        )
-                    ),
-                    elapsed_time=(
-                        datetime.strptime(meas_step["Elapsed Time"], "%H:%M:%S")
-                        - datetime.strptime("0:00:00", "%H:%M:%S")
-                    ).total_seconds(),
-                    starting_temperature=fill_quantity(
-                        meas_step, "Starting Temperature"
-                    ),
-                    ending_temperature=fill_quantity(meas_step, "Ending Temperature"),
-                    spacing=meas_step["Spacing"],
-                    temperature_step=fill_quantity(meas_step, "Temperature Step"),
-                    field_at=fill_quantity(meas_step, "Field at"),
-                    measurement_type=meas_step["Measurement Type"],
-                    excitation_current=fill_quantity(meas_step, "Excitation Current"),
-                    resistance_range=meas_step["Resistance Range"],
-                    dwell_time=fill_quantity(meas_step, "Dwell Time"),
-                    current_reversal=fill_quantity(meas_step, "Current Reversal"),
-                    geometry_selection=meas_step["Geometry selection"],
-                )
-            )
-        elif "Variable Field Measurement" in meas_step_key:
-            measurement_objects.append(
-                VariableFieldMeasurement(
-                    name=f'{meas_step_key}: range {meas_step["Minimum Field"]} {meas_step["Minimum Field_unit"]} -> {meas_step["Maximum Field"]} {meas_step["Maximum Field_unit"]}',
-                    start_time=meas_step["Start Time"],
-                    time_completed=(
-                        meas_step["Time Completed"]
-                        if "Time Completed" in meas_step
-                        else (
-                            meas_step["Skipped at"]
-                            if "Skipped at" in meas_step
-                            else None
-                        )
-                    ),
-                    elapsed_time=(
-                        datetime.strptime(meas_step["Elapsed Time"], "%H:%M:%S")
-                        - datetime.strptime("0:00:00", "%H:%M:%S")
-                    ).total_seconds(),
-                    field_profile=meas_step["Field profile"],
-                    maximum_field=fill_quantity(meas_step, "Maximum Field"),
-                    minimum_field=fill_quantity(meas_step, "Minimum Field"),
-                    field_step=fill_quantity(meas_step, "Field Step"),
-                    direction=meas_step["Direction"],
-                    measurement_type=meas_step["Measurement Type"],
-                    excitation_current=fill_quantity(meas_step, "Excitation Current"),
-                    resistance_range=meas_step["Resistance Range"],
-                    dwell_time=fill_quantity(meas_step, "Dwell Time"),
-                    current_reversal=fill_quantity(meas_step, "Current Reversal"),
-                    geometry_selection=meas_step["Geometry selection"],
-                    use_zero_field_resistivity=fill_quantity(
-                        meas_step,
-                        "Use Zero-field Resistivity to calculate Hall Mobility",
-                    ),
-                    zero_field_resistivity=fill_quantity(
-                        meas_step, "Zero-field Resistivity"
-                    ),
-                    field_at_zero_resistivity=fill_quantity(meas_step, "at Field"),
-                    temperature_at_zero_resistivity=fill_quantity(
-                        meas_step, "at Temperature"
+def populate_step(
+    meas_step_key: str,
+    meas_step: Dict,
+    timestamps: Optional[TimestampParser] = None,
+) -> GenericMeasurement:
+    """Builds the measurement section of a single parsed step.
+
+    Args:
+        meas_step_key (str): The step key, e.g. `IV Curve Measurement (1)`.
+        meas_step (Dict): The parsed step.
+        timestamps (Optional[TimestampParser], optional): The timestamp parser
+            shared by the steps of a file. Defaults to a new parser.
+
+    Returns:
+        GenericMeasurement: The measurement section of the step type.
+    """
+    if timestamps is None:
+        timestamps = TimestampParser()
+    if "Variable Temperature Measurement" in meas_step_key:
+        times = step_times(meas_step, timestamps)
+        return VariableTemperatureMeasurement(
+            name=f'{meas_step_key}: range {meas_step["Starting Temperature"]} {meas_step["Starting Temperature_unit"]} -> {meas_step["Ending Temperature"]} {meas_step["Ending Temperature_unit"]}',
+            start_time=times.start,
+            time_completed=times.end,
+            elapsed_time=times.duration,
+            starting_temperature=fill_quantity(
+                meas_step, "Starting Temperature"
+            ),
+            ending_temperature=fill_quantity(meas_step, "Ending Temperature"),
+            spacing=meas_step["Spacing"],
+            temperature_step=fill_quantity(meas_step, "Temperature Step"),
+            field_at=fill_quantity(meas_step, "Field at"),
+            measurement_type=meas_step["Measurement Type"],
+            excitation_current=fill_quantity(meas_step, "Excitation Current"),
+            resistance_range=meas_step["Resistance Range"],
+            dwell_time=fill_quantity(meas_step, "Dwell Time"),
+            current_reversal=fill_quantity(meas_step, "Current Reversal"),
+            geometry_selection=meas_step["Geometry selection"],
+        )
+    elif "Variable Field Measurement" in meas_step_key:
+        times = step_times(meas_step, timestamps)
+        return VariableFieldMeasurement(
+            name=f'{meas_step_key}: range {meas_step["Minimum Field"]} {meas_step["Minimum Field_unit"]} -> {meas_step["Maximum Field"]} {meas_step["Maximum Field_unit"]}',
+            start_time=times.start,
+            time_completed=times.end,
+            elapsed_time=times.duration,
+            field_profile=meas_step["Field profile"],
+            maximum_field=fill_quantity(meas_step, "Maximum Field"),
+            minimum_field=fill_quantity(meas_step, "Minimum Field"),
+            field_step=fill_quantity(meas_step, "Field Step"),
+            direction=meas_step["Direction"],
+            measurement_type=meas_step["Measurement Type"],
+            excitation_current=fill_quantity(meas_step, "Excitation Current"),
+            resistance_range=meas_step["Resistance Range"],
+            dwell_time=fill_quantity(meas_step, "Dwell Time"),
+            current_reversal=fill_quantity(meas_step, "Current Reversal"),
+            geometry_selection=meas_step["Geometry selection"],
+            use_zero_field_resistivity=fill_quantity(
+                meas_step,
+                "Use Zero-field Resistivity to calculate Hall Mobility",
+            ),
+            zero_field_resistivity=fill_quantity(
+                meas_step, "Zero-field Resistivity"
+            ),
+            field_at_zero_resistivity=fill_quantity(meas_step, "at Field"),
+            temperature_at_zero_resistivity=fill_quantity(
+                meas_step, "at Temperature"
+            ),
+            results=[
+                VariableFieldResults(
+                    field=fill_quantity(meas_step, "Field"),
+                    resistivity=fill_quantity(meas_step, "Resistivity"),
+                    hall_coefficient=fill_quantity(
+                        meas_step, "Hall Coefficient"
                     ),
-                    results=[
-                        VariableFieldResults(
-                            field=fill_quantity(meas_step, "Field"),
-                            resistivity=fill_quantity(meas_step, "Resistivity"),
-                            hall_coefficient=fill_quantity(
-                                meas_step, "Hall Coefficient"
-                            ),
-                            carrier_density=fill_quantity(meas_step, "Carrier Density"),
-                            hall_mobility=fill_quantity(meas_step, "Hall Mobility"),
-                            temperature=fill_quantity(meas_step, "Temperature"),
-                        )
-                    ],
-                )
-            )
-        elif "IV Curve Measurement" in meas_step_key:
-            contact_sets_objects = []
-            for contact_set in meas_step["Contact Sets"]:
-                contact_sets_objects.append(
-                    IVResults(
-                        name=contact_set["Name"],
-                        best_fit_resistance=fill_quantity(
-                            contact_set, "Best Fit Resistance"
-                        ),
-                        best_fit_offset=fill_quantity(contact_set, "Best Fit Offset"),
-                        correlation=fill_quantity(contact_set, "Correlation"),
-                        best_fit_values=calc_best_fit_values(contact_set),
-                        current=fill_quantity(contact_set, "Current"),
-                        voltage=fill_quantity(contact_set, "Voltage"),
-                        field=fill_quantity(contact_set, "Field"),
-                        temperature=fill_quantity(contact_set, "Temperature"),
-                    )
+                    carrier_density=fill_quantity(meas_step, "Carrier Density"),
+                    hall_mobility=fill_quantity(meas_step, "Hall Mobility"),
+                    temperature=fill_quantity(meas_step, "Temperature"),
                 )
-            measurement_objects.append(
-                IVCurveMeasurement(
-                    name=f"{meas_step_key}",
-                    start_time=meas_step["Start Time"],
-                    time_completed=(
-                        meas_step["Time Completed"]
-                        if "Time Completed" in meas_step
-                        else (
-                            meas_step["Skipped at"]
-                            if "Skipped at" in meas_step
-                            else None
-                        )
+            ],
+        )
+    elif "IV Curve Measurement" in meas_step_key:
+        contact_sets_objects = []
+        for contact_set in meas_step["Contact Sets"]:
+            contact_sets_objects.append(
+                IVResults(
+                    name=contact_set["Name"],
+                    best_fit_resistance=fill_quantity(
+                        contact_set, "Best Fit Resistance"
                     ),
-                    elapsed_time=(
-                        datetime.strptime(meas_step["Elapsed Time"], "%H:%M:%S")
-                        - datetime.strptime("0:00:00", "%H:%M:%S")
-                    ).total_seconds(),
-                    starting_current=fill_quantity(meas_step, "Starting Current"),
-                    ending_current=fill_quantity(meas_step, "Ending Current"),
-                    current_step=fill_quantity(meas_step, "Current Step"),
-                    resistance_range=meas_step["Resistance Range"],
-                    dwell_time=fill_quantity(meas_step, "Dwell Time"),
-                    results=contact_sets_objects,
+                    best_fit_offset=fill_quantity(contact_set, "Best Fit Offset"),
+                    correlation=fill_quantity(contact_set, "Correlation"),
+                    best_fit_values=calc_best_fit_values(contact_set),
+                    current=fill_quantity(contact_set, "Current"),
+                    voltage=fill_quantity(contact_set, "Voltage"),
+                    field=fill_quantity(contact_set, "Field"),
+                    temperature=fill_quantity(contact_set, "Temperature"),
                 )
             )
-        else:
-            measurement_objects.append(
-                GenericMeasurement(
-                    name=meas_step_key,
-                )
-            )
-    return measurement_objects
+        times = step_times(meas_step, timestamps)
+        return IVCurveMeasurement(
+            name=f"{meas_step_key}",
+            start_time=times.start,
+            time_completed=times.end,
+            elapsed_time=times.duration,
+            starting_current=fill_quantity(meas_step, "Starting Current"),
+            ending_current=fill_quantity(meas_step, "Ending Current"),
+            current_step=fill_quantity(meas_step, "Current Step"),
+            resistance_range=meas_step["Resistance Range"],
+            dwell_time=fill_quantity(meas_step, "Dwell Time"),
+            results=contact_sets_objects,
+        )
+    else:
+        return GenericMeasurement(
+            name=meas_step_key,
+        )
+
+
+def populate_archive(data: Dict):
+    # data = parse_file(
+    #     "/home/andrea/NOMAD/PLUGINS/lakeshore-nomad-plugin/tests/data/hall/21-032-G_Hall-RT.txt"
+    # )
+    timestamps = TimestampParser()
+    return [
+        populate_step(meas_step_key, meas_step, timestamps)
+        for meas_step_key, meas_step in data["Measurements"].items()
+    ]
 
 
 class RawFileLakeshoreHall(EntryData):
@@ -426,67 +267,154 @@ class RawFileLakeshoreHall(EntryData):
     )
 
 
+def build_measurement(filepath: str, name: str, logger) -> HallMeasurement:
+    """Parses a Lake Shore measurement file into a hall measurement section.
+
+    The steps are parsed and added one at a time, so the peak memory depends on
+    the largest step rather than on the whole file.
+
+    Args:
+        filepath (str): The path of the measurement file.
+        name (str): The name of the measurement.
+
+    Returns:
+        HallMeasurement: The measurement with its steps, results and tags.
+    """
+    hall_data = HallMeasurement(name=name)
+    timestamps = TimestampParser()
+    for meas_step_key, meas_step in iter_steps(filepath):
+        hall_data.m_add_sub_section(
+            HallMeasurement.measurements,
+            populate_step(meas_step_key, meas_step, timestamps),
+        )
+    variable_field_found: int = 0
+    variable_temp_found: int = 0
+    iv_curve_found: int = 0
+    for meas in hall_data.measurements:
+        if isinstance(meas, VariableFieldMeasurement):
+            variable_field_found += 1
+        elif isinstance(meas, VariableTemperatureMeasurement):
+            variable_temp_found += 1
+        elif isinstance(meas, IVCurveMeasurement):
+            iv_curve_found += 1
+    if variable_field_found == 1 and iv_curve_found == 1:
+        logger.info(
+            "This measurement was detected as a Room Temperature single magnetic field."
+        )
+        for meas in hall_data.measurements:
+            if isinstance(meas, VariableFieldMeasurement):
+                hall_data.results = [meas.results[0]]
+                hall_data.tags = ["Room Temperature"]
+                break
+    if variable_field_found > 1:
+        logger.info("This measurement was detected as a Variable Field.")
+        hall_data.tags = ["Variable Field"]
+    if variable_temp_found > 1:
+        logger.info("This measurement was detected as a Variable Temperature.")
+        hall_data.tags = ["Variable Temperature"]
+    return hall_data
+
+
+def build_measurement_dict(
+    filepath: str, name: str, logger, cache: Optional[ParseCache] = None
+) -> Dict:
+    """Builds the archive dict of a hall measurement through the parse cache.
+
+    Args:
+        filepath (str): The path of the measurement file.
+        name (str): The name of the measurement.
+        cache (Optional[ParseCache], optional): The parse cache. Defaults to None.
+
+    Returns:
+        Dict: The `HallMeasurement` as dict with its root definition.
+    """
+    hall_data = cached_parse(
+        cache,
+        filepath,
+        "measurement",
+        lambda path: build_measurement(path, name, logger).m_to_dict(
+            with_root_def=True
+        ),
+    )
+    hall_data["name"] = name
+    return hall_data
+
+
 class HallMeasurementsParser(MatchingParser):
+    def __init__(
+        self,
+        parse_cache_dir: Optional[str] = None,
+        parse_cache_size: int = DEFAULT_MAX_BYTES,
+        archive_file_type: str = "yaml",
+        array_file_threshold: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.parse_cache = open_cache(parse_cache_dir, parse_cache_size)
+        self.archive_file_type = archive_file_type
+        self.array_file_threshold = array_file_threshold
+
+    def is_mainfile(
+        self,
+        filename: str,
+        mime: str,
+        buffer: bytes,
+        decoded_buffer: str,
+        compression: Optional[str] = None,
+    ):
+        # Unrelated text files are rejected from their first line before the
+        # content pattern is searched.
+        if sniff_file(filename, buffer) != LAKESHORE_MEASUREMENT:
+            return False
+        return super().is_mainfile(filename, mime, buffer, decoded_buffer, compression)
+
     def parse(self, mainfile: str, archive: EntryArchive, logger) -> None:
         data_file = mainfile.split("/")[-1]
         data_file_with_path = mainfile.split("raw/")[-1]
-        filetype = "yaml"
-
-        hall_data = HallMeasurement(name=f"{data_file[:-4]}_meas")
+        name = f"{data_file[:-4]}_meas"
 
         logger.info("Parsing hall measurement measurement file.")
-        with archive.m_context.raw_file(
-            data_file_with_path, "r", encoding="unicode_escape"
-        ) as f:
+        with archive.m_context.raw_file(data_file_with_path, "rb") as f:
+            if sniff_file(f.name) != LAKESHORE_MEASUREMENT:
+                logger.warning(f"{data_file} is not a Lake Shore measurement file.")
+                return
             # data_template = hall_reader.parse_txt(f.name)
-            data_dict = parse_file(f.name)
-            hall_data.measurements = populate_archive(data_dict)
-        variable_field_found: int = 0
-        variable_temp_found: int = 0
-        iv_curve_found: int = 0
-        for meas in hall_data.measurements:
-            if isinstance(meas, VariableFieldMeasurement):
-                variable_field_found += 1
-            elif isinstance(meas, VariableTemperatureMeasurement):
-                variable_temp_found += 1
-            elif isinstance(meas, IVCurveMeasurement):
-                iv_curve_found += 1
-        if variable_field_found == 1 and iv_curve_found == 1:
-            logger.info(
-                "This measurement was detected as a Room Temperature single magnetic field."
-            )
-            for meas in hall_data.measurements:
-                if isinstance(meas, VariableFieldMeasurement):
-                    hall_data.results = [meas.results[0]]
-                    hall_data.tags = ["Room Temperature"]
-                    break
-        if variable_field_found > 1:
-            logger.info("This measurement was detected as a Variable Field.")
-            hall_data.tags = ["Variable Field"]
-        if variable_temp_found > 1:
-            logger.info("This measurement was detected as a Variable Temperature.")
-            hall_data.tags = ["Variable Temperature"]
-
-        hall_filename = f"{data_file[:-4]}_meas.archive.{filetype}"
+            hall_data = build_measurement_dict(f.name, name, logger, self.parse_cache)
+        # The sidecar is only written together with the archive referencing it
+        attachments = {}
+        if (
+            self.array_file_threshold is not None
+            and array_bytes(hall_data) >= self.array_file_threshold
+        ):
+            array_filename = f"{name}{SIDECAR_SUFFIX}"
+            attachments[array_filename] = store_arrays(hall_data, array_filename)
+
+        filetype = archive_file_type(archive.m_context, name, self.archive_file_type)
+        hall_filename = f"{name}.archive.{filetype}"
         hall_archive = EntryArchive(
-            data=hall_data,
             m_context=archive.m_context,
             metadata=EntryMetadata(upload_id=archive.m_context.upload_id),
-        )
+        ).m_to_dict()
+        hall_archive["data"] = hall_data
 
         create_archive(
-            hall_archive.m_to_dict(),
+            hall_archive,
             archive.m_context,
             hall_filename,
             filetype,
             logger,
+            attachments=attachments,
         )
 
         archive.data = RawFileLakeshoreHall(
             measurement=get_hash_ref(archive.m_context.upload_id, hall_filename)
         )
         archive.metadata.entry_name = data_file + " measurement file"
-        exp_file_name = f"{data_file[:-4]}_exp.archive.{filetype}"
+        exp_stem = f"{data_file[:-4]}_exp"
+        exp_filetype = archive_file_type(
+            archive.m_context, exp_stem, self.archive_file_type
+        )
+        exp_file_name = f"{exp_stem}.archive.{exp_filetype}"
         experiment_archive = EntryArchive(
             data=ExperimentLakeshoreHall(
                 measurement=[
@@ -505,6 +433,6 @@ class HallMeasurementsParser(MatchingParser):
             experiment_archive.m_to_dict(),
             archive.m_context,
             exp_file_name,
-            filetype,
+            exp_filetype,
             logger,
         )
@@ -0,0 +1,193 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Shared reader for the raw text files written by the Lake Shore software.
+
+The files are written either in latin-1 or in UTF-8. They are memory mapped,
+decoded directly from the mapped buffer with the encoding detected from the
+bytes, and the unit symbols are normalized in the same pass. `read_text`
+decodes a file at once, `open_lines` streams its decoded lines chunk by chunk
+from the same map for bounded memory.
+"""
+
+import codecs
+import io
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+FALLBACK_ENCODING = "iso-8859-1"
+CHUNK_SIZE = 64 * 1024
+# Lines are decoded in smaller chunks, as all lines of a chunk are split at once
+LINE_CHUNK_SIZE = 8 * 1024
+
+# Superscripts and micro signs are written in ASCII so that the unit strings
+# need no repair downstream.
+UNIT_SYMBOLS = str.maketrans(
+    {
+        "µ": "u",  # micro sign
+        "μ": "u",  # greek small letter mu
+        "²": "^2",
+        "³": "^3",
+    }
+)
+
+
+def decode(data, encoding: Optional[str] = None) -> str:
+    """Decodes the content of a Lake Shore file and normalizes its unit symbols.
+
+    Without an explicit encoding the content is decoded as UTF-8 and falls back
+    to latin-1 at the first invalid byte.
+
+    Args:
+        data: The raw bytes or a buffer of the file.
+        encoding (Optional[str], optional): The encoding of the file. Detected
+            from the bytes if not given. Defaults to None.
+
+    Returns:
+        str: The decoded content.
+    """
+    view = memoryview(data)
+    if encoding is None:
+        if view[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+            view = view[len(codecs.BOM_UTF8) :]
+        try:
+            text = codecs.decode(view, "utf-8")
+        except UnicodeDecodeError:
+            text = codecs.decode(view, FALLBACK_ENCODING)
+    else:
+        text = codecs.decode(view, encoding)
+    return text.translate(UNIT_SYMBOLS)
+
+
+def read_text(path: str, encoding: Optional[str] = None) -> str:
+    """Reads and decodes a Lake Shore file through a memory map.
+
+    Args:
+        path (str): The path of the file.
+        encoding (Optional[str], optional): The encoding of the file. Detected
+            from the bytes if not given. Defaults to None.
+
+    Returns:
+        str: The decoded content.
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped
+            return ""
+        with buffer:
+            return decode(buffer, encoding)
+
+
+@contextmanager
+def open_text(path: str, encoding: Optional[str] = None) -> Iterator[io.StringIO]:
+    """Opens a Lake Shore file as a text stream with universal newlines.
+
+    Args:
+        path (str): The path of the file.
+        encoding (Optional[str], optional): The encoding of the file. Detected
+            from the bytes if not given. Defaults to None.
+
+    Yields:
+        Iterator[io.StringIO]: The decoded file, which can be iterated line by line.
+    """
+    with io.StringIO(read_text(path, encoding), newline=None) as stream:
+        yield stream
+
+
+def detect_encoding(buffer: mmap.mmap, start: int = 0) -> str:
+    """Detects the encoding of a mapped file from `start` on.
+
+    The buffer is validated as UTF-8 chunk by chunk, so the decoded text is not
+    kept.
+
+    Args:
+        buffer (mmap.mmap): The mapped file.
+        start (int, optional): The offset after a possible byte order mark.
+            Defaults to 0.
+
+    Returns:
+        str: `utf-8` if the content is valid UTF-8, otherwise latin-1.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for offset in range(start, len(buffer), CHUNK_SIZE):
+            decoder.decode(buffer[offset : offset + CHUNK_SIZE])
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return "utf-8"
+
+
+def iter_lines(buffer: mmap.mmap, start: int, encoding: str) -> Iterator[str]:
+    """Decodes the lines of a mapped file chunk by chunk.
+
+    Args:
+        buffer (mmap.mmap): The mapped file.
+        start (int): The offset after a possible byte order mark.
+        encoding (str): The encoding of the file.
+
+    Yields:
+        Iterator[str]: The lines with universal newlines and normalized units.
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(), translate=True
+    )
+    pending = ""
+    for offset in range(start, len(buffer), LINE_CHUNK_SIZE):
+        *lines, pending = (
+            pending + decoder.decode(buffer[offset : offset + LINE_CHUNK_SIZE])
+        ).split("\n")
+        for line in lines:
+            yield f"{line}\n".translate(UNIT_SYMBOLS)
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.translate(UNIT_SYMBOLS)
+
+
+@contextmanager
+def open_lines(path: str, encoding: Optional[str] = None) -> Iterator[Iterator[str]]:
+    """Opens a Lake Shore file as a stream of decoded lines.
+
+    The lines are the same as those of `open_text`. They are decoded from one
+    memory map of the file, which is first validated as UTF-8 if no encoding is
+    given, and only a chunk of the decoded text is held in memory at a time.
+
+    Args:
+        path (str): The path of the file.
+        encoding (Optional[str], optional): The encoding of the file. Detected
+            from the bytes if not given. Defaults to None.
+
+    Yields:
+        Iterator[Iterator[str]]: The lines with universal newlines.
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped
+            yield iter(())
+            return
+        with buffer:
+            start = 0
+            if encoding is None:
+                if buffer[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+                    start = len(codecs.BOM_UTF8)
+                encoding = detect_encoding(buffer, start)
+            yield iter_lines(buffer, start, encoding)
@@ -2,17 +2,20 @@
 
 from pathlib import Path
 import re
-from typing import Any, List, TextIO, Dict, Optional
+from typing import Any, List, Dict, Optional
 import logging
-import numpy as np
-import pandas as pd
 
 from typing import Tuple, Any, Callable, Dict, List
 import os
 
 from abc import ABC, abstractmethod
+from collections import Counter
+from functools import lru_cache
 
 from lakeshore_nomad_plugin.hall import utils
+from lakeshore_nomad_plugin.hall.document import Block, Document, read_document
+from lakeshore_nomad_plugin.hall.tokenizer import KeyValue, Text
+from lakeshore_nomad_plugin.hall.trace import LineTrace
 
 
 class BaseReader(ABC):
@@ -99,192 +102,204 @@ CONVERSION_FUNCTIONS = {
     "Start Time": utils.convert_date,
     "Time Completed": utils.convert_date,
     "Skipped at": utils.convert_date,
+    "Elapsed Time": utils.convert_duration,
 }
 
-# Keys that indicate the start of measurement block
-MEASUREMENT_KEYS = ["Contact Sets"]
-
 reader_dir = Path(__file__).parent
 config_file = reader_dir.joinpath("enum_map.json")
 ENUM_FIELDS = utils.parse_json(str(config_file))
+# The options of every enum field keyed by its section and key
+ENUM_TABLE: Dict[Tuple[str, str], Dict[str, str]] = {
+    (section, key): options
+    for section, fields in ENUM_FIELDS.items()
+    for key, options in fields.items()
+}
+
+TRAILING_NUMBER = re.compile(r"(.*) \d+$")
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARN)
 
 
-def split_add_key(fobj: Optional[TextIO], dic: dict, prefix: str, expr: str) -> None:
-    """Splits a key value pair and adds it to the dictionary.
-    It also checks for measurement headers and adds the full tabular data as a
-    pandas array to the dictionary.
+@lru_cache(maxsize=None)
+def enum_section(prefix: str) -> str:
+    """Returns the section of the enum table for a key prefix.
+
+    Numbered sections like `Temperature Domain 1` share the enum fields of
+    `Temperature Domain`, the numbers of the Keithley models are kept.
 
     Args:
-        fobj (TextIO): The file object to read from
-        dic (dict): The dict to write the data into
-        prefix (str): Key prefix for the dict
-        expr (str): The current expr/line to parse
-    """
-    key, *val = re.split(r"\s*[:|=]\s*", expr)
-    jval = "".join(val).strip()
-
-    def parse_enum() -> bool:
-        sprefix = prefix.strip("/")
-        if "Keithley" not in sprefix:
-            w_trailing_num = re.search(r"(.*) \d+$", sprefix)
-            if w_trailing_num:
-                sprefix = w_trailing_num.group(1)
-
-        if (
-            sprefix in ENUM_FIELDS
-            and key in ENUM_FIELDS[sprefix]
-            and utils.is_integer(jval)
-        ):
-            if jval not in ENUM_FIELDS[sprefix][key]:
-                logger.warning("Option `%s` not in `%s, %s`", jval, sprefix, key)
-            dic[f"{prefix}/{key}"] = ENUM_FIELDS[sprefix][key].get(jval, "UNKNOWN")
-            return True
-
-        return False
-
-    def parse_field():
-        if utils.is_value_with_unit(jval):
-            value, unit = utils.split_value_with_unit(jval)
-            dic[f"{prefix}/{key}"] = value
-            dic[f"{prefix}/{key}/@units"] = utils.clean(unit)
-            return
+        prefix (str): The key prefix, e.g. `/Temperature Domain 1`.
 
-        if parse_enum():
-            return
+    Returns:
+        str: The section in `ENUM_FIELDS`.
+    """
+    section = prefix.strip("/")
+    if "Keithley" not in section:
+        match = TRAILING_NUMBER.match(section)
+        if match:
+            section = match.group(1)
+    return section
+
+
+def add_quantity(
+    template: dict,
+    prefix: str,
+    quantity: KeyValue,
+    unknown_options: Optional[Counter] = None,
+) -> None:
+    """Adds a key value quantity to the template, converted by the kind of value.
 
-        if utils.is_integer(jval):
-            dic[f"{prefix}/{key}"] = int(jval)
+    Args:
+        template (dict): The dict to write the data into
+        prefix (str): Key prefix for the dict
+        quantity (KeyValue): The quantity to add
+        unknown_options (Optional[Counter], optional): Counts the values of enum
+            fields which are not in the enum map by section, key and value.
+            Each unknown value is logged if not given. Defaults to None.
+    """
+    key = quantity.label
+    value = quantity.value
+    path = f"{prefix}/{key}"
+
+    if quantity.unit is not None and not quantity.unit_in_key and value:
+        template[path] = float(value) if utils.is_number(value) else value
+        template[f"{path}/@units"] = utils.clean(quantity.unit)
+        return
+
+    kind = utils.classify_value(value)
+    if kind == utils.INTEGER:
+        section = enum_section(prefix)
+        options = ENUM_TABLE.get((section, key))
+        if options is None:
+            template[path] = int(value)
             return
+        option = options.get(value)
+        if option is None:
+            if unknown_options is None:
+                logger.warning("Option `%s` not in `%s, %s`", value, section, key)
+            else:
+                unknown_options[(section, key, value)] += 1
+            option = "UNKNOWN"
+        template[path] = option
+        return
+
+    if kind == utils.NUMBER:
+        template[path] = float(value)
+        return
+
+    if kind == utils.BOOLEAN:
+        template[path] = utils.to_bool(value)
+        return
+
+    template[path] = CONVERSION_FUNCTIONS.get(key, lambda v: v)(value)
+
+
+def add_block(
+    template: dict,
+    prefix: str,
+    block: Block,
+    unknown_options: Optional[Counter] = None,
+    nxdata: bool = True,
+) -> None:
+    """Adds the quantities and tables of a block to the template.
+
+    Tables are written below the prefix as `data0, data1, ...`, text lines are
+    logged as ignored.
 
-        if utils.is_number(jval):
-            dic[f"{prefix}/{key}"] = float(jval)
-            return
+    Args:
+        template (dict): The dict to write the data into
+        prefix (str): Key prefix for the dict
+        block (Block): The section, step or contact set to add
+        unknown_options (Optional[Counter], optional): Counts the unknown options
+            of enum fields. Defaults to None.
+        nxdata (bool, optional): Whether tables are written as NXdata groups
+            instead of data frames. Defaults to True.
+    """
+    for item in block.items:
+        if isinstance(item, KeyValue):
+            add_quantity(template, prefix, item, unknown_options)
+        elif isinstance(item, Text):
+            logger.warning("Line `%s` ignored", item.line.strip())
+        else:
+            dkey = utils.get_unique_dkey(template, f"{prefix}/data")
+            if nxdata:
+                template.update(utils.pandas_df_to_template(dkey, item.to_frame()))
+            else:
+                template[dkey] = item.to_frame()
+
+
+def document_template(
+    document: Document, name: str = "document", metrics: Optional[Counter] = None
+) -> dict:
+    """Converts a read file into a template dictonary.
+
+    Unknown options of enum fields are logged once per file with their counts.
 
-        if utils.is_boolean(jval):
-            dic[f"{prefix}/{key}"] = utils.to_bool(jval)
-            return
+    Args:
+        document (Document): The sections and steps of the file
+        name (str, optional): The name of the file in the log messages.
+                                  Defaults to "document".
+        metrics (Optional[Counter], optional): Collects the counts of the unknown
+                                  options by section, key and value. Defaults to None.
 
-        dic[f"{prefix}/{key}"] = CONVERSION_FUNCTIONS.get(key, lambda v: v)(jval)
-
-    def parse_data():
-        data = []
-        for line in fobj:
-            if not line.strip():
-                break
-            if utils.is_key(line):
-                split_add_key(
-                    None,  # There should be no deeper measurement,
-                    # prevent further consumption of lines
-                    dic,
-                    f"{prefix}/{key}/{jval}",
-                    line,
+    Returns:
+        dict: Dict containing the data and metadata of the measurement
+    """
+    template: Dict[str, Any] = {}
+    unknown_options: Counter = Counter()
+    for section in document.sections:
+        prefix = f"/{SECTION_REPLACEMENTS.get(section.name, section.name)}"
+        add_block(template, prefix, section, unknown_options)
+        for step in section.steps:
+            measurement = f"{step.number}_{step.name}"
+            step_prefix = (
+                f"{prefix}/{MEASUREMENT_REPLACEMENTS.get(measurement, measurement)}"
+            )
+            add_block(template, step_prefix, step, unknown_options)
+            for contact_set in step.contact_sets:
+                add_block(
+                    template,
+                    f"{step_prefix}/Contact Sets/{contact_set.name}",
+                    contact_set,
+                    unknown_options,
+                    nxdata=False,
                 )
-                continue
-            data.append(list(map(lambda x: x.strip(), re.split("\t+", line))))
 
-        dkey = utils.get_unique_dkey(dic, f"{prefix}/{key}/{jval}/data")
-        dic[dkey] = pd.DataFrame(np.array(data[1:]), columns=data[0]).apply(
-            pd.to_numeric, args=("coerce",)
+    if unknown_options:
+        logger.warning(
+            "Options not in the enum map of %s: %s",
+            name,
+            {
+                f"{section}, {key}: {value}": count
+                for (section, key, value), count in unknown_options.items()
+            },
         )
-
-    if fobj is not None and key in MEASUREMENT_KEYS:
-        parse_data()
-    else:
-        parse_field()
+        if metrics is not None:
+            metrics.update(unknown_options)
+    return template
 
 
-def parse_txt(fname: str, encoding: str = "utf-8") -> dict:
+def parse_txt(
+    fname: str, encoding: Optional[str] = None, metrics: Optional[Counter] = None
+) -> dict:
     """Reads a template dictonary from a hall measurement file
 
+    Unknown options of enum fields are logged once per file with their counts.
+
     Args:
         fname (str): The file name of the masurement file
-        encoding (str, optional): The encoding of the ASCII file. Defaults to "iso-8859-1".
-                                  "utf-8" was used due to square and cubic cm units
-                                  appearing in the file
+        encoding (Optional[str], optional): The encoding of the ASCII file.
+                                  Detected from the bytes if not given, the files
+                                  are written in latin-1 or utf-8. Defaults to None.
+        metrics (Optional[Counter], optional): Collects the counts of the unknown
+                                  options by section, key and value. Defaults to None.
 
     Returns:
         dict: Dict containing the data and metadata of the measurement
     """
-
-    def parse_measurement(
-        line_number: int, line: str, current_section: str, current_measurement: str
-    ):
-        data = []
-        nested_line_number = 0
-        for mline in fobj:
-            nested_line_number += 1
-            print(f"LINE {line_number + nested_line_number}: DATA. {mline}")
-            if not mline.strip():
-                break
-            data.append(list(map(lambda x: x.strip(), re.split("\t+", mline))))
-
-        header = list(map(lambda x: x.strip(), re.split("\t+", line)))
-        dkey = utils.get_unique_dkey(
-            template, f"{current_section}{current_measurement}/data"
-        )
-        template.update(
-            utils.pandas_df_to_template(
-                dkey,
-                pd.DataFrame(
-                    # np.array(data, dtype=np.float64), columns=header # !! type check skipped
-                    np.array(data),
-                    columns=header,
-                ).apply(pd.to_numeric, args=("coerce",)),
-            )
-        )
-
-        return current_section, current_measurement, nested_line_number
-
-    def parse(
-        line_number: int, line: str, current_section: str, current_measurement: str
-    ):
-        if utils.has_section_format(line):
-            print(f"LINE {line_number}: SECTION. {line}")
-            sline = line.strip()[1:-1]
-            current_section = f"/{SECTION_REPLACEMENTS.get(sline, sline)}"
-            current_measurement = ""
-            return current_section, current_measurement, 0
-
-        if utils.is_measurement(line):
-            print(f"LINE {line_number}: MEASUREMENT. {line}")
-            step, _, *meas = line.partition(":")
-            sline = f"{step[6:]}_" + "".join(meas).strip()[:-1]
-            current_measurement = f"/{MEASUREMENT_REPLACEMENTS.get(sline, sline)}"
-            return current_section, current_measurement, 0
-
-        if utils.is_key(line):
-            print(f"LINE {line_number}: KEY. {line}")
-            split_add_key(
-                fobj, template, f"{current_section}{current_measurement}", line
-            )
-            return current_section, current_measurement, 0
-
-        if utils.is_meas_header(line):
-            print(f"LINE {line_number}: MEAS HEADER. {line}")
-            return parse_measurement(
-                line_number, line, current_section, current_measurement
-            )
-
-        print(f"LINE {line_number}: NO OTHER OPTION. {line}")
-        if line.strip():
-            logger.warning("Line `%s` ignored", line.strip())
-
-        return current_section, current_measurement, 0
-
-    template: Dict[str, Any] = {}
-    current_section = "/entry"
-    current_measurement = ""
-    with open(fname, encoding=encoding) as fobj:
-        tot_line_number = 0
-        nested_line_number = 0
-        for line_number, line in enumerate(fobj, start=1):
-            tot_line_number = line_number + nested_line_number
-            current_section, current_measurement, nested_ln = parse(
-                tot_line_number, line, current_section, current_measurement
-            )
-            nested_line_number += nested_ln
-
+    trace = LineTrace.start(logger, fname)
+    template = document_template(read_document(fname, encoding, trace), fname, metrics)
+    if trace is not None:
+        trace.report()
     return template
@@ -0,0 +1,106 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Classification of text files by their first section headers.
+
+Lake Shore measurement files start with `[Sample parameters]` followed by
+`[Measurements]`, HMS configuration files with `[SystemParameters]` followed by
+`[Measurement State Machine]`. Only a bounded prefix of a file is read, and a
+file which does not start with a section header is rejected after its first
+chunk. The result is cached per file, so the parse step gets it for free after
+the mainfile matching.
+"""
+
+import codecs
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+
+LAKESHORE_MEASUREMENT = "measurement"
+HMS_CONFIGURATION = "configuration"
+UNRELATED = "unrelated"
+
+FIRST_CHUNK = 1024
+SNIFF_BYTES = 16 * 1024
+SNIFF_CACHE_SIZE = 1024
+
+# The sections a file has to start with, in this order
+FILE_SECTIONS = {
+    LAKESHORE_MEASUREMENT: (b"Sample parameters", b"Measurements"),
+    HMS_CONFIGURATION: (b"SystemParameters", b"Measurement State Machine"),
+}
+SECTION_HEADER = re.compile(rb"^[ \t]*\[([^\]\r\n]+)\][ \t]*\r?$", re.MULTILINE)
+
+
+def starts_with_section(head: bytes) -> bool:
+    """Whether the first non blank line of a file prefix is a section header."""
+    if head.startswith(codecs.BOM_UTF8):
+        head = head[len(codecs.BOM_UTF8) :]
+    return head.lstrip().startswith(b"[")
+
+
+def classify_header(head: bytes) -> str:
+    """
+    Classifies a file by the section headers in a prefix of its content.
+
+    Args:
+        head (bytes): The first bytes of the file.
+
+    Returns:
+        str: `LAKESHORE_MEASUREMENT`, `HMS_CONFIGURATION` or `UNRELATED`.
+    """
+    if not starts_with_section(head):
+        return UNRELATED
+    sections = [match.group(1).strip() for match in SECTION_HEADER.finditer(head)]
+    for kind, (first, second) in FILE_SECTIONS.items():
+        if first in sections and second in sections[sections.index(first) + 1 :]:
+            return kind
+    return UNRELATED
+
+
+@lru_cache(maxsize=SNIFF_CACHE_SIZE)
+def sniff_cached(path: str, size: int, mtime_ns: int) -> str:
+    """Classifies a file, cached by its path, size and modification time."""
+    with open(path, "rb") as file:
+        head = file.read(FIRST_CHUNK)
+        if not starts_with_section(head):
+            return UNRELATED
+        head += file.read(SNIFF_BYTES - len(head))
+    return classify_header(head)
+
+
+def sniff_file(path: str, buffer: Optional[bytes] = None) -> str:
+    """
+    Classifies a file as Lake Shore measurement, HMS configuration or unrelated.
+
+    Args:
+        path (str): The path of the file.
+        buffer (Optional[bytes], optional): The first bytes of the file if they
+            were read already, e.g. by the mainfile matching. Files which can not
+            be rejected from them are still read. Defaults to None.
+
+    Returns:
+        str: `LAKESHORE_MEASUREMENT`, `HMS_CONFIGURATION` or `UNRELATED`.
+    """
+    if buffer is not None and not starts_with_section(buffer[:FIRST_CHUNK]):
+        return UNRELATED
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return UNRELATED if buffer is None else classify_header(buffer[:SNIFF_BYTES])
+    return sniff_cached(os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
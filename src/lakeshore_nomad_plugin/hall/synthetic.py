@@ -0,0 +1,365 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Generator of synthetic Lake Shore measurement and HMS configuration files.
+
+The files follow the layout written by the Lake Shore HMS software, so they can
+be parsed like real files, but their size is configurable to measure scaling
+and memory use on production sized workloads.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Sequence
+
+import numpy as np
+
+VARIABLE_TEMPERATURE = "Variable Temperature"
+VARIABLE_FIELD = "Variable Field"
+IV_CURVE = "IV Curve"
+STEP_TYPES = (VARIABLE_TEMPERATURE, VARIABLE_FIELD, IV_CURVE)
+
+KEITHLEY_MODELS = ("7001", "6485", "220", "2000", "2182", "182", "2700", "2400")
+DATE_FORMAT = "%m/%d/%y %H:%M:%S"
+
+
+@dataclass
+class MeasurementSpec:
+    """The shape of a synthetic measurement file.
+
+    Args:
+        steps (int, optional): The number of measurement steps. Defaults to 10.
+        step_types (Sequence[str], optional): The step types, which are cycled
+            through. Defaults to all of `STEP_TYPES`.
+        rows (int, optional): The number of rows of every table. Defaults to 20.
+        contact_sets (int, optional): The number of contact sets of every IV curve.
+            Defaults to 4.
+        error_rate (float, optional): The fraction of table cells written as
+            `ERROR`. Defaults to 0.0.
+        encoding (str, optional): The file encoding, the Lake Shore software writes
+            latin-1, copied files are often UTF-8. Defaults to "iso-8859-1".
+        micro_sign (str, optional): The character of the micro prefix, the micro
+            sign or the greek letter mu. Defaults to "µ".
+        newline (str, optional): The line separator. Defaults to "\\r\\n".
+        seed (int, optional): The seed of the generated values. Defaults to 0.
+    """
+
+    steps: int = 10
+    step_types: Sequence[str] = STEP_TYPES
+    rows: int = 20
+    contact_sets: int = 4
+    error_rate: float = 0.0
+    encoding: str = "iso-8859-1"
+    micro_sign: str = "µ"
+    newline: str = "\r\n"
+    seed: int = 0
+
+
+@dataclass
+class ConfigurationSpec:
+    """The shape of a synthetic HMS configuration file.
+
+    Args:
+        temperature_domains (int, optional): The number of temperature domains.
+            Defaults to 8.
+        keithley_models (Sequence[str], optional): The Keithley instruments with a
+            settings section. Defaults to all of `KEITHLEY_MODELS`.
+        encoding (str, optional): The file encoding. Defaults to "iso-8859-1".
+        newline (str, optional): The line separator. Defaults to "\\r\\n".
+    """
+
+    temperature_domains: int = 8
+    keithley_models: Sequence[str] = KEITHLEY_MODELS
+    encoding: str = "iso-8859-1"
+    newline: str = "\r\n"
+
+
+def format_float(value: float, digits: int = 4) -> str:
+    """Formats a value like the Lake Shore software, e.g. `-1.8167E-2`."""
+    mantissa, exponent = f"{value:.{digits}E}".split("E")
+    return f"{mantissa}E{int(exponent):+d}"
+
+
+def format_duration(seconds: int) -> str:
+    """Formats a duration without padding, e.g. `0:5:51`."""
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes}:{seconds}"
+
+
+class _MeasurementWriter:
+    def __init__(self, spec: MeasurementSpec) -> None:
+        self.spec = spec
+        self.rng = np.random.default_rng(spec.seed)
+        self.time = datetime(2022, 7, 6, 15, 15, 51)
+        self.micro = spec.micro_sign
+
+    def table(
+        self, header: Sequence[str], columns: Sequence[np.ndarray]
+    ) -> Iterator[str]:
+        yield "\t".join(header)
+        cells = [[format_float(value) for value in column] for column in columns]
+        errors = self.rng.random((len(columns), self.spec.rows)) < self.spec.error_rate
+        for row in range(self.spec.rows):
+            yield "\t".join(
+                "ERROR" if errors[column][row] else cells[column][row]
+                for column in range(len(columns))
+            )
+
+    def timing(self) -> Iterator[str]:
+        duration = int(self.rng.integers(60, 3600))
+        start = self.time
+        self.time += timedelta(seconds=duration)
+        yield f"Start Time:\t{start.strftime(DATE_FORMAT)}"
+        yield f"Time Completed:\t{self.time.strftime(DATE_FORMAT)}"
+        yield f"Elapsed Time:\t{format_duration(duration)}"
+        yield ""
+
+    def hall_columns(self, temperature: np.ndarray, field: np.ndarray):
+        rows = self.spec.rows
+        resistivity = 1e4 * np.exp(-temperature / 50) + self.rng.normal(0, 1, rows)
+        coefficient = -5e5 * np.exp(-temperature / 80)
+        density = 1 / (1.602e-19 * coefficient)
+        mobility = coefficient / resistivity
+        return [field, resistivity, coefficient, density, mobility]
+
+    def variable_temperature(self, index: int) -> Iterator[str]:
+        start = 20.0 + 10 * (index % 30)
+        step = 2.0
+        end = start + step * (self.spec.rows - 1)
+        yield from self.timing()
+        yield f"Starting Temperature:\t{start} [K]"
+        yield f"Ending Temperature:\t{end} [K]"
+        yield "Spacing:\tLinear Spacing"
+        yield f"Temperature Step:\t{step} [K]"
+        yield "Field at:\t3.0 [kG]"
+        yield "Field Reversal with Positive field first"
+        yield "Measurement Type:\tHall and Resistivity Measurement"
+        yield "Excitation Current:\t1.0 [nA]"
+        yield "Resistance Range:\tHigh"
+        yield "Dwell Time:\t2.0 [Sec]"
+        yield "Current Reversal:\tOn"
+        yield "Geometry selection:\tA and B"
+        yield ""
+        temperature = np.linspace(start, end, self.spec.rows) + self.rng.normal(
+            0, 0.5, self.spec.rows
+        )
+        field = self.rng.normal(0, 0.1, self.spec.rows)
+        resistivity = 1e4 * np.exp(-temperature / 50)
+        yield from self.table(
+            ["Temperature [K]", "Field [G]", "Zero-field Resistivity [ohm cm]"],
+            [temperature, field, resistivity],
+        )
+        yield ""
+        yield from self.table(
+            [
+                "Temperature [K]",
+                "Field [G]",
+                "Resistivity [ohm cm]",
+                "Hall Coefficient [cm³/C]",
+                "Carrier Density [1/cm³]",
+                "Hall Mobility [cm²/(VS)]",
+            ],
+            [temperature, *self.hall_columns(temperature, field + 3e3)],
+        )
+        yield ""
+
+    def variable_field(self, index: int) -> Iterator[str]:
+        yield from self.timing()
+        yield "Field profile:\tLinear Sweep with Field Reversal"
+        yield "Maximum Field:\t3.0 [kG]"
+        yield "Minimum Field:\t-3.0 [kG]"
+        step = format_float(6.0 / max(self.spec.rows - 1, 1), 2)
+        yield f"Field Step:\t{step} [kG]"
+        yield "Direction:\tPositive to Negative"
+        yield "Measurement Type:\tHall and Resistivity Measurement"
+        yield f"Excitation Current:\t10.0 [{self.micro}A]"
+        yield "Resistance Range:\tLow"
+        yield "Dwell Time:\t2.0 [Sec]"
+        yield "Current Reversal:\tOn"
+        yield "Geometry selection:\tA and B"
+        yield ""
+        yield "Use Zero-field Resistivity to calculate Hall Mobility:\tYes"
+        yield f"Zero-field Resistivity [ohm cm] =\t{format_float(7.3421e-2)}"
+        yield f"at Field [G] =\t{format_float(1.5e-2)}"
+        yield "at Temperature [K] = ERROR"
+        yield ""
+        field = np.linspace(3e3, -3e3, self.spec.rows)
+        temperature = np.full(self.spec.rows, 300.0) + self.rng.normal(
+            0, 0.1, self.spec.rows
+        )
+        yield from self.table(
+            [
+                "Field [G]",
+                "Resistivity [ohm cm]",
+                "Hall Coefficient [cm³/C]",
+                "Carrier Density [1/cm³]",
+                "Hall Mobility [cm²/(VS)]",
+                "Temperature [K]",
+            ],
+            [*self.hall_columns(temperature, field), temperature],
+        )
+        yield ""
+
+    def iv_curve(self, index: int) -> Iterator[str]:
+        yield from self.timing()
+        yield f"Starting Current:\t-10.0 [{self.micro}A]"
+        yield f"Ending Current:\t10.0 [{self.micro}A]"
+        step = format_float(20.0 / max(self.spec.rows - 1, 1), 2)
+        yield f"Current Step:\t{step} [{self.micro}A]"
+        yield "Resistance Range:\tLow"
+        yield "Dwell Time:\t2.0 [Sec]"
+        yield ""
+        current = np.linspace(-1e-5, 1e-5, self.spec.rows)
+        for contact_set in range(self.spec.contact_sets):
+            first = contact_set % 4 + 1
+            second = (contact_set + 1) % 4 + 1
+            resistance = 1.5e3 + self.rng.normal(0, 300)
+            offset = self.rng.normal(0, 1e-4)
+            voltage = current * resistance + offset
+            yield f"Contact Sets:\tR{first}{second},{first}{second}"
+            yield f"Best Fit Resistance [ohm] =\t{format_float(resistance)}"
+            yield f"Best Fit Offset [V] =\t{format_float(offset)}"
+            yield f"Correlation =\t{format_float(0.9999)}"
+            yield from self.table(
+                ["Current [A]", "Voltage [V]", "Field [G]", "Temperature [K]"],
+                [
+                    current,
+                    voltage,
+                    self.rng.normal(0, 0.02, self.spec.rows),
+                    np.full(self.spec.rows, 300.0),
+                ],
+            )
+            yield ""
+
+    def lines(self) -> Iterator[str]:
+        yield "[Sample parameters]"
+        yield "Sample Type:\tvan der Pauw"
+        yield "Hall Factor =\t1.0"
+        yield f"Thickness =\t1.8 [{self.micro}m]"
+        yield "L =\t15.0 [mm]"
+        yield "Depletion Layer Correction:\tOff"
+        yield "Synthetic sample"
+        yield "[Measurements]"
+        steps = {
+            VARIABLE_TEMPERATURE: self.variable_temperature,
+            VARIABLE_FIELD: self.variable_field,
+            IV_CURVE: self.iv_curve,
+        }
+        for index in range(self.spec.steps):
+            step_type = self.spec.step_types[index % len(self.spec.step_types)]
+            yield f"<Step {index + 1}: {step_type} Measurement>"
+            yield from steps[step_type](index)
+
+
+def measurement_lines(spec: MeasurementSpec) -> Iterator[str]:
+    """Generates the lines of a synthetic measurement file without line breaks.
+
+    Args:
+        spec (MeasurementSpec): The shape of the file.
+
+    Yields:
+        Iterator[str]: The lines of the file.
+    """
+    return _MeasurementWriter(spec).lines()
+
+
+def configuration_lines(spec: ConfigurationSpec) -> Iterator[str]:
+    """Generates the lines of a synthetic HMS configuration file without line breaks.
+
+    Args:
+        spec (ConfigurationSpec): The shape of the file.
+
+    Yields:
+        Iterator[str]: The lines of the file.
+    """
+    yield "[SystemParameters]"
+    yield "HMS Software Version=2.4.1"
+    yield "Working Directory=C:\\PROGRA~1\\HALLME~1"
+    yield "[Measurement State Machine]"
+    yield "Use instruments=True"
+    yield "System Model=0"
+    yield "Wiring=0"
+    yield "ElectroMeter=0"
+    yield "NumberOfSamples=2"
+    yield "VoltMeter=1"
+    yield "CurrentMeter=1"
+    yield "Current Source=0"
+    yield "AC Hall=False"
+    for model in spec.keithley_models:
+        yield f"[Keithley {model}]"
+        yield "Reading Rate=1"
+        yield "Digital Filter=True"
+        yield "Digital Filter Count=10"
+    yield "[Field Controller]"
+    yield "Gaussmeter=0"
+    yield "Ramp Rate=500"
+    yield "Settle_Band=0.0002"
+    yield "[Temperature Controller]"
+    yield "Temperature=True"
+    yield "Sample Channel=1"
+    yield f"Number of Domains={spec.temperature_domains}"
+    bounds = np.linspace(0, 400, spec.temperature_domains + 1)
+    for index in range(spec.temperature_domains):
+        yield f"[Temperature Domain {index + 1}]"
+        yield f"Temperature Low={bounds[index]:g}"
+        yield f"Temperature High={bounds[index + 1]:g}"
+        yield "Direction=1"
+        yield f"Loop 1 P={40 + 10 * index}"
+        yield "Loop 1 I=1"
+        yield "Loop 1 D=0"
+        yield "Heater Range=5"
+        yield "Ramp Rate=1"
+        yield "Settle Temperature Band=0.5"
+        yield "Settle Time Out=True"
+
+
+def write_lines(path: str, lines: Iterator[str], encoding: str, newline: str) -> str:
+    """Writes generated lines in the given encoding and line separator."""
+    with open(path, "w", encoding=encoding, newline="") as file:
+        for line in lines:
+            file.write(line)
+            file.write(newline)
+    return path
+
+
+def write_measurement_file(path: str, spec: MeasurementSpec = MeasurementSpec()) -> str:
+    """Writes a synthetic measurement file.
+
+    Args:
+        path (str): The path of the file.
+        spec (MeasurementSpec, optional): The shape of the file.
+
+    Returns:
+        str: The path of the file.
+    """
+    return write_lines(path, measurement_lines(spec), spec.encoding, spec.newline)
+
+
+def write_configuration_file(
+    path: str, spec: ConfigurationSpec = ConfigurationSpec()
+) -> str:
+    """Writes a synthetic HMS configuration file.
+
+    Args:
+        path (str): The path of the file.
+        spec (ConfigurationSpec, optional): The shape of the file.
+
+    Returns:
+        str: The path of the file.
+    """
+    return write_lines(path, configuration_lines(spec), spec.encoding, spec.newline)
@@ -0,0 +1,151 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Bulk decoding of tab separated Lake Shore table blocks."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from lakeshore_nomad_plugin.hall.tokenizer import Table
+
+ERROR_VALUE = "ERROR"
+
+
+def split_header(parameter: str) -> Tuple[str, Optional[str]]:
+    """Splits a table header of the form `Name [unit]`.
+
+    Args:
+        parameter (str): The header of a single column.
+
+    Returns:
+        Tuple[str, Optional[str]]: The name and the unit, None for text columns.
+    """
+    name, _, unit = parameter.partition("[")
+    if not unit:
+        return name.strip(), None
+    return name.strip(), unit.split("]")[0].strip()
+
+
+@dataclass
+class DecodedTable:
+    """A table block with all numeric columns decoded into one float64 array.
+
+    Args:
+        names (List[str]): The column names in file order.
+        units (List[Optional[str]]): The column units, None for text columns.
+        values (np.ndarray): The numeric columns, one row per column.
+        text (Dict[str, List[str]]): The text columns, e.g. `Type`.
+        header (List[str]): The column headers as written, e.g. `Field [G]`.
+    """
+
+    names: List[str]
+    units: List[Optional[str]]
+    values: np.ndarray
+    text: Dict[str, List[str]]
+    header: List[str] = field(default_factory=list)
+
+    def columns(
+        self,
+    ) -> Iterator[Tuple[str, Optional[str], Union[np.ndarray, List[str]]]]:
+        """Iterates over the columns in file order.
+
+        Yields:
+            Tuple[str, Optional[str], Union[np.ndarray, List[str]]]:
+                The name, unit and values of the column. Numeric columns are views
+                into `values`.
+        """
+        row = 0
+        for name, unit in zip(self.names, self.units):
+            if unit is None:
+                yield name, unit, self.text[name]
+                continue
+            yield name, unit, self.values[row]
+            row += 1
+
+    def to_frame(self) -> "pd.DataFrame":
+        """Returns the table as data frame with the headers as written as columns.
+
+        Text columns are converted to numbers as well, NaN where they are none.
+
+        Returns:
+            pd.DataFrame: The numeric data frame.
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame(
+            {
+                index: column if unit is not None else pd.to_numeric(
+                    column, errors="coerce"
+                )
+                for index, (_, unit, column) in enumerate(self.columns())
+            }
+        )
+        frame.columns = self.header
+        return frame
+
+
+def to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def decode_table(table: Table) -> DecodedTable:
+    """Decodes a table token into typed columns.
+
+    All numeric columns are converted with a single numpy call, `ERROR` cells
+    become NaN. Columns without a unit in their header are kept as text.
+
+    Args:
+        table (Table): The table token.
+
+    Returns:
+        DecodedTable: The decoded table.
+    """
+    names, units = (list(item) for item in zip(*map(split_header, table.header)))
+    width = len(names)
+    rows = table.rows
+    if any(len(row) != width for row in rows):
+        rows = [(row + [""] * width)[:width] for row in rows]
+    cells = np.array(rows, dtype=str).reshape(len(rows), width)
+
+    numeric = [index for index, unit in enumerate(units) if unit is not None]
+    block = cells[:, numeric].T
+    block[block == ERROR_VALUE] = "nan"
+    try:
+        values = block.astype(np.float64)
+    except ValueError:
+        values = np.vectorize(to_float, otypes=[np.float64])(block)
+
+    text = {
+        names[index]: cells[:, index].tolist()
+        for index, unit in enumerate(units)
+        if unit is None
+    }
+    return DecodedTable(
+        names,
+        units,
+        np.ascontiguousarray(values),
+        text,
+        [parameter.strip() for parameter in table.header],
+    )
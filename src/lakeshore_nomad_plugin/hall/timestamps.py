@@ -0,0 +1,229 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Parsing of the timestamps and durations of Lake Shore measurement steps.
+
+A file is written with a single date format, which depends on the locale of
+the measurement computer. `TimestampParser` tries the format that matched last
+first, so the format is effectively detected once per file. The formats are
+matched with precompiled patterns equivalent to `datetime.strptime`, durations
+are split into their fields without creating datetimes.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+# The patterns of the `datetime.strptime` directives in the C locale
+DIRECTIVES = {
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "y": r"(?P<y>\d\d)",
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "H": r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    "I": r"(?P<I>1[0-2]|0[1-9]|[1-9])",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[0-1]|[0-5]\d|\d)",
+    "p": r"(?P<p>am|pm)",
+}
+DURATION = re.compile(r"\s*(\d+):(\d{1,2}):(\d{1,2})\s*")
+
+
+class DateFormat(NamedTuple):
+    """A date format and its compiled pattern.
+
+    Args:
+        format (str): The format in `strptime` notation. Colons between the
+            time fields are optional, as the reader removes them.
+        pattern (re.Pattern): The pattern with one named group per directive.
+    """
+
+    format: str
+    pattern: re.Pattern
+
+    @classmethod
+    def compile(cls, date_format: str) -> "DateFormat":
+        pattern = ""
+        for directive, literal in re.findall(r"%(\w)|(.)", date_format):
+            if directive:
+                pattern += DIRECTIVES[directive]
+            elif literal.isspace():
+                pattern += r"\s+"
+            elif literal == ":":
+                pattern += ":?"
+            else:
+                pattern += re.escape(literal)
+        return cls(date_format, re.compile(pattern, re.IGNORECASE))
+
+    def parse(self, value: str) -> Optional[datetime]:
+        """Parses a value into a naive datetime, None if it does not match."""
+        match = self.pattern.fullmatch(value)
+        if match is None:
+            return None
+        try:
+            return datetime(*date_fields(match.groupdict()))
+        except ValueError:
+            return None
+
+
+DATE_FORMATS = tuple(
+    DateFormat.compile(date_format)
+    for date_format in (
+        "%m/%d/%y %H:%M:%S",
+        "%d.%m.%Y %H:%M:%S",
+        "%d.%m.%Y %I:%M:%S %p",
+        "%m/%d/%Y %I:%M:%S %p",
+    )
+)
+
+
+def date_fields(groups: Dict[str, Any]) -> List[int]:
+    """Converts the matched directives into year, month, day, hour, minute and
+    second like `datetime.strptime` does."""
+    if groups.get("Y") is not None:
+        year = int(groups["Y"])
+    else:
+        year = int(groups["y"])
+        year += 2000 if year <= 68 else 1900
+    if groups.get("I") is not None:
+        hour = int(groups["I"]) % 12
+        if (groups.get("p") or "").lower() == "pm":
+            hour += 12
+    else:
+        hour = int(groups["H"])
+    return [
+        year,
+        int(groups["m"]),
+        int(groups["d"]),
+        hour,
+        int(groups["M"]),
+        int(groups["S"]),
+    ]
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str):
+    """Returns the cached pytz timezone of a name."""
+    import pytz
+
+    return pytz.timezone(name)
+
+
+class TimestampParser:
+    """Parses the timestamps of a file, trying the last matching format first.
+
+    Args:
+        formats (Sequence[DateFormat], optional): The candidate formats.
+            Defaults to `DATE_FORMATS`.
+    """
+
+    def __init__(self, formats: Sequence[DateFormat] = DATE_FORMATS) -> None:
+        self.formats = list(formats)
+
+    @property
+    def format(self) -> str:
+        """The format which matched last."""
+        return self.formats[0].format
+
+    def parse(self, value: str) -> Optional[datetime]:
+        """Parses a timestamp into a naive datetime.
+
+        Args:
+            value (str): The timestamp as written in the file.
+
+        Returns:
+            Optional[datetime]: The datetime or None if no format matches.
+        """
+        for index, date_format in enumerate(self.formats):
+            result = date_format.parse(value)
+            if result is not None:
+                if index:
+                    self.formats.insert(0, self.formats.pop(index))
+                return result
+        return None
+
+    def isoformat(self, value: str, timezone: str = "Europe/Berlin") -> Optional[str]:
+        """Converts a timestamp in local time of this computer into an ISO string
+        in `timezone`, None if no format matches."""
+        result = self.parse(value)
+        if result is None:
+            return None
+        return result.astimezone(get_timezone(timezone)).isoformat()
+
+
+def parse_duration(value: str) -> float:
+    """Converts a duration like `0:05:51` into seconds.
+
+    Args:
+        value (str): The duration as `hours:minutes:seconds`.
+
+    Raises:
+        ValueError: If the value is not a duration.
+
+    Returns:
+        float: The duration in seconds.
+    """
+    match = DURATION.fullmatch(value)
+    if match is None:
+        raise ValueError(f"Invalid duration {value!r}")
+    hours, minutes, seconds = match.groups()
+    return float(int(hours) * 3600 + int(minutes) * 60 + int(seconds))
+
+
+class StepTimes(NamedTuple):
+    """The timeline of a measurement step.
+
+    Args:
+        start: The start as naive datetime, or as written if it is no timestamp.
+        end: The completion or the time the step was skipped at.
+        skipped (bool): Whether the step was skipped.
+        duration (Optional[float]): The elapsed time in seconds.
+    """
+
+    start: Any
+    end: Any
+    skipped: bool
+    duration: Optional[float]
+
+
+def step_times(step: Dict, timestamps: TimestampParser) -> StepTimes:
+    """Reads the start, end and duration of a parsed step in one go.
+
+    Args:
+        step (Dict): The parsed step.
+        timestamps (TimestampParser): The timestamp parser of the file.
+
+    Returns:
+        StepTimes: The timeline of the step.
+    """
+
+    def timestamp(key: str) -> Any:
+        value = step.get(key)
+        if not value:
+            return None
+        result = timestamps.parse(value)
+        return value if result is None else result
+
+    skipped = "Time Completed" not in step and "Skipped at" in step
+    elapsed = step.get("Elapsed Time")
+    return StepTimes(
+        start=timestamp("Start Time"),
+        end=timestamp("Skipped at" if skipped else "Time Completed"),
+        skipped=skipped,
+        duration=None if elapsed is None else parse_duration(elapsed),
+    )
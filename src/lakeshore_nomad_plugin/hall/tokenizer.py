@@ -0,0 +1,285 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Single-pass, line driven tokenizer for Lake Shore measurement files."""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+MEASUREMENTS_SECTION = "Measurements"
+CONTACT_SETS = "Contact Sets"
+FIELD_REVERSAL = "Field Reversal with Positive field first"
+
+SEPARATOR = re.compile(r"[=|:]")
+STEP_HEADER = re.compile(r"<Step\s*(\d+):\s*(.*?)>")
+
+
+class Section(NamedTuple):
+    """A `[section]` header."""
+
+    name: str
+
+
+class Step(NamedTuple):
+    """A `<Step n: name>` header inside the measurements section."""
+
+    number: str
+    name: str
+
+
+class KeyValue(NamedTuple):
+    """A `key: value` or `key = value` line with an optional `[unit]`.
+
+    The unit is written after the value, or in the key if `unit_in_key` is set.
+    """
+
+    key: str
+    value: str
+    unit: Optional[str] = None
+    unit_in_key: bool = False
+
+    @property
+    def label(self) -> str:
+        """The key as written, including a unit written in the key."""
+        if self.unit_in_key:
+            return f"{self.key} [{self.unit}]"
+        return self.key
+
+
+class Text(NamedTuple):
+    """A line without a key value separator."""
+
+    line: str
+
+
+class Table(NamedTuple):
+    """A tab separated table block, the first row being the header."""
+
+    header: List[str]
+    rows: List[List[str]]
+
+
+class ContactSet(NamedTuple):
+    """A complete `Contact Sets:` block of an IV curve step."""
+
+    name: str
+    items: List[Union[KeyValue, Table, Text]]
+
+
+class ContactSets(NamedTuple):
+    """Marks the position of the contact sets in the current step."""
+
+
+Token = Union[Section, Step, KeyValue, Text, Table, ContactSet, ContactSets]
+
+
+def split_key_value(line: str) -> Optional[KeyValue]:
+    """Splits a line at the first `=`, `|` or `:` into a key value token.
+
+    Args:
+        line (str): The line to split.
+
+    Returns:
+        Optional[KeyValue]: The key value token or None if there is no separator.
+    """
+    match = SEPARATOR.search(line)
+    if match is None:
+        return None
+    key = line[: match.start()]
+    value = line[match.end() :].strip()
+    if "[" in key and "]" in key:
+        base_key, unit = key.split("[", 1)
+        return KeyValue(
+            base_key.strip(), value, unit.split("]", 1)[0].strip(), unit_in_key=True
+        )
+    if "[" in value and "]" in value:
+        return KeyValue(
+            key.strip(),
+            value.split("[")[0].strip(),
+            value.split("[")[1].split("]")[0].strip(),
+        )
+    return KeyValue(key.strip(), value)
+
+
+def split_table(lines: List[str]) -> Table:
+    """Splits the tab separated lines of a table block.
+
+    Args:
+        lines (List[str]): The header line followed by the data rows.
+
+    Returns:
+        Table: The table token.
+    """
+    return Table(lines[0].split("\t"), [row.split("\t") for row in lines[1:]])
+
+
+def contact_set_token(lines: List[str]) -> ContactSet:
+    """Builds the token of a contact set from its raw lines.
+
+    Args:
+        lines (List[str]): The lines starting with `Contact Sets:`.
+
+    Returns:
+        ContactSet: The contact set token.
+    """
+    while len(lines) > 1 and not lines[-1].strip():
+        lines.pop()
+    lines[-1] = lines[-1].rstrip()
+
+    # The table ends at the first blank line, later lines like `Errors reported:`
+    # are kept line by line.
+    body = lines[1:]
+    blank = next(
+        (index for index, line in enumerate(body) if not line.strip()), len(body)
+    )
+    items: List[Union[KeyValue, Table, Text]] = []
+    for index, line in enumerate(body[:blank]):
+        key_value = split_key_value(line)
+        if key_value is None:
+            items.append(split_table(body[index:blank]))
+            break
+        items.append(key_value)
+    for line in body[blank:]:
+        line = line.strip()
+        if line:
+            key_value = split_key_value(line)
+            items.append(key_value if key_value is not None else Text(line))
+    return ContactSet(SEPARATOR.split(lines[0])[1].strip(), items)
+
+
+def chunk_tokens(chunk: List[str]) -> Iterator[Token]:
+    """Tokenizes a blank line separated chunk of a measurement step.
+
+    Args:
+        chunk (List[str]): The stripped, non empty lines of the chunk.
+
+    Yields:
+        Iterator[Token]: Key value pairs and at most one table.
+    """
+    for line in chunk:
+        key_value = split_key_value(line)
+        if key_value is not None:
+            yield key_value
+        elif line == FIELD_REVERSAL:
+            yield Text(line)
+        else:
+            yield split_table(chunk)
+            return
+
+
+class _StepState:
+    """Book keeping of the step which is currently tokenized."""
+
+    def __init__(self) -> None:
+        self.chunk: List[str] = []
+        self.chunks_done = False
+        self.contact_set: Optional[List[str]] = None
+        self.after_blank = False
+
+    def feed(self, line: str) -> Iterator[Token]:
+        # Contact sets run until a blank line followed by another contact set,
+        # a `<` tag or the end of the step.
+        if (
+            self.contact_set is not None
+            and self.after_blank
+            and (line.startswith(f"{CONTACT_SETS}:") or line.startswith("<"))
+        ):
+            yield contact_set_token(self.contact_set)
+            self.contact_set = None
+        if self.contact_set is None:
+            start = line.find(f"{CONTACT_SETS}:")
+            if start >= 0:
+                self.contact_set = [line[start:]]
+                self.after_blank = False
+        else:
+            self.contact_set.append(line)
+            self.after_blank = line == ""
+
+        # Key value pairs and tables are only handled once a blank line
+        # terminates their chunk; the first contact set ends the step header.
+        stripped = line.strip()
+        if stripped:
+            self.chunk.append(stripped)
+        elif self.chunk and not self.chunks_done:
+            if CONTACT_SETS in self.chunk[0]:
+                self.chunks_done = True
+                yield ContactSets()
+            else:
+                yield from chunk_tokens(self.chunk)
+            self.chunk = []
+
+    def close(self) -> Iterator[Token]:
+        if self.contact_set is not None:
+            yield contact_set_token(self.contact_set)
+            self.contact_set = None
+
+
+def tokenize(lines: Iterable[str]) -> Iterator[Token]:
+    """Tokenizes the lines of a Lake Shore measurement file in a single pass.
+
+    Args:
+        lines (Iterable[str]): The lines of the file including their line endings,
+            e.g. an open text file object.
+
+    Yields:
+        Iterator[Token]: The tokens in the order they appear in the file.
+    """
+    section: Optional[str] = None
+    step: Optional[_StepState] = None
+
+    def feed(line: str) -> Iterator[Token]:
+        nonlocal step
+        if section != MEASUREMENTS_SECTION:
+            if line.strip():
+                key_value = split_key_value(line)
+                yield key_value if key_value is not None else Text(line)
+            return
+        if line.startswith("<Step"):
+            if step is not None:
+                yield from step.close()
+            step = None
+            match = STEP_HEADER.match(line)
+            if match is None:
+                return
+            step = _StepState()
+            yield Step(match.group(1), match.group(2))
+            line = line[match.end() :]
+        if step is not None:
+            yield from step.feed(line)
+
+    line_break = False
+    for raw_line in lines:
+        line_break = raw_line.endswith("\n")
+        line = raw_line[:-1] if line_break else raw_line
+        if line.startswith("[") or (section is None and "[" in line):
+            header = line[line.find("[") :]
+            if step is not None:
+                yield from step.close()
+                step = None
+            end = header.find("]")
+            section = header[1:end] if end >= 0 else header[1:]
+            yield Section(section)
+            yield from feed(header[end + 1 :] if end >= 0 else "")
+            continue
+        if section is not None:
+            yield from feed(line)
+
+    # A trailing line break terminates the last chunk of the file.
+    if section is not None and line_break:
+        yield from feed("")
+    if step is not None:
+        yield from step.close()
@@ -0,0 +1,97 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Level gated line tracing for the Lake Shore file readers.
+
+Tracing is off unless the reader's logger is enabled for `DEBUG`, which logs a
+summary of line counts and parse times per line category. On the `TRACE` level
+every `SAMPLE_EVERY`-th line is dumped in addition.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from typing import Dict, Optional
+
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
+SAMPLE_EVERY = 100
+
+
+class LineTrace:
+    """Line counts and parse times per line category of a single file.
+
+    Args:
+        logger (logging.Logger): The logger to report to.
+        name (str): The name of the traced file.
+        sample_every (int, optional): Dump every n-th line on the `TRACE` level.
+            Defaults to `SAMPLE_EVERY`.
+    """
+
+    def __init__(
+        self, logger: logging.Logger, name: str, sample_every: int = SAMPLE_EVERY
+    ) -> None:
+        self.logger = logger
+        self.name = name
+        self.counts: Counter = Counter()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.sample_every = sample_every if logger.isEnabledFor(TRACE) else 0
+        self.lines = 0
+
+    @classmethod
+    def start(cls, logger: logging.Logger, name: str) -> Optional["LineTrace"]:
+        """Returns a new trace or None if the logger is not enabled for `DEBUG`."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return None
+        return cls(logger, name)
+
+    def record(
+        self, category: str, line_number: int, line: str, seconds: float
+    ) -> None:
+        """Records a parsed line.
+
+        Args:
+            category (str): The category of the line, e.g. `section` or `key`.
+            line_number (int): The line number in the file.
+            line (str): The line itself.
+            seconds (float): The time spent on parsing the line.
+        """
+        self.counts[category] += 1
+        self.seconds[category] += seconds
+        if self.sample_every and self.lines % self.sample_every == 0:
+            self.logger.log(
+                TRACE, "LINE %d: %s. %s", line_number, category.upper(), line.rstrip()
+            )
+        self.lines += 1
+
+    def count(self, category: str, lines: int) -> None:
+        """Counts lines which are consumed as part of another line's category."""
+        self.counts[category] += lines
+
+    def report(self) -> None:
+        """Logs the line counts and parse times per category."""
+        self.logger.debug(
+            "Traced %s: %s",
+            self.name,
+            {
+                category: {
+                    "lines": lines,
+                    "seconds": round(self.seconds.get(category, 0.0), 6),
+                }
+                for category, lines in self.counts.items()
+            },
+        )
@@ -0,0 +1,141 @@
+#
+# Copyright The NOMAD Authors.
+#
+# This file is part of NOMAD. See https://nomad-lab.eu for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Process wide cache of the unit strings found in Lake Shore files."""
+
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple
+
+UNIT_CACHE_SIZE = 512
+
+# Replacements turning the unit strings of the Lake Shore software into
+# expressions understood by pint. `Â` is left over when a UTF-8 file is
+# decoded as latin-1.
+UNIT_REPLACEMENTS = {
+    "Â": "",
+    "Sec": "s",
+    "VS": "volt * second",
+    "²": "^2",
+    "³": "^3",
+    "ohm cm": "ohm * cm",
+}
+
+
+class UnitInfo(NamedTuple):
+    """A parsed unit string.
+
+    Args:
+        canonical (str): The unit expression as understood by pint.
+        quantity: The pint quantity of the unit expression.
+        factor (float): The factor converting a magnitude to SI base units.
+    """
+
+    canonical: str
+    quantity: object
+    factor: float
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def canonical_unit(unit: str) -> str:
+    """Cleans an unit string, e.g. converts `VS` to `volt * second`.
+
+    Args:
+        unit (str): The unit string as written in the file.
+
+    Returns:
+        str: The cleaned unit string.
+    """
+    for old, new in UNIT_REPLACEMENTS.items():
+        unit = unit.replace(old, new)
+    return unit
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def unit_info(unit: str) -> UnitInfo:
+    """Parses an unit string with pint.
+
+    Args:
+        unit (str): The unit string as written in the file.
+
+    Returns:
+        UnitInfo: The canonical unit, its pint quantity and its SI base unit factor.
+    """
+    # The nomad unit registry loads the nomad config, it is only needed once
+    # units are actually parsed.
+    from nomad.units import ureg
+
+    canonical = canonical_unit(unit)
+    quantity = ureg(canonical)
+    return UnitInfo(canonical, quantity, quantity.to_base_units().magnitude)
+
+
+def base_unit_factor(unit: str) -> float:
+    """Returns the factor converting a value in `unit` to SI base units."""
+    return unit_info(unit).factor
+
+
+class Conversion(NamedTuple):
+    """The affine conversion of values between two units.
+
+    Args:
+        scale (float): The factor applied to the values.
+        offset (float): The offset added afterwards, non-zero for offset units
+            like `°C`.
+    """
+
+    scale: float
+    offset: float = 0.0
+
+    def apply(self, values: Any) -> Any:
+        """Converts a value or an array of values."""
+        if self.offset:
+            return values * self.scale + self.offset
+        return values * self.scale
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def unit_conversion(unit: str, target: str) -> Conversion:
+    """Returns the conversion of a value in `unit` to the `target` unit.
+
+    Args:
+        unit (str): The unit string as written in the file.
+        target (str): The unit of the metainfo quantity.
+
+    Returns:
+        Conversion: The scale and offset of the conversion.
+    """
+    quantity = unit_info(unit).quantity
+    # Offset units can not be multiplied, so the quantities of 0 and 1 are built
+    # in the unit itself.
+    offset = type(quantity)(0.0, quantity.units).to(target).magnitude
+    scale = type(quantity)(1.0, quantity.units).to(target).magnitude - offset
+    return Conversion(scale * quantity.magnitude, offset)
+
+
+def unit_cache_info() -> Dict[str, Dict[str, int]]:
+    """Returns the hit and miss counters of the unit caches."""
+    return {
+        cache.__name__: cache.cache_info()._asdict()
+        for cache in (canonical_unit, unit_info, unit_conversion)
+    }
+
+
+def clear_unit_cache() -> None:
+    """Empties the unit caches and resets their counters."""
+    canonical_unit.cache_clear()
+    unit_info.cache_clear()
+    unit_conversion.cache_clear()
@@ -15,33 +15,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-"""Utility functions for the NeXus reader classes."""
+"""Utility functions for the NeXus reader classes.
 
-from dataclasses import dataclass, replace
-from typing import List, Any, Dict, Optional, Tuple, Union, Generator
+pandas, yaml and the nomad sections of the instrument and measurement schema are
+imported by the functions using them, so that reading a data template does not
+load the nomad datamodel.
+"""
+
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Any, Dict, Optional, Tuple, Union, Generator
 from collections.abc import Mapping
+import hashlib
 import json
-import yaml
+import os
 import re
 import math
-from datetime import datetime
 import numpy as np
-import pandas as pd
-import pytz
-
-from nomad.units import ureg
-
-from lakeshore_nomad_plugin.hall import instrument as hall_instrument
-from lakeshore_nomad_plugin.hall.measurement import (
-    Measurement,
-    VariableTemperatureMeasurement,
-    VariableTemperatureResults,
-    VariableFieldMeasurement,
-    VariableFieldResults,
-    IVCurveMeasurement,
-    IVResults,
+import orjson
+
+from lakeshore_nomad_plugin.hall.timestamps import TimestampParser, parse_duration
+from lakeshore_nomad_plugin.hall.units import (
+    canonical_unit,
+    unit_conversion,
+    unit_info,
 )
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from lakeshore_nomad_plugin.hall.measurement import IVResults, Measurement
+
 
 @dataclass
 class FlattenSettings:
@@ -78,47 +82,244 @@ def get_hash_ref(upload_id, filename):
     return f"{get_reference(upload_id, get_entry_id(upload_id, filename))}#data"
 
 
+def numeric_array(values: Any) -> Optional[np.ndarray]:
+    """Converts a list of numbers or of equally long lists of numbers into an
+    array, None if the values are not all numbers."""
+    if len(values) and not isinstance(values[0], (int, float, list, np.number)):
+        return None
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        # Ragged nested lists
+        return None
+    if array.dtype.kind not in "iuf":
+        return None
+    return array
+
+
+def first_difference(
+    a: Any, b: Any, rtol: float = 0.0, atol: float = 0.0
+) -> Optional[str]:
+    """
+    Compares two archive values and returns the path of their first difference.
+
+    NaN values are equal to each other. Lists of numbers, also nested ones, are
+    compared in bulk with numpy. The comparison stops at the first difference.
+
+    Args:
+        a (Any): The first value, e.g. an archive dict.
+        b (Any): The second value.
+        rtol (float, optional): The relative tolerance of floats. Defaults to 0.
+        atol (float, optional): The absolute tolerance of floats. Defaults to 0.
+
+    Returns:
+        Optional[str]: None if the values are equal, else the path of the first
+        difference, e.g. `/data/measurements/0/results/0/field/3` or `/` for the
+        values themselves.
+    """
+
+    def compare_arrays(x: np.ndarray, y: np.ndarray, path: str) -> Optional[str]:
+        if x.shape != y.shape:
+            return path
+        if rtol or atol:
+            equal = np.isclose(x, y, rtol=rtol, atol=atol, equal_nan=True)
+        else:
+            equal = x == y
+            if x.dtype.kind == "f" and y.dtype.kind == "f":
+                equal |= np.isnan(x) & np.isnan(y)
+        if equal.all():
+            return None
+        index = np.unravel_index(np.argmin(equal), equal.shape)
+        return "/".join([path, *map(str, index)])
+
+    def compare(x: Any, y: Any, path: str) -> Optional[str]:
+        if isinstance(x, float) and isinstance(y, float):
+            if x == y or (math.isnan(x) and math.isnan(y)):
+                return None
+            if (rtol or atol) and math.isclose(x, y, rel_tol=rtol, abs_tol=atol):
+                return None
+            return path
+        if isinstance(x, dict) and isinstance(y, dict):
+            if x.keys() != y.keys():
+                return next(
+                    f"{path}/{key}"
+                    for key in (*x, *y)
+                    if key not in x or key not in y
+                )
+            for key, value in x.items():
+                difference = compare(value, y[key], f"{path}/{key}")
+                if difference is not None:
+                    return difference
+            return None
+        if isinstance(x, (list, np.ndarray)) and isinstance(y, (list, np.ndarray)):
+            if len(x) != len(y):
+                return path
+            arrays = numeric_array(x), numeric_array(y)
+            if arrays[0] is not None and arrays[1] is not None:
+                return compare_arrays(*arrays, path)
+            for index, (value, other) in enumerate(zip(x, y)):
+                difference = compare(value, other, f"{path}/{index}")
+                if difference is not None:
+                    return difference
+            return None
+        return None if x == y else path
+
+    difference = compare(a, b, "")
+    if difference is None:
+        return None
+    return difference or "/"
+
+
 def nan_equal(a, b):
     """
     Compare two values with NaN values.
     """
-    if isinstance(a, float) and isinstance(b, float):
-        return a == b or (math.isnan(a) and math.isnan(b))
-    elif isinstance(a, dict) and isinstance(b, dict):
-        return dict_nan_equal(a, b)
-    elif isinstance(a, list) and isinstance(b, list):
-        return list_nan_equal(a, b)
-    else:
-        return a == b
+    return first_difference(a, b) is None
 
 
 def list_nan_equal(list1, list2):
     """
     Compare two lists with NaN values.
     """
-    if len(list1) != len(list2):
-        return False
-    for a, b in zip(list1, list2):
-        if not nan_equal(a, b):
-            return False
-    return True
+    return first_difference(list1, list2) is None
 
 
 def dict_nan_equal(dict1, dict2):
     """
     Compare two dictionaries with NaN values.
     """
-    if set(dict1.keys()) != set(dict2.keys()):
-        return False
-    for key in dict1:
-        if not nan_equal(dict1[key], dict2[key]):
-            return False
-    return True
+    return first_difference(dict1, dict2) is None
+
+
+ARCHIVE_FILE_TYPES = ("yaml", "json")
+FINGERPRINT_SUFFIX = ".sha256"
+
+
+def fingerprint(content: bytes) -> str:
+    """Returns the SHA-256 hex digest of the serialized archive."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def fingerprint_path(filename: str) -> str:
+    """Returns the path of the hidden fingerprint sidecar of an archive file."""
+    directory, name = os.path.split(filename)
+    return os.path.join(directory, f".{name}{FINGERPRINT_SUFFIX}")
+
+
+def encode_array(array: np.ndarray) -> Any:
+    """
+    Encodes a numpy array for orjson in bulk.
+
+    NaN values are written as `NaN` like `json.dumps` does, orjson itself would
+    write them as `null`.
+    """
+    if array.dtype.kind != "f":
+        return array.tolist()
+    array = np.ascontiguousarray(array, dtype=np.float64)
+    if np.isinf(array).any():
+        return orjson.Fragment(json.dumps(array.tolist()).encode("utf-8"))
+    encoded = orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY)
+    if not np.isnan(array).any():
+        return orjson.Fragment(encoded)
+    return orjson.Fragment(encoded.replace(b"null", b"NaN"))
+
+
+def with_arrays(value: Any) -> Any:
+    """Replaces the lists of floats in an archive dictionary by numpy arrays.
+
+    Lists are converted if all their numbers, also in nested lists, make a float
+    array. Float scalars which are not finite are written like `json.dumps`
+    does, numpy float scalars as plain floats.
+    """
+    if isinstance(value, dict):
+        return {key: with_arrays(item) for key, item in value.items()}
+    if isinstance(value, list):
+        array = numeric_array(value) if value else None
+        if array is not None and array.dtype.kind == "f":
+            return array
+        return [with_arrays(item) for item in value]
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if not math.isfinite(value):
+            return orjson.Fragment(json.dumps(value).encode("utf-8"))
+    return value
+
+
+def serialize_archive(entry_dict: dict, file_type: str) -> bytes:
+    """Serializes an archive dictionary in the given file type."""
+    if file_type == "json":
+        return orjson.dumps(with_arrays(entry_dict), default=encode_array)
+    elif file_type == "yaml":
+        import yaml
+
+        return yaml.dump(entry_dict).encode("utf-8")
+    return b""
+
+
+def load_archive(content: bytes, filename: str) -> dict:
+    """Loads a serialized archive file."""
+    if filename.endswith(".json"):
+        return json.loads(content)
+    import yaml
+
+    return yaml.safe_load(content)
+
+
+def archive_file_type(context, stem: str, file_type: str) -> str:
+    """
+    Returns the file type of an existing `<stem>.archive.*` file, or `file_type`
+    if there is none. This keeps archives written with another output mode in
+    their format, so they are still found by the overwrite check and their
+    references stay valid.
+    """
+    for existing_type in (file_type, *ARCHIVE_FILE_TYPES):
+        if context.raw_path_exists(f"{stem}.archive.{existing_type}"):
+            return existing_type
+    return file_type
+
+
+def archive_difference(entry_dict, content: bytes, context, filename) -> Optional[str]:
+    """
+    Checks whether an existing archive file has the content of `entry_dict`.
+
+    Archives written by `create_archive` are compared by their fingerprints.
+    Archives without a valid fingerprint, i.e. legacy or edited files, are loaded
+    and compared value by value.
+
+    Returns:
+        Optional[str]: None if the archive is unchanged, else the path of the first
+        difference, which is empty if only the fingerprints differ.
+    """
+    with context.raw_file(filename, "rb") as file:
+        existing = file.read()
+    sidecar = fingerprint_path(filename)
+    if context.raw_path_exists(sidecar):
+        with context.raw_file(sidecar, "r") as file:
+            expected = file.read().strip()
+        if fingerprint(existing) == expected:
+            return None if fingerprint(content) == expected else ""
+    return first_difference(load_archive(existing, filename), entry_dict)
 
 
 def create_archive(
-    entry_dict, context, filename, file_type, logger, *, overwrite: bool = False
+    entry_dict,
+    context,
+    filename,
+    file_type,
+    logger,
+    *,
+    overwrite: bool = False,
+    attachments: Optional[Dict[str, bytes]] = None,
 ):
+    """
+    Writes an archive file unless an archive with a different content exists.
+
+    Args:
+        attachments (Optional[Dict[str, bytes]], optional): Raw files referenced
+            by the archive, e.g. its HDF5 sidecar, by their upload path. They are
+            written before and only together with the archive, so a protected
+            existing archive keeps its own. Defaults to None.
+    """
     from nomad.datamodel.context import ClientContext
     from nomad.datamodel import EntryArchive
 
@@ -126,21 +327,24 @@ def create_archive(
     dicts_are_equal = None
     if isinstance(context, ClientContext):
         return None
+    content = serialize_archive(entry_dict, file_type)
     if file_exists:
-        with context.raw_file(filename, "r") as file:
-            existing_dict = yaml.safe_load(file)
-            dicts_are_equal = dict_nan_equal(existing_dict, entry_dict)
+        difference = archive_difference(entry_dict, content, context, filename)
+        dicts_are_equal = difference is None
     if not file_exists or overwrite or dicts_are_equal:
-        with context.raw_file(filename, "w") as newfile:
-            if file_type == "json":
-                json.dump(entry_dict, newfile)
-            elif file_type == "yaml":
-                yaml.dump(entry_dict, newfile)
+        for attachment, attachment_content in (attachments or {}).items():
+            with context.raw_file(attachment, "wb") as attachment_file:
+                attachment_file.write(attachment_content)
+        with context.raw_file(filename, "wb") as newfile:
+            newfile.write(content)
+        with context.raw_file(fingerprint_path(filename), "w") as sidecar:
+            sidecar.write(fingerprint(content))
         context.upload.process_updated_raw_file(filename, allow_modify=True)
     elif file_exists and not overwrite and not dicts_are_equal:
+        location = f" at {difference}" if difference else ""
         logger.error(
             f"{filename} archive file already exists. "
-            f"You are trying to overwrite it with a different content. "
+            f"You are trying to overwrite it with a different content{location}. "
             f"To do so, remove the existing archive and click reprocess again."
         )
     return get_hash_ref(context.upload_id, filename)
@@ -283,6 +487,8 @@ def parse_yml(
 
     convert_dict["unit"] = "@units"
 
+    import yaml
+
     with open(file_path, encoding="utf-8") as file:
         return flatten_and_replace(
             FlattenSettings(
@@ -333,84 +539,6 @@ def handle_section(section):
         return [ExperimentStep(activity=section, name=section.name)]
 
 
-def has_section_format(expr: str) -> bool:
-    """Checks whether an expression follows the form of a section
-    i.e. is of the form [section]
-
-    Args:
-        expr (str): The current expression to check
-
-    Returns:
-        bool: Returns true if the expr is of the form of a section
-    """
-    return bool(re.search(r"^\[.+\]$", expr))
-
-
-def is_measurement(expr):
-    """Checks whether an expression follows the form of a measurement indicator
-    i.e. is of the form <measurement>
-
-    Args:
-        expr (str): The current expression to check
-
-    Returns:
-        bool: Returns true if the expr is of the form of a measurement indicator
-    """
-    return bool(re.search(r"^\<.+\>$", expr))
-
-
-def is_key(expr: str) -> bool:
-    """Checks whether an expression follows the form of a key value pair
-    i.e. is of the form key: value or key = value
-
-    Args:
-        expr (str): The current expression to check
-
-    Returns:
-        bool: Returns true if the expr is of the form of a key value pair
-    """
-    return bool(re.search(r"^.+\s*[:|=]\s*.+$", expr))
-
-
-def is_meas_header(expr: str) -> bool:
-    """Checks whether an expression follows the form of a measurement header,
-    i.e. starts with: Word [Unit]
-
-    Args:
-        expr (str): The current expression to check
-
-    Returns:
-        bool: Returns true if the expr is of the form of a measurement header
-    """
-    return bool(re.search(r"^[^\]]+\[[^\]]+\]", expr))
-
-
-def is_value_with_unit(expr: str) -> bool:
-    """Checks whether an expression is a value with a unit,
-    i.e. is of the form value [unit].
-
-    Args:
-        expr (str): The expression to check
-
-    Returns:
-        bool: Returns true if the expr is a value with unit
-    """
-    return bool(re.search(r"^.+\s\[.+\]$", expr))
-
-
-def is_integer(expr: str) -> bool:
-    """Checks whether an expression is an integer number,
-    i.e. 3, +3 or -3. Also supports numbers in the form of 003.
-
-    Args:
-        expr (str): The expression to check
-
-    Returns:
-        bool: Returns true if the expr is an integer number
-    """
-    return bool(re.search(r"^[+-]?\d+$", expr))
-
-
 def is_number(expr: str) -> bool:
     """Checks whether an expression is a number,
     i.e. is of the form 0.3, 3, 1e-3, 1E5 etc.
@@ -426,17 +554,42 @@ def is_number(expr: str) -> bool:
     )
 
 
-def is_boolean(expr: str) -> bool:
-    """Checks whether an expression is a boolean,
-    i.e. is equal to True or False (upper or lower case).
+# The line categories of a `trace.LineTrace`
+SECTION = "section"
+MEASUREMENT = "measurement"
+KEY = "key"
+MEAS_HEADER = "header"
+IGNORED = "ignored"
+
+VALUE_WITH_UNIT = "value_with_unit"
+INTEGER = "integer"
+NUMBER = "number"
+BOOLEAN = "boolean"
+
+VALUE_PATTERN = re.compile(
+    rf"(?P<{VALUE_WITH_UNIT}>.+\s\[.+\])"
+    rf"|(?P<{INTEGER}>[+-]?\d+)"
+    rf"|(?P<{NUMBER}>[+-]?(?:\d+(?:[.]\d*)?(?:[eE][+-]?\d+)?|[.]\d+(?:[eE][+-]?\d+)?))"
+    rf"|(?P<{BOOLEAN}>.*(?:True|False|true|false|On|Off|Yes|No).*)"
+)
+
+
+def classify_value(expr: str) -> Optional[str]:
+    """Classifies a stripped value in a single match.
+    A value with unit is of the form value [unit], a boolean contains e.g. True,
+    Off or Yes.
 
     Args:
-        expr (str): The expression to check.
+        expr (str): The value to classify.
 
     Returns:
-        bool: Returns true if the expr is a boolean
+        Optional[str]: One of `VALUE_WITH_UNIT`, `INTEGER`, `NUMBER`, `BOOLEAN` or
+            None for plain strings.
     """
-    return bool(re.search(r"True|False|true|false|On|Off|Yes|No", expr))
+    match = VALUE_PATTERN.fullmatch(expr)
+    if match is None:
+        return None
+    return match.lastgroup
 
 
 def to_bool(expr: str) -> bool:
@@ -465,7 +618,7 @@ def to_bool(expr: str) -> bool:
 def split_str_with_unit(expr: str, lower: bool = True) -> Tuple[str, str]:
     """Splits an expression into a string and a unit.
     The input expression should be of the form value [unit] as
-    is checked with is_value_with_unit function.
+    is checked with classify_value function.
 
     Args:
         expr (str): The expression to split
@@ -486,7 +639,7 @@ def split_str_with_unit(expr: str, lower: bool = True) -> Tuple[str, str]:
 def split_value_with_unit(expr: str) -> Tuple[Union[float, str], str]:
     """Splits an expression into a string or float and a unit.
     The input expression should be of the form value [unit] as
-    is checked with is_value_with_unit function.
+    is checked with classify_value function.
     The value is automatically converted to a float if it is a number.
 
     Args:
@@ -514,18 +667,7 @@ def clean(unit: str) -> str:
     Returns:
         str: The cleaned unit string.
     """
-    conversions = {
-        "VS": "volt * second",
-        "Sec": "s",
-        "²": "^2",
-        "³": "^3",
-        "ohm cm": "ohm * cm",
-    }
-
-    for old, new in conversions.items():
-        unit = unit.replace(old, new)
-
-    return unit
+    return canonical_unit(unit)
 
 
 def get_unique_dkey(dic: dict, dkey: str) -> str:
@@ -546,7 +688,7 @@ def get_unique_dkey(dic: dict, dkey: str) -> str:
     return f"{dkey}{suffix}"
 
 
-def pandas_df_to_template(prefix: str, data: pd.DataFrame) -> Dict[str, Any]:
+def pandas_df_to_template(prefix: str, data: "pd.DataFrame") -> Dict[str, Any]:
     """Converts a dataframe to a NXdata entry template.
 
     Args:
@@ -567,7 +709,7 @@ def pandas_df_to_template(prefix: str, data: pd.DataFrame) -> Dict[str, Any]:
             print("Warning: Trying to write dataframe without a header. Skipping.")
             return
 
-        if is_value_with_unit(header):
+        if classify_value(header) == VALUE_WITH_UNIT:
             name, unit = split_str_with_unit(header)
             template[f"{prefix}/{name}/@units"] = clean(unit)
         else:
@@ -598,7 +740,12 @@ def pandas_df_to_template(prefix: str, data: pd.DataFrame) -> Dict[str, Any]:
     return template
 
 
-def convert_date(datestr: str, timezone: str = "Europe/Berlin") -> str:
+# The reader converts the timestamps of one file at a time, so the format which
+# matched last is tried first.
+TIMESTAMPS = TimestampParser()
+
+
+def convert_date(datestr: str, timezone: str = "Europe/Berlin") -> Optional[str]:
     """Converts a hall date formated string to isoformat string.
 
     Args:
@@ -608,23 +755,25 @@ def convert_date(datestr: str, timezone: str = "Europe/Berlin") -> str:
     Returns:
         str: The iso formatted string.
     """
+    return TIMESTAMPS.isoformat(datestr, timezone)
+
+
+def convert_duration(duration: str) -> Optional[float]:
+    """Converts a hall duration string like `0:05:51` into seconds.
+
+    Args:
+        duration (str): The hall duration string
 
+    Returns:
+        Optional[float]: The duration in seconds, None if it is no duration.
+    """
     try:
-        for fmt in [r"%m/%d/%y %H%M%S", r"%d.%m.%Y %H%M%S", r"%d.%m.%Y %I%M%S %p"]:
-            try:
-                return (
-                    datetime.strptime(datestr, fmt)
-                    .astimezone(pytz.timezone(timezone))
-                    .isoformat()
-                )
-            except ValueError:
-                pass
+        return parse_duration(duration)
     except ValueError:
-        print("Warning: datestring does not conform to date format. Skipping.")
-        return datestr
+        return None
 
 
-def get_measurement_object(measurement_type: str) -> Measurement:
+def get_measurement_object(measurement_type: str) -> "Measurement":
     """
     Gets a measurement MSection object from the given measurement type.
 
@@ -634,6 +783,13 @@ def get_measurement_object(measurement_type: str) -> Measurement:
     Returns:
         Measurement: A MSection representing a Hall measurement.
     """
+    from lakeshore_nomad_plugin.hall.measurement import (
+        IVCurveMeasurement,
+        Measurement,
+        VariableFieldMeasurement,
+        VariableTemperatureMeasurement,
+    )
+
     if measurement_type == "Variable Temperature Measurement":
         return VariableTemperatureMeasurement()
     if measurement_type == "Variable Field Measurement":
@@ -653,6 +809,12 @@ def get_data_object(measurement_type: str):
     Returns:
         A MSection representing a Hall measurement data object.
     """
+    from lakeshore_nomad_plugin.hall.measurement import (
+        IVResults,
+        VariableFieldResults,
+        VariableTemperatureResults,
+    )
+
     if measurement_type == "Variable Temperature Measurement":
         return VariableTemperatureResults()
     if measurement_type == "Variable Field Measurement":
@@ -662,6 +824,16 @@ def get_data_object(measurement_type: str):
     return None
 
 
+SNAKE_CASE_CACHE_SIZE = 4096
+CAMEL_CASE_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+REPEATED_UNDERSCORES = re.compile(r"_{2,}")
+SEPARATE_NUMBER = re.compile(r"\b\d+\b")
+SEPARATE_ACRONYM = re.compile(r"\b(?<!\d)[A-Z]{2,}(?!\w)")
+UNDERSCORE_AFTER_SLASH = re.compile(r"(?<=/)_")
+UNDERSCORE_BEFORE_SLASH = re.compile(r"_(?=/)")
+
+
+@lru_cache(maxsize=SNAKE_CASE_CACHE_SIZE)
 def to_snake_case(string: str) -> str:
     """
     Convert a string to snake_case.
@@ -670,6 +842,8 @@ def to_snake_case(string: str) -> str:
     keep not separated capitalized acronyms,
     keep not separated multi-digit numbers
 
+    The results are cached, as the same keys repeat in every file.
+
     Parameters:
         string (str): The string to convert.
 
@@ -682,17 +856,15 @@ def to_snake_case(string: str) -> str:
     """
 
     string = string.replace("-", "_")
-    string = re.sub(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])", "_", string)
+    string = CAMEL_CASE_BOUNDARY.sub("_", string)
     string = string.lower()
-    string = re.sub(r"_{2,}", "_", string)
-    string = re.sub(r"\b\d+\b", lambda match: match.group(0).replace(".", "_"), string)
-    string = re.sub(
-        r"\b(?<!\d)[A-Z]{2,}(?!\w)", lambda match: match.group(0).lower(), string
-    )
+    string = REPEATED_UNDERSCORES.sub("_", string)
+    string = SEPARATE_NUMBER.sub(lambda match: match.group(0).replace(".", "_"), string)
+    string = SEPARATE_ACRONYM.sub(lambda match: match.group(0).lower(), string)
     string = string.replace(" ", "_")
-    string = re.sub(r"(?<=/)_", "", string)
-    string = re.sub(r"_(?=/)", "", string)
-    string = re.sub(r"_{2,}", "_", string)
+    string = UNDERSCORE_AFTER_SLASH.sub("", string)
+    string = UNDERSCORE_BEFORE_SLASH.sub("", string)
+    string = REPEATED_UNDERSCORES.sub("_", string)
 
     return string
 
@@ -737,7 +909,7 @@ def rename_key(key: str) -> str:
     return key_map.get(key, key)
 
 
-def calc_best_fit_values(iv_measurement: IVResults) -> IVResults:
+def calc_best_fit_values(iv_measurement: "IVResults") -> "IVResults":
     """
     Calculates the best fit voltage values from the provided
     fitting data.
@@ -756,7 +928,164 @@ def calc_best_fit_values(iv_measurement: IVResults) -> IVResults:
     return iv_measurement
 
 
-def get_measurements(data_template: dict) -> Generator[Measurement, None, None]:
+MEASUREMENT_KEY = re.compile(r"^/entry/measurement/(\d+)_([^/]+)/")
+CONTACT_SET_KEY = re.compile(r"/Contact Sets/([^/]+)/")
+DATA_BLOCK_KEY = re.compile(r"/data(\d+)/")
+
+
+@dataclass
+class TemplateKey:
+    """A data template key with its attribute name and units resolved.
+
+    Args:
+        key (str): The key in the data template.
+        name (str): The snake_case attribute name of the key.
+        unit (Optional[str]): The unit given as `[unit]` in the key itself.
+        units (Optional[str]): The unit of the `@units` attribute of the key.
+        is_table (bool): Whether the key holds the data frame of a contact set.
+    """
+
+    key: str
+    name: str
+    unit: Optional[str] = None
+    units: Optional[str] = None
+    is_table: bool = False
+
+
+@dataclass
+class MeasurementKeys:
+    """The data template keys of one measurement grouped by their section.
+
+    Args:
+        measurement_type (str): The measurement type, e.g. `IV Curve Measurement`.
+        keys (List[TemplateKey]): The keys of the measurement itself.
+        data_blocks (Dict[str, List[TemplateKey]]): The keys per data block index.
+        contact_sets (Dict[str, List[TemplateKey]]): The keys per contact set.
+    """
+
+    measurement_type: str
+    keys: List[TemplateKey] = field(default_factory=list)
+    data_blocks: Dict[str, List[TemplateKey]] = field(default_factory=dict)
+    contact_sets: Dict[str, List[TemplateKey]] = field(default_factory=dict)
+
+
+def index_measurement_keys(data_template: dict) -> List[MeasurementKeys]:
+    """
+    Groups the measurement keys of a data template in a single pass.
+
+    Every key is matched and converted to snake_case only once. The keys keep
+    their template order within their group and the groups are ordered by their
+    first key.
+
+    Args:
+        data_template (dict): The nomad-parser-nexus data template.
+
+    Returns:
+        List[MeasurementKeys]:
+            The keys of the measurements `1, 2, ...` up to the first missing index.
+    """
+    measurements: Dict[int, MeasurementKeys] = {}
+
+    for key in data_template:
+        match = MEASUREMENT_KEY.match(key)
+        if match is None:
+            continue
+        measurement_index = int(match.group(1))
+        if measurement_index not in measurements:
+            measurements[measurement_index] = MeasurementKeys(match.group(2))
+        measurement = measurements[measurement_index]
+        suffix = key.split(f"{measurement.measurement_type}/", 1)[1]
+        units = data_template.get(f"{key}/@units")
+
+        if "/Contact Sets/" in key:
+            contact_set = CONTACT_SET_KEY.search(key).group(1)
+            name, unit = split_value_unit(key.split(f"{contact_set}/")[1])
+            measurement.contact_sets.setdefault(contact_set, []).append(
+                TemplateKey(key, name, unit, units, is_table="data0" in key)
+            )
+            continue
+
+        data_block = DATA_BLOCK_KEY.search(key)
+        if data_block is not None:
+            data_index = data_block.group(1)
+            name = to_snake_case(suffix).split(f"data{data_index}/")[1]
+            measurement.data_blocks.setdefault(data_index, []).append(
+                TemplateKey(key, name, units=units)
+            )
+            continue
+
+        name, unit = split_value_unit(suffix)
+        measurement.keys.append(TemplateKey(key, rename_key(name), unit, units))
+
+    indexed = []
+    while len(indexed) + 1 in measurements:
+        indexed.append(measurements[len(indexed) + 1])
+    return indexed
+
+
+@lru_cache(maxsize=None)
+def quantity_unit(section_class: type, name: str) -> Optional[str]:
+    """Returns the unit of a quantity of a section class, if it has one."""
+    quantity = section_class.m_def.all_quantities.get(name)
+    if quantity is None or quantity.unit is None:
+        return None
+    return str(quantity.unit)
+
+
+def set_array(section, name: str, values: np.ndarray, unit: str):
+    """
+    Sets a float array given in `unit` on a results section.
+
+    The values are converted to the unit of the quantity with a single multiply,
+    and an offset for units like `°C`, and assigned as plain contiguous float64
+    array, without a pint quantity.
+    Values which are not numbers, e.g. `ERROR`, become NaN.
+
+    Args:
+        section: The results MSection.
+        name (str): The name of the quantity.
+        values (np.ndarray): The values as read from the file.
+        unit (str): The unit of the values as written in the file.
+    """
+    if values.dtype.kind != "f":
+        import pandas as pd
+
+        values = pd.to_numeric(values, errors="coerce")
+    values = np.asarray(values, dtype=np.float64)
+    target = quantity_unit(type(section), name)
+    if target is None:
+        setattr(section, name, values * unit_info(unit).quantity)
+        return
+    setattr(
+        section,
+        name,
+        np.ascontiguousarray(unit_conversion(unit, target).apply(values)),
+    )
+
+
+def set_table_columns(section, data: "pd.DataFrame"):
+    """
+    Sets the columns of a contact set data frame on its results section.
+
+    Args:
+        section: The results MSection of the contact set.
+        data (pd.DataFrame): The data frame of the contact set.
+    """
+    for column in data.columns:
+        if (data[column] == "ERROR").all():
+            continue
+        if data[column].isna().all():
+            continue
+        col, unit = split_value_unit(column)
+        clean_col = col.lower().replace(" ", "_")
+        if hasattr(section, clean_col):
+            if unit is not None:
+                set_array(section, clean_col, data[column].to_numpy(), unit)
+            else:
+                setattr(section, clean_col, data[column])
+
+
+def get_measurements(data_template: dict) -> Generator["Measurement", None, None]:
     """
     Returns a hall measurement MSection representation form its corresponding
     nexus data_template.
@@ -768,138 +1097,76 @@ def get_measurements(data_template: dict) -> Generator[Measurement, None, None]:
         Generator[Measurement, None, None]:
             A generator yielding the single hall measurements.
     """
-    highest_index = 1
+    import pandas as pd
 
-    for key in data_template:
-        if bool(re.search(f"^/entry/measurement/{highest_index}_.+/", key)):
-            highest_index += 1
-
-    for measurement_index in range(1, highest_index):
-        first = True
-        data_entries: dict = {}
-        contact_sets: dict = {}
+    for measurement in index_measurement_keys(data_template):
+        measurement_type = measurement.measurement_type
+        eln_measurement = get_measurement_object(measurement_type)
 
-        for key in data_template:
-            if not key.startswith(f"/entry/measurement/{measurement_index}_"):
+        for template_key in measurement.keys:
+            value = data_template[template_key.key]
+            if not hasattr(eln_measurement, template_key.name):
                 continue
-
-            if first:
-                measurement_type = re.search(
-                    f"measurement/{measurement_index}_([^/]+)/", key
-                ).group(1)
-                first = False
-                eln_measurement = get_measurement_object(measurement_type)
-
-            clean_key = to_snake_case(key.split(f"{measurement_type}/")[1])
-
-            if "/Contact Sets/" in key:
-                contact_set = re.search("/Contact Sets/([^/]+)/", key).group(1)
-                if contact_set not in contact_sets:
-                    contact_sets[contact_set] = get_data_object(measurement_type)
-                clean_dkey = clean_key.split(f"{contact_set.lower()}/")[1]
-                contact_sets[contact_set].contact_set = contact_set
-
-                if "data0" in key:
-                    data = data_template[key]
-
-                    for column in data.columns:
-                        if (data[column] == "ERROR").all():
-                            continue
-                        if data[column].isna().all():
-                            continue
-                        col, unit = split_value_unit(column)
-                        clean_col = col.lower().replace(" ", "_")
-                        if hasattr(contact_sets[contact_set], clean_col):
-                            if unit is not None:
-                                setattr(
-                                    contact_sets[contact_set],
-                                    clean_col,
-                                    pd.to_numeric(
-                                        data[column], errors="coerce"
-                                    )  # data[column].astype(np.float64)
-                                    * ureg(unit),
-                                )
-                            else:
-                                setattr(
-                                    contact_sets[contact_set],
-                                    clean_col,
-                                    data[column],
-                                )
+            if template_key.units is not None:
+                setattr(
+                    eln_measurement,
+                    template_key.name,
+                    value * unit_info(template_key.units).quantity,
+                )
+            elif template_key.unit is not None:
+                if value == "ERROR":
                     continue
+                if not pd.isna(value):
+                    continue
+                setattr(
+                    eln_measurement,
+                    template_key.name,
+                    value * unit_info(template_key.unit).quantity,
+                )
+            else:
+                setattr(eln_measurement, template_key.name, value)
 
-                clean_dkey, unit = split_value_unit(key.split(f"{contact_set}/")[1])
-                if hasattr(contact_sets[contact_set], clean_dkey):
-                    if unit is not None:
-                        setattr(
-                            contact_sets[contact_set],
-                            clean_dkey,
-                            data_template[key] * ureg(unit),
-                        )
-                    elif f"{key}/@units" in data_template:
-                        setattr(
-                            contact_sets[contact_set],
-                            clean_dkey,
-                            data_template[key] * ureg(data_template[f"{key}/@units"]),
-                        )
-                    else:
-                        setattr(
-                            contact_sets[contact_set],
-                            clean_dkey,
-                            data_template[key],
-                        )
-                continue
-
-            regexp = re.compile("/data(\\d+)/")
-            if bool(regexp.search(key)):
-                data_index = regexp.search(key).group(1)
-                if data_index not in data_entries:
-                    data_entries[data_index] = get_data_object(measurement_type)
-                clean_dkey = clean_key.split(f"data{data_index}/")[1]
-                if hasattr(data_entries[data_index], clean_dkey):
-                    if f"{key}/@units" in data_template:
-                        setattr(
-                            data_entries[data_index],
-                            clean_dkey,
-                            pd.to_numeric(
-                                data_template[key], errors="coerce"
-                            )  # data_template[key].astype(np.float64)
-                            * ureg(data_template[f"{key}/@units"]),
-                        )
-                    else:
-                        setattr(
-                            data_entries[data_index],
-                            clean_dkey,
-                            data_template[key],
-                        )
-                continue
-
-            clean_key, unit = split_value_unit(key.split(f"{measurement_type}/")[1])
-            clean_key = rename_key(clean_key)
-            if hasattr(eln_measurement, clean_key):
-                if f"{key}/@units" in data_template:
-                    setattr(
-                        eln_measurement,
-                        clean_key,
-                        data_template[key] * ureg(data_template[f"{key}/@units"]),
-                    )
-                elif unit is not None:
-                    if data_template[key] == "ERROR":
-                        continue
-                    if not pd.isna(data_template[key]):
-                        continue
-                    setattr(
-                        eln_measurement,
-                        clean_key,
-                        data_template[key] * ureg(unit),
+        data_entries = []
+        for template_keys in measurement.data_blocks.values():
+            data_entry = get_data_object(measurement_type)
+            for template_key in template_keys:
+                if not hasattr(data_entry, template_key.name):
+                    continue
+                value = data_template[template_key.key]
+                if template_key.units is not None:
+                    set_array(
+                        data_entry,
+                        template_key.name,
+                        np.asarray(value),
+                        template_key.units,
                     )
                 else:
-                    setattr(eln_measurement, clean_key, data_template[key])
+                    setattr(data_entry, template_key.name, value)
+            data_entries.append(data_entry)
+
+        contact_sets = []
+        for contact_set, template_keys in measurement.contact_sets.items():
+            data_entry = get_data_object(measurement_type)
+            data_entry.contact_set = contact_set
+            for template_key in template_keys:
+                value = data_template[template_key.key]
+                if template_key.is_table:
+                    set_table_columns(data_entry, value)
+                    continue
+                if not hasattr(data_entry, template_key.name):
+                    continue
+                if template_key.unit is not None:
+                    value = value * unit_info(template_key.unit).quantity
+                elif template_key.units is not None:
+                    value = value * unit_info(template_key.units).quantity
+                setattr(data_entry, template_key.name, value)
+            contact_sets.append(data_entry)
 
         eln_measurement.results = []
-        for data_entry in data_entries.values():
+        for data_entry in data_entries:
             eln_measurement.results.append(data_entry)
 
-        for data_entry in contact_sets.values():
+        for data_entry in contact_sets:
             eln_measurement.results.append(calc_best_fit_values(data_entry))
 
         if measurement_type == "Variable Temperature Measurement":
@@ -912,23 +1179,140 @@ def get_measurements(data_template: dict) -> Generator[Measurement, None, None]:
         yield eln_measurement
 
 
+def keithley_model_key(model: str) -> str:
+    """
+    Normalizes a Keithley model name, e.g. `Keithley 2182` to `keithley2182`.
+
+    Args:
+        model (str): The model as written in the file or the class name.
+
+    Returns:
+        str: The key of the model in `keithley_registry`.
+    """
+    return to_snake_case(model.replace(" ", ""))
+
+
+@lru_cache(maxsize=None)
+def keithley_registry() -> Dict[str, type]:
+    """Returns the Keithley classes of the instrument module by their model key."""
+    from lakeshore_nomad_plugin.hall import instrument as hall_instrument
+
+    return {
+        keithley_model_key(attr_name): attr_class
+        for attr_name, attr_class in vars(hall_instrument).items()
+        if isinstance(attr_class, type)
+        and issubclass(attr_class, hall_instrument.Keithley)
+        and attr_class is not hall_instrument.Keithley
+    }
+
+
 def instantiate_keithley(system, field_key, value, logger):
     """
     Create an instance of a Keithley component class.
 
     The class is choosen among the available ones in instrument module,
     based on which value is found in the `measurement_state_machine` section.
+    Models without a class in the instrument module are reported and skipped.
     """
 
     subsection_key = field_key.replace("_", "")
-    subsection_value = value.replace(" ", "")
-    for attr_name, attr_class in vars(hall_instrument).items():
-        if to_snake_case(subsection_value) in to_snake_case(attr_name):
-            logger.info(f"The {field_key} is {value}")
-            if not hasattr(system, subsection_key):
-                logger.warn(f"{subsection_key} subsection not found")
-            setattr(system, subsection_key, attr_class())
-            return to_snake_case(value)
+    keithley_class = keithley_registry().get(keithley_model_key(value))
+    if keithley_class is None:
+        logger.warning(f"Unknown Keithley model {value} for the {field_key}")
+        return None
+    logger.info(f"The {field_key} is {value}")
+    if not hasattr(system, subsection_key):
+        logger.warn(f"{subsection_key} subsection not found")
+    setattr(system, subsection_key, keithley_class())
+    return to_snake_case(value)
+
+
+KEITHLEY_DEVICES = ("electro_meter", "volt_meter", "current_meter", "current_source")
+INSTRUMENT_COMPONENTS = ("system_parameters", "temperature_controller", "field_controller")
+STATE_MACHINE = "measurement_state_machine"
+TEMPERATURE_DOMAIN_SECTION = re.compile(r"temperature_domain_(\d+)$")
+
+
+@dataclass
+class InstrumentPath:
+    """A node of the trie mapping section paths of the data template to the
+    instrument sections they fill.
+
+    Args:
+        sections (frozenset): The snake_case section names on the path.
+        state_machine (bool): Whether the path is in the measurement state machine.
+        keithley_device (bool):
+            Whether the keys of the path select the Keithley devices.
+        temperature_domain (Optional[str]): The index of the temperature domain.
+        components (Tuple[str, ...]): The instrument components on the path.
+        children (Dict[str, InstrumentPath]): The nodes of the sub paths.
+    """
+
+    sections: frozenset
+    state_machine: bool = False
+    keithley_device: bool = False
+    temperature_domain: Optional[str] = None
+    components: Tuple[str, ...] = ()
+    children: Dict[str, "InstrumentPath"] = field(default_factory=dict)
+
+
+def compile_instrument_path(sections: List[str]) -> InstrumentPath:
+    """
+    Resolves the instrument sections addressed by a section path.
+
+    Args:
+        sections (List[str]): The snake_case section names of the path.
+
+    Returns:
+        InstrumentPath: The trie node of the path without children.
+    """
+    temperature_domain = None
+    for section in sections:
+        match = TEMPERATURE_DOMAIN_SECTION.search(section)
+        if match:
+            temperature_domain = match.group(1)
+            break
+    return InstrumentPath(
+        sections=frozenset(sections),
+        state_machine=STATE_MACHINE in sections,
+        keithley_device=STATE_MACHINE in sections
+        and sections.index(STATE_MACHINE) == len(sections) - 1,
+        temperature_domain=temperature_domain,
+        components=tuple(
+            component for component in INSTRUMENT_COMPONENTS if component in sections
+        ),
+    )
+
+
+INSTRUMENT_PATHS = InstrumentPath(frozenset())
+
+
+def get_instrument_path(sections: List[str]) -> InstrumentPath:
+    """
+    Looks up a section path in the trie and compiles its missing nodes.
+
+    Args:
+        sections (List[str]): The snake_case section names of the path.
+
+    Returns:
+        InstrumentPath: The trie node of the path.
+    """
+    node = INSTRUMENT_PATHS
+    for depth, section in enumerate(sections):
+        if section not in node.children:
+            node.children[section] = compile_instrument_path(sections[: depth + 1])
+        node = node.children[section]
+    return node
+
+
+@lru_cache(maxsize=None)
+def section_has_quantity(section_class: type, name: str) -> bool:
+    """Whether instances of a section class have the quantity or sub section."""
+    return hasattr(section_class, name)
+
+
+def has_quantity(section, name: str) -> bool:
+    return section_has_quantity(type(section), name)
 
 
 def get_instrument(data_template: dict, logger):
@@ -936,6 +1320,9 @@ def get_instrument(data_template: dict, logger):
     Returns a hall instrument MSection representation form its corresponding
     nexus data_template.
 
+    Every key is dispatched to its sections through the `INSTRUMENT_PATHS` trie
+    of its section path.
+
     Args:
         data_template (dict): The nomad-parser-nexus data template.
 
@@ -943,58 +1330,45 @@ def get_instrument(data_template: dict, logger):
         an Instrument object according to the schema in instrument.py
     """
 
-    keithley_devices = [
-        "electro_meter",
-        "volt_meter",
-        "current_meter",
-        "current_source",
-    ]
+    from lakeshore_nomad_plugin.hall import instrument as hall_instrument
+
     keithley_components = {}
-    other_components = [
-        "system_parameters",
-        "temperature_controller",
-        "field_controller",
-    ]
     instrument = hall_instrument.Instrument()
     instrument.temperature_controller = hall_instrument.TemperatureController()
     instrument.field_controller = hall_instrument.FieldController()
     temperature_domains: dict = {}
     for key in data_template:
-        clean_key = to_snake_case(key)
-        field_key = clean_key.split("/")[-1]
+        path = to_snake_case(key).split("/")
+        field_key = path[-1]
+        node = get_instrument_path(path[1:-1])
         value = data_template[key]
-        if "/measurement_state_machine/" in clean_key:
-            if hasattr(instrument, field_key):
-                setattr(instrument, field_key, value)
-                for k_device in keithley_devices:
-                    if k_device == clean_key.split("/measurement_state_machine/")[1]:
-                        keithley_components[k_device.replace("_", "")] = (
-                            instantiate_keithley(instrument, field_key, value, logger)
-                        )
-        regexp = re.compile("temperature_domain_(\\d+)/")
-        if bool(regexp.search(clean_key)):
-            data_index = regexp.search(clean_key).group(1)
-            if data_index not in temperature_domains:
-                temperature_domains[data_index] = hall_instrument.TemperatureDomain()
-            if hasattr(temperature_domains[data_index], field_key):
-                setattr(temperature_domains[data_index], field_key, value)
+        if node.state_machine and has_quantity(instrument, field_key):
+            setattr(instrument, field_key, value)
+            if node.keithley_device and field_key in KEITHLEY_DEVICES:
+                keithley_components[field_key.replace("_", "")] = (
+                    instantiate_keithley(instrument, field_key, value, logger)
+                )
+        if node.temperature_domain is not None:
+            if node.temperature_domain not in temperature_domains:
+                temperature_domains[node.temperature_domain] = (
+                    hall_instrument.TemperatureDomain()
+                )
+            temperature_domain = temperature_domains[node.temperature_domain]
+            if has_quantity(temperature_domain, field_key):
+                setattr(temperature_domain, field_key, value)
             continue
-        for instrument_comp in other_components:
-            if instrument_comp is not None and f"/{instrument_comp}/" in clean_key:
-                if hasattr(instrument, field_key):
-                    setattr(instrument, field_key, value)
-                elif hasattr(instrument, instrument_comp):
-                    if hasattr(getattr(instrument, instrument_comp), field_key):
-                        setattr(getattr(instrument, instrument_comp), field_key, value)
-        for instrument_comp in list(keithley_components.keys()):
-            if (
-                instrument_comp is not None
-                and f"/{keithley_components[instrument_comp]}/" in clean_key
-            ):
-                if hasattr(instrument, instrument_comp) and hasattr(
-                    getattr(instrument, instrument_comp), field_key
-                ):
-                    setattr(getattr(instrument, instrument_comp), field_key, value)
+        for instrument_comp in node.components:
+            if has_quantity(instrument, field_key):
+                setattr(instrument, field_key, value)
+            elif has_quantity(instrument, instrument_comp):
+                component = getattr(instrument, instrument_comp)
+                if has_quantity(component, field_key):
+                    setattr(component, field_key, value)
+        for instrument_comp, model in list(keithley_components.items()):
+            if model in node.sections and has_quantity(instrument, instrument_comp):
+                component = getattr(instrument, instrument_comp)
+                if has_quantity(component, field_key):
+                    setattr(component, field_key, value)
     for t_domain in temperature_domains.values():
         instrument.m_add_sub_section(
             hall_instrument.Instrument.temperature_domain, t_domain
@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import pytest
+import yaml
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from lakeshore_nomad_plugin.hall import utils
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    HallMeasurementsParser,
+)
+from lakeshore_nomad_plugin.hall.schema import HallMeasurement
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+
+
+class Upload:
+    def __init__(self):
+        self.processed = []
+
+    def process_updated_raw_file(self, filename, allow_modify=False):
+        self.processed.append(filename)
+
+
+class Context:
+    """A minimal upload context writing into a local directory."""
+
+    upload_id = 'upload'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.upload = Upload()
+
+    def raw_path_exists(self, path):
+        return os.path.exists(os.path.join(self.directory, path))
+
+    def raw_file(self, path, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+
+ENTRY = {'data': {'name': 'sample', 'values': [1.0, float('nan')]}}
+FILENAME = 'sample.archive.yaml'
+
+
+@pytest.fixture
+def context(tmp_path):
+    return Context(str(tmp_path))
+
+
+def test_create_archive_writes_fingerprint(context, tmp_path):
+    utils.create_archive(ENTRY, context, FILENAME, 'yaml', logging.getLogger())
+
+    content = (tmp_path / FILENAME).read_bytes()
+    sidecar = tmp_path / f'.{FILENAME}.sha256'
+    assert sidecar.read_text() == utils.fingerprint(content)
+    assert context.upload.processed == [FILENAME]
+
+
+def test_create_archive_compares_fingerprints(context, monkeypatch, caplog):
+    logger = logging.getLogger(__name__)
+    utils.create_archive(ENTRY, context, FILENAME, 'yaml', logger)
+
+    def safe_load(stream):
+        raise AssertionError('archive with fingerprint must not be loaded')
+
+    monkeypatch.setattr(yaml, 'safe_load', safe_load)
+    utils.create_archive(ENTRY, context, FILENAME, 'yaml', logger)
+    assert context.upload.processed == [FILENAME, FILENAME]
+
+    utils.create_archive({'data': {'name': 'other'}}, context, FILENAME, 'yaml', logger)
+    assert context.upload.processed == [FILENAME, FILENAME]
+    assert 'already exists' in caplog.text
+
+
+def test_create_archive_legacy_file(context, tmp_path, caplog):
+    logger = logging.getLogger(__name__)
+    (tmp_path / FILENAME).write_text(yaml.dump(ENTRY, default_flow_style=True))
+
+    utils.create_archive(ENTRY, context, FILENAME, 'yaml', logger)
+    assert context.upload.processed == [FILENAME]
+    assert (tmp_path / f'.{FILENAME}.sha256').exists()
+
+    # An edited archive no longer matches its fingerprint
+    (tmp_path / FILENAME).write_text(yaml.dump({'data': {'name': 'edited'}}))
+    utils.create_archive(ENTRY, context, FILENAME, 'yaml', logger)
+    assert context.upload.processed == [FILENAME]
+    assert 'already exists' in caplog.text
+    assert 'different content at /data/values.' in caplog.text
+
+
+@pytest.mark.parametrize(
+    'a, b, difference',
+    [
+        ({'values': [1.0, float('nan')]}, {'values': [1.0, float('nan')]}, None),
+        (
+            {'data': {'values': [1.0, 2.0]}},
+            {'data': {'values': [1.0, 2.5]}},
+            '/data/values/1',
+        ),
+        ([[1.0, 2.0], [3.0, 4.0]], [[1.0, 2.0], [3.0, 5.0]], '/1/1'),
+        ([[1.0, 2.0], [3.0]], [[1.0, 2.0], [4.0]], '/1/0'),
+        ({'name': 'a'}, {'name': 'a', 'values': []}, '/values'),
+        ({'values': [1.0]}, {'values': [1.0, 2.0]}, '/values'),
+        ([1.0, 'text'], [1.0, 'other'], '/1'),
+        ([{'value': float('nan')}], [{'value': float('nan')}], None),
+        (np.array([1.0, np.nan]), [1.0, float('nan')], None),
+        ([1, 2], [1.0, 2.0], None),
+        (1.0, 2.0, '/'),
+    ],
+)
+def test_first_difference(a, b, difference):
+    assert utils.first_difference(a, b) == difference
+    assert utils.nan_equal(a, b) == (difference is None)
+
+
+def test_first_difference_tolerances():
+    a = {'value': 1.0, 'values': [1.0, 2.0, float('nan')]}
+    b = {'value': 1.0 + 1e-12, 'values': [1.0, 2.0 + 1e-12, float('nan')]}
+
+    assert utils.first_difference(a, b) == '/value'
+    assert utils.first_difference(a, b, rtol=1e-9) is None
+    assert utils.first_difference(a, b, atol=1e-9) is None
+    assert utils.first_difference(a, {**b, 'value': 1.1}, rtol=1e-9) == '/value'
+
+
+def test_serialize_archive_json_keeps_nan():
+    entry = {
+        'values': [1.0, float('nan'), 3.0],
+        'matrix': [[1.0, 2.0], [3.0, 4.0]],
+        'limits': [float('-inf'), 0.5],
+        'mixed': [1.0, 'text'],
+        'sections': [{'value': 1.5}],
+    }
+
+    content = utils.serialize_archive(entry, 'json')
+
+    assert b'NaN' in content
+    assert utils.dict_nan_equal(json.loads(content), entry)
+
+
+def test_serialize_archive_json_nan_scalars():
+    nan = float('nan')
+    entry = {
+        'a': nan,
+        'b': [1, 2.5, nan],
+        'c': [nan, 1.0],
+        'd': float('inf'),
+        'e': np.float64('nan'),
+        'f': np.float32(1.5),
+        'g': [1, 2],
+        'h': [True, 'text'],
+    }
+
+    content = utils.serialize_archive(entry, 'json')
+
+    assert b'null' not in content
+    assert utils.first_difference(json.loads(content), entry) is None
+    assert json.loads(content)['e'] != []
+
+
+def test_archive_file_type_keeps_existing_archive(context, tmp_path):
+    assert utils.archive_file_type(context, 'sample', 'json') == 'json'
+
+    (tmp_path / FILENAME).write_text(yaml.dump(ENTRY))
+    assert utils.archive_file_type(context, 'sample', 'json') == 'yaml'
+
+
+def test_measurement_parser_json_output(context, tmp_path):
+    mainfile = shutil.copy(IV_FILE, tmp_path)
+    parser = HallMeasurementsParser(archive_file_type='json')
+    archive = EntryArchive(m_context=context, metadata=EntryMetadata())
+
+    parser.parse(str(mainfile), archive, logging.getLogger(__name__))
+
+    with open(tmp_path / '20-154-G_Hall-RT_meas.archive.json', 'rb') as file:
+        hall_archive = json.load(file)
+    measurement = HallMeasurement.m_from_dict(hall_archive['data'])
+    assert len(measurement.measurements) == 2
+    assert measurement.measurements[0].results[0].current.shape == (11,)
+    assert (tmp_path / '20-154-G_Hall-RT_exp.archive.json').exists()
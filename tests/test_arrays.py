@@ -0,0 +1,84 @@
+import json
+import logging
+import shutil
+
+import numpy as np
+import pytest
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from lakeshore_nomad_plugin.hall import arrays
+from lakeshore_nomad_plugin.hall.benchmark import DirectoryContext
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    HallMeasurementsParser,
+    build_measurement_dict,
+)
+from lakeshore_nomad_plugin.hall.schema import HallMeasurement
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+
+
+def parse(tmp_path, threshold):
+    mainfile = shutil.copy(IV_FILE, tmp_path)
+    context = DirectoryContext(str(tmp_path))
+    parser = HallMeasurementsParser(
+        archive_file_type='json', array_file_threshold=threshold
+    )
+    archive = EntryArchive(m_context=context, metadata=EntryMetadata())
+    parser.parse(str(mainfile), archive, logging.getLogger(__name__))
+    with open(tmp_path / '20-154-G_Hall-RT_meas.archive.json', 'rb') as file:
+        return context, json.load(file)['data']
+
+
+def test_store_arrays():
+    hall_data = build_measurement_dict(IV_FILE, 'iv', logging.getLogger(__name__))
+    current = hall_data['measurements'][0]['results'][0]['current']
+    size = arrays.array_bytes(hall_data)
+
+    content = arrays.store_arrays(hall_data, 'iv.h5')
+    assert arrays.array_bytes(hall_data) == 0
+    result = hall_data['measurements'][0]['results'][0]
+    assert 'current' not in result
+    assert result['best_fit_resistance'] == 1783.6
+    assert result['array_file'] == 'iv.h5#/measurements/0/results/0'
+    assert result['array_summary']['current'] == {
+        'size': 11,
+        'min': min(current),
+        'max': max(current),
+    }
+    assert hall_data['results'][0]['array_file'] == 'iv.h5#/results/0'
+    assert 0 < len(content)
+    assert size > 0
+
+
+def test_parser_writes_array_file(tmp_path):
+    context, hall_data = parse(tmp_path, threshold=0)
+
+    assert (tmp_path / '20-154-G_Hall-RT_meas.h5').exists()
+    measurement = HallMeasurement.m_from_dict(hall_data)
+    result = measurement.measurements[0].results[0]
+    assert result.current is None
+    current = arrays.result_array(result, 'current', context)
+    assert current.to('ampere').magnitude.shape == (11,)
+    assert current.to('ampere').magnitude[0] == pytest.approx(-1.0009e-05)
+    voltage = arrays.read_array(context, result.array_file, 'voltage')
+    assert voltage.dtype == np.float64
+
+
+def test_parser_keeps_small_arrays_inline(tmp_path):
+    context, hall_data = parse(tmp_path, threshold=1024**2)
+
+    assert not (tmp_path / '20-154-G_Hall-RT_meas.h5').exists()
+    result = HallMeasurement.m_from_dict(hall_data).measurements[0].results[0]
+    assert result.array_file is None
+    assert arrays.result_array(result, 'current', context).shape == (11,)
+
+
+def test_protected_archive_keeps_its_arrays(tmp_path, caplog):
+    _, inline = parse(tmp_path, threshold=1024**2)
+
+    # Moving the arrays into a sidecar changes the content of the archive
+    _, hall_data = parse(tmp_path, threshold=0)
+
+    assert 'already exists' in caplog.text
+    assert hall_data == inline
+    assert not (tmp_path / '20-154-G_Hall-RT_meas.h5').exists()
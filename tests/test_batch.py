@@ -0,0 +1,100 @@
+import logging
+import os
+import shutil
+
+import pytest
+
+from lakeshore_nomad_plugin.hall.measurement_parser import batch
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import build_measurement
+
+DATA = 'tests/data/hall'
+MEASUREMENT_FILES = ['20-154-G_Hall-RT.txt', '22-211-G_Hall_23K-320K_TT-Halter.txt']
+HMS_FILE = 'HMS-Configuration-Pietsch_Hall-TT-Halter_15-350K.txt'
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for name in [*MEASUREMENT_FILES, HMS_FILE]:
+        shutil.copy(f'{DATA}/{name}', tmp_path / name)
+    (tmp_path / 'broken.txt').write_text(
+        '[Sample parameters]\n[Measurements]\n<Step 1: IV Curve Measurement>\n'
+        'Start Time=07/06/22 13:25:37\n'
+    )
+    return tmp_path
+
+
+def test_find_measurement_files(directory):
+    paths = batch.find_measurement_files(str(directory))
+
+    assert [path.split('/')[-1] for path in paths] == sorted(
+        ['broken.txt', *MEASUREMENT_FILES]
+    )
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_convert_directory(directory, workers):
+    results = batch.convert_directory(str(directory), workers=workers)
+
+    assert [result.path.split('/')[-1] for result in results] == sorted(
+        ['broken.txt', *MEASUREMENT_FILES]
+    )
+    room_temperature, variable_temperature, broken = results
+    assert not broken.ok
+    assert broken.error == "KeyError: 'Contact Sets'"
+    assert broken.measurement is None
+    assert room_temperature.ok and variable_temperature.ok
+    assert room_temperature.measurement['name'] == '20-154-G_Hall-RT_meas'
+    assert room_temperature.measurement['tags'] == ['Room Temperature']
+
+    expected = build_measurement(
+        room_temperature.path, '20-154-G_Hall-RT_meas', logging.getLogger(__name__)
+    )
+    assert room_temperature.measurement == expected.m_to_dict(with_root_def=True)
+
+
+def test_convert_files_with_cache(directory, tmp_path):
+    paths = [str(directory / name) for name in MEASUREMENT_FILES]
+    cache_dir = str(tmp_path / 'cache')
+
+    first = batch.convert_files(paths, workers=2, parse_cache_dir=cache_dir)
+    second = batch.convert_files(paths, workers=2, parse_cache_dir=cache_dir)
+    assert [result.measurement for result in first] == [
+        result.measurement for result in second
+    ]
+
+
+def convert_or_die(path, *arguments):
+    if path.endswith('crash.txt'):
+        os._exit(1)
+    return CONVERT_FILE(path, *arguments)
+
+
+CONVERT_FILE = batch.convert_file
+
+
+def test_convert_files_after_worker_died(directory, monkeypatch):
+    paths = [str(directory / name) for name in MEASUREMENT_FILES]
+    crash = str(directory / 'crash.txt')
+    monkeypatch.setattr(batch, 'convert_file', convert_or_die)
+
+    results = batch.convert_files([paths[0], crash, paths[1]], workers=2)
+
+    assert [result.path for result in results] == [paths[0], crash, paths[1]]
+    assert results[0].ok and results[2].ok
+    assert results[1].error == batch.WORKER_DIED
+
+
+def test_measurement_name():
+    assert batch.measurement_name('data/20-154-G_Hall-RT.txt') == '20-154-G_Hall-RT_meas'
+    assert batch.measurement_name('data/sample.lakeshore') == 'sample_meas'
+
+
+def test_main(directory, tmp_path, capsys):
+    output = tmp_path / 'archives'
+
+    assert batch.main([str(directory), '--workers', '2', '--output', str(output)]) == 1
+    assert sorted(path.name for path in output.iterdir()) == [
+        '20-154-G_Hall-RT_meas.archive.json',
+        '22-211-G_Hall_23K-320K_TT-Halter_meas.archive.json',
+    ]
+    assert 'FAILED' in capsys.readouterr().out
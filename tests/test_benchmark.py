@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from lakeshore_nomad_plugin.hall import benchmark
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import parse_file
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+HMS_FILE = 'tests/data/hall/HMS-Configuration-Pietsch_Hall-TT-Halter_15-350K.txt'
+
+
+def test_benchmark_measurement_file():
+    results = benchmark.benchmark_file(IV_FILE, rounds=1)
+
+    assert [result.stage for result in results] == [
+        'parse_file',
+        'populate_archive',
+        'parse_txt',
+        'get_measurements',
+        'm_to_dict',
+        'create_archive',
+    ]
+    for result in results:
+        assert result.lines == 114
+        assert result.seconds > 0
+        assert result.peak_memory > 0
+        assert result.lines_per_second > 0
+
+
+def test_benchmark_configuration_file():
+    results = benchmark.benchmark_file(HMS_FILE, rounds=1, file_type='json')
+
+    assert [result.stage for result in results] == [
+        'parse_txt',
+        'get_instrument',
+        'm_to_dict',
+        'create_archive',
+    ]
+
+
+def test_scale_measurement_file(tmp_path):
+    scaled = benchmark.scale_measurement_file(IV_FILE, tmp_path / 'scaled.txt', 4)
+
+    steps = parse_file(scaled)['Measurements']
+    assert len(steps) == 4 * len(parse_file(IV_FILE)['Measurements'])
+    assert 'Variable Field Measurement (8)' in steps
+
+
+def test_compare_reports_regressions(tmp_path):
+    baseline = benchmark.run_benchmarks([IV_FILE], rounds=1)
+    output = tmp_path / 'baseline.json'
+    output.write_text(json.dumps(baseline))
+    current = json.loads(output.read_text())
+    assert benchmark.compare(baseline, current) == []
+
+    current['results'][0]['seconds'] *= 2
+    (regression,) = benchmark.compare(baseline, current)
+    assert regression.startswith('20-154-G_Hall-RT.txt parse_file: seconds')
+
+
+def test_benchmark_synthetic_file():
+    baseline = benchmark.run_benchmarks([], rounds=1, synthetic_steps=[3])
+
+    assert {result['file'] for result in baseline['results']} == {
+        'synthetic_3_steps.txt'
+    }
+
+
+def test_lazy_imports():
+    budgets = {module: float('inf') for module in benchmark.IMPORT_BUDGETS}
+
+    assert benchmark.check_imports(budgets) == []
+
+
+@pytest.mark.benchmark
+def test_import_budgets():
+    assert benchmark.check_imports() == []
+
+
+def test_import_times_report_violations():
+    budget, dependency = benchmark.check_imports(
+        {'lakeshore_nomad_plugin.hall.reader': 0.0}, lazy=['numpy']
+    )
+    assert budget.startswith('lakeshore_nomad_plugin.hall.reader: ')
+    assert dependency.endswith(': imports numpy')
+
+    records = benchmark.import_times('lakeshore_nomad_plugin.hall.reader')
+    assert records[-1].module == 'lakeshore_nomad_plugin.hall.reader'
+    assert not {'pandas', 'nomad.datamodel'} & {record.module for record in records}
@@ -0,0 +1,113 @@
+import logging
+import os
+import shutil
+
+import pytest
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import ClientContext
+
+from lakeshore_nomad_plugin.hall import cache
+from lakeshore_nomad_plugin.hall.measurement_parser import parser as measurement_parser
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+
+
+class CountingParse:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        with open(path, 'rb') as file:
+            return {'size': len(file.read())}
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    path = tmp_path / 'raw.txt'
+    path.write_bytes(b'[Sample parameters]\n')
+    return str(path)
+
+
+def test_get_or_parse_hits(tmp_path, raw_file):
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+    parse = CountingParse()
+
+    first = parse_cache.get_or_parse(raw_file, 'measurement', parse)
+    second = parse_cache.get_or_parse(raw_file, 'measurement', parse)
+
+    assert first == second == {'size': 20}
+    assert parse.calls == 1
+
+
+def test_key_depends_on_content_kind_and_version(tmp_path, raw_file, monkeypatch):
+    directory = str(tmp_path / 'cache')
+    key = cache.ParseCache(directory, version='1').key(raw_file, 'measurement')
+
+    assert cache.ParseCache(directory, version='2').key(raw_file, 'measurement') != key
+    assert cache.ParseCache(directory, version='1').key(raw_file, 'template') != key
+    monkeypatch.setattr(cache, 'CACHE_FORMAT_VERSION', cache.CACHE_FORMAT_VERSION + 1)
+    assert cache.ParseCache(directory, version='1').key(raw_file, 'measurement') != key
+    monkeypatch.undo()
+    with open(raw_file, 'ab') as file:
+        file.write(b'Sample Type:\tvan der Pauw\n')
+    assert cache.ParseCache(directory, version='1').key(raw_file, 'measurement') != key
+
+
+def test_corrupt_entry_is_reparsed(tmp_path, raw_file):
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'))
+    parse = CountingParse()
+    parse_cache.get_or_parse(raw_file, 'measurement', parse)
+    (entry,) = os.listdir(parse_cache.directory)
+    with open(os.path.join(parse_cache.directory, entry), 'wb') as file:
+        file.write(b'\x80')
+
+    assert parse_cache.get_or_parse(raw_file, 'measurement', parse) == {'size': 20}
+    assert parse.calls == 2
+
+
+def test_evicts_least_recently_used(tmp_path):
+    parse_cache = cache.ParseCache(str(tmp_path / 'cache'), max_bytes=3500)
+    for index in range(3):
+        parse_cache.store(str(index), b'x' * 1000)
+        entry = os.path.join(parse_cache.directory, f'{index}.pickle')
+        os.utime(entry, (index, index))
+    parse_cache.load('0')
+    parse_cache.store('3', b'x' * 1000)
+
+    assert sorted(os.listdir(parse_cache.directory)) == [
+        '0.pickle',
+        '2.pickle',
+        '3.pickle',
+    ]
+    with pytest.raises(KeyError):
+        parse_cache.load('1')
+
+
+def test_open_cache_disabled():
+    assert cache.open_cache(None) is None
+    assert cache.cached_parse(None, IV_FILE, 'measurement', os.path.basename) == (
+        '20-154-G_Hall-RT.txt'
+    )
+
+
+def test_measurement_parser_uses_cache(tmp_path, monkeypatch):
+    raw = tmp_path / 'raw'
+    raw.mkdir()
+    mainfile = str(shutil.copy(IV_FILE, raw))
+    context = ClientContext(local_dir=str(raw))
+    parser = measurement_parser.HallMeasurementsParser(
+        parse_cache_dir=str(tmp_path / 'cache')
+    )
+
+    def parse():
+        archive = EntryArchive(m_context=context, metadata=EntryMetadata())
+        parser.parse(mainfile, archive, logging.getLogger(__name__))
+        return archive
+
+    parse()
+    monkeypatch.setattr(measurement_parser, 'parse_file', None)
+    archive = parse()
+
+    assert archive.metadata.entry_name == '20-154-G_Hall-RT.txt measurement file'
+    assert len(os.listdir(tmp_path / 'cache')) == 1
@@ -0,0 +1,22 @@
+import pytest
+
+from lakeshore_nomad_plugin.hall import utils
+
+
+@pytest.mark.parametrize(
+    'value, kind',
+    [
+        ('2.0 [Sec]', utils.VALUE_WITH_UNIT),
+        ('Current [A]', utils.VALUE_WITH_UNIT),
+        ('-12', utils.INTEGER),
+        ('003', utils.INTEGER),
+        ('1.E+0', utils.NUMBER),
+        ('.5e-3', utils.NUMBER),
+        ('Off', utils.BOOLEAN),
+        ('Reverse Field: Yes', utils.BOOLEAN),
+        ('van der Pauw', None),
+        ('', None),
+    ],
+)
+def test_classify_value(value, kind):
+    assert utils.classify_value(value) == kind
@@ -0,0 +1,70 @@
+import numpy as np
+
+from lakeshore_nomad_plugin.hall import reader, utils
+from lakeshore_nomad_plugin.hall.document import read_document
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    parse_file,
+    populate_archive,
+)
+from lakeshore_nomad_plugin.hall.tokenizer import KeyValue, Text
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+ERRORS_FILE = 'tests/data/hall/20-158-G_Hall-RT.txt'
+HMS_FILE = 'tests/data/hall/HMS-Configuration-Pietsch_Hall-TT-Halter_15-350K.txt'
+
+
+def test_read_document():
+    document = read_document(IV_FILE)
+
+    sample, measurements = document.sections
+    assert sample.name == 'Sample parameters'
+    assert sample.quantities['Thickness'] == KeyValue('Thickness', '2.0', 'um')
+    assert Text('C121 5x5 A3') in sample.items
+    assert [step.key for step in measurements.steps] == [
+        'IV Curve Measurement (1)',
+        'Variable Field Measurement (2)',
+    ]
+    iv_curve, variable_field = measurements.steps
+    contact_set = iv_curve.contact_sets[0]
+    assert contact_set.name == 'R12,12'
+    resistance = contact_set.quantities['Best Fit Resistance']
+    assert resistance.unit_in_key
+    assert resistance.label == 'Best Fit Resistance [ohm]'
+    (table,) = contact_set.tables
+    assert table.header[0] == 'Current [A]'
+    assert table.values.shape == (4, 11)
+    assert variable_field.tables[0].names[0] == 'Field'
+
+
+def test_document_views():
+    document = read_document(IV_FILE)
+
+    assert document.to_dict().keys() == parse_file(IV_FILE).keys()
+    assert reader.document_template(document).keys() == reader.parse_txt(IV_FILE).keys()
+    assert len(populate_archive(document.to_dict())) == 2
+    assert len(list(utils.get_measurements(reader.document_template(document)))) == 2
+
+
+def test_contact_set_ends_at_blank_line():
+    step = read_document(ERRORS_FILE).sections[1].steps[0]
+
+    contact_set = step.contact_sets[0]
+    assert contact_set.tables[0].values.shape == (4, 4)
+    assert contact_set.items[-1] == Text('Keithley 2182 Reading aborted.')
+    assert len(parse_file(ERRORS_FILE)['Measurements'][step.key]['Contact Sets']) == 1
+    np.testing.assert_array_equal(
+        populate_archive(parse_file(ERRORS_FILE))[0].results[0].current.magnitude,
+        contact_set.tables[0].values[0],
+    )
+
+
+def test_template_values():
+    template = reader.parse_txt(IV_FILE)
+    step = '/entry/measurement/1_IV Curve Measurement'
+
+    assert template[f'{step}/Elapsed Time'] == 351.0
+    assert template[f'{step}/Dwell Time'] == 2.0
+    assert template[f'{step}/Dwell Time/@units'] == 's'
+    assert template[f'{step}/Contact Sets/R12,12/Best Fit Resistance [ohm]'] == 1783.6
+    configuration = reader.parse_txt(HMS_FILE)
+    assert configuration['/SystemParameters/Working Directory'].startswith('C:\\')
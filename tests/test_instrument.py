@@ -0,0 +1,77 @@
+import logging
+
+import pytest
+
+from lakeshore_nomad_plugin.hall import instrument, utils
+
+
+@pytest.mark.parametrize(
+    'value, section',
+    [
+        ('Keithley 182', instrument.Keithley182),
+        ('Keithley 2182', instrument.Keithley2182),
+        ('Keithley 220', instrument.Keithley220),
+        ('Keithley 2400', instrument.Keithley2400),
+    ],
+)
+def test_instantiate_keithley(value, section):
+    system = instrument.Instrument()
+
+    key = utils.instantiate_keithley(
+        system, 'volt_meter', value, logging.getLogger(__name__)
+    )
+    assert key == utils.to_snake_case(value)
+    assert type(system.voltmeter) is section
+
+
+def test_instantiate_unknown_keithley(caplog):
+    system = instrument.Instrument()
+
+    with caplog.at_level(logging.WARNING):
+        key = utils.instantiate_keithley(
+            system, 'current_meter', 'Keithley 485/6/7', logging.getLogger(__name__)
+        )
+    assert key is None
+    assert system.currentmeter is None
+    assert 'Unknown Keithley model Keithley 485/6/7' in caplog.text
+
+
+def test_keithley_registry():
+    assert sorted(utils.keithley_registry()) == sorted(
+        f'keithley{model}'
+        for model in ('7001', '6485', '220', '2000', '2182', '182', '2700', '2400')
+    )
+
+
+def test_instrument_path():
+    node = utils.get_instrument_path(['temperature_domain_3'])
+    assert node.temperature_domain == '3'
+    assert utils.get_instrument_path(['temperature_domain_3']) is node
+
+    node = utils.get_instrument_path(['measurement_state_machine'])
+    assert node.state_machine and node.keithley_device
+    node = utils.get_instrument_path(['measurement_state_machine', 'keithley_182'])
+    assert node.state_machine and not node.keithley_device
+    assert 'keithley_182' in node.sections
+
+    node = utils.get_instrument_path(['temperature_controller_loop_1'])
+    assert node.components == ()
+    assert utils.get_instrument_path(['field_controller']).components == (
+        'field_controller',
+    )
+
+
+def test_get_instrument():
+    data_template = {
+        '/Measurement State Machine/VoltMeter': 'Keithley 182',
+        '/Keithley 2182/Reading Rate': 'Slow',
+        '/Keithley 182/Analog Filter': True,
+        '/Field Controller/Ramp Rate': 500,
+        '/Temperature Domain 2/Low Temperature': 15.0,
+    }
+
+    system = utils.get_instrument(data_template, logging.getLogger(__name__))
+    assert type(system.voltmeter) is instrument.Keithley182
+    assert system.voltmeter.analog_filter is True
+    assert system.field_controller.ramp_rate.magnitude == 500
+    assert len(system.temperature_domain) == 1
@@ -1,11 +1,16 @@
+import logging
+from collections import Counter
+import numpy as np
 import pytest
 from glob import glob
 from nomad.client import parse, normalize_all
 import lakeshore_nomad_plugin.hall as hall
+import lakeshore_nomad_plugin.hall.reader
+from lakeshore_nomad_plugin.hall.trace import TRACE
 
 def get_test_files():
     """Get the transformation example file path."""
-    return glob("tests/data/*.txt")
+    return glob("tests/data/hall/*.txt")
 
 
 @pytest.mark.parametrize('filename', get_test_files())
@@ -21,4 +26,85 @@ def test_msection_generation(filename):
 @pytest.mark.parametrize('test_file', glob('tests/data/hall_eln_*.archive.yaml'))
 def test_schema(test_file):
     entry_archive = parse(test_file)[0]
-    normalize_all(entry_archive)
\ No newline at end of file
+    normalize_all(entry_archive)
+
+def test_parse_txt_is_silent(capsys):
+    hall.reader.parse_txt('tests/data/hall/test.txt')
+
+    assert capsys.readouterr().out == ''
+
+
+def test_parse_txt_trace(caplog):
+    with caplog.at_level(TRACE, logger=hall.reader.logger.name):
+        hall.reader.parse_txt('tests/data/hall/test.txt')
+
+    summary = caplog.records[-1]
+    assert summary.levelno == logging.DEBUG
+    counts = summary.args[1]
+    assert counts['section']['lines'] == 2
+    assert counts['measurement']['lines'] == 2
+    assert counts['data']['lines'] > 0
+    assert any(record.levelno == TRACE for record in caplog.records)
+
+
+def test_parse_txt_counts_unknown_options(tmp_path, caplog):
+    config = tmp_path / 'config.txt'
+    config.write_text(
+        '[Measurement State Machine]\n'
+        'System Model=0\n'
+        'Wiring=7\n'
+        '[Temperature Domain 2]\n'
+        'Direction=1\n'
+        '[Keithley 182]\n'
+        'Digital Filter=9\n'
+        'Digital Filter=9\n'
+    )
+    metrics = Counter()
+    with caplog.at_level(logging.WARNING, logger=hall.reader.logger.name):
+        template = hall.reader.parse_txt(str(config), metrics=metrics)
+
+    assert template['/Measurement State Machine/System Model'] == '75XX-LVWR(-HS)'
+    assert template['/Measurement State Machine/Wiring'] == 'UNKNOWN'
+    assert template['/Temperature Domain 2/Direction'] == 'Ascending'
+    assert template['/Keithley 182/Digital Filter'] == 'UNKNOWN'
+    assert metrics == {
+        ('Measurement State Machine', 'Wiring', '7'): 1,
+        ('Keithley 182', 'Digital Filter', '9'): 2,
+    }
+    assert len(caplog.records) == 1
+
+
+def test_enum_section():
+    assert hall.reader.enum_section('/Temperature Domain 1') == 'Temperature Domain'
+    assert hall.reader.enum_section('/Keithley 2000') == 'Keithley 2000'
+
+
+def test_index_measurement_keys():
+    data_template = hall.reader.parse_txt('tests/data/hall/20-154-G_Hall-RT.txt')
+    iv_curve, variable_field = hall.utils.index_measurement_keys(data_template)
+
+    assert iv_curve.measurement_type == 'IV Curve Measurement'
+    assert list(iv_curve.contact_sets) == ['R12,12', 'R23,23', 'R34,34', 'R41,41']
+    resistance, _, _, table = iv_curve.contact_sets['R12,12']
+    assert (resistance.name, resistance.unit) == ('best_fit_resistance', 'ohm')
+    assert table.is_table
+    assert variable_field.measurement_type == 'Variable Field Measurement'
+    assert list(variable_field.data_blocks) == ['0']
+    keys = {key.name: key for key in variable_field.keys}
+    assert keys['field_at_zero_resistivity'].unit == 'G'
+    assert keys['maximum_field'].units is not None
+
+
+def test_measurement_results_are_plain_arrays():
+    data_template = hall.reader.parse_txt('tests/data/hall/20-154-G_Hall-RT.txt')
+    iv_curve, variable_field = hall.utils.get_measurements(data_template)
+
+    for results in (iv_curve.results[0], variable_field.results[0]):
+        field = results.__dict__['field']
+        assert type(field) is np.ndarray
+        assert field.dtype == np.float64
+        assert field.flags['C_CONTIGUOUS']
+    # The field column of the contact sets is written in gauss.
+    assert iv_curve.results[0].field.to('gauss').magnitude[:2] == pytest.approx(
+        [0.01, -0.03]
+    )
@@ -0,0 +1,82 @@
+import pytest
+
+from lakeshore_nomad_plugin.hall import rawfile
+
+CONTENT = '[Sample parameters]\nThickness [µm]: 1.0\nHall Coefficient [cm³/C]: 2.0\n'
+
+
+@pytest.mark.parametrize('encoding', ['iso-8859-1', 'utf-8', 'utf-8-sig'])
+def test_read_text_detects_encoding(tmp_path, encoding):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(CONTENT.encode(encoding))
+
+    assert rawfile.read_text(path) == (
+        '[Sample parameters]\nThickness [um]: 1.0\nHall Coefficient [cm^3/C]: 2.0\n'
+    )
+
+
+def test_open_text_universal_newlines(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(CONTENT.replace('\n', '\r\n').encode('iso-8859-1'))
+
+    with rawfile.open_text(path) as file:
+        lines = list(file)
+
+    assert lines == [
+        '[Sample parameters]\n',
+        'Thickness [um]: 1.0\n',
+        'Hall Coefficient [cm^3/C]: 2.0\n',
+    ]
+
+
+def test_read_text_empty_file(tmp_path):
+    path = tmp_path / 'file.txt'
+    path.touch()
+
+    assert rawfile.read_text(path) == ''
+
+
+def test_decode_explicit_encoding():
+    data = 'Current [µA]'.encode('utf-8')
+
+    assert rawfile.decode(data) == 'Current [uA]'
+    assert rawfile.decode(data, 'iso-8859-1') == 'Current [ÂuA]'
+
+
+@pytest.mark.parametrize('encoding', ['iso-8859-1', 'utf-8', 'utf-8-sig'])
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+def test_open_lines_matches_open_text(tmp_path, encoding, newline):
+    path = tmp_path / 'file.txt'
+    path.write_bytes(CONTENT.replace('\n', newline).encode(encoding))
+
+    with rawfile.open_text(path) as file, rawfile.open_lines(path) as lines:
+        assert list(lines) == list(file)
+
+
+def test_open_lines_detects_encoding_after_first_chunk(tmp_path, monkeypatch):
+    monkeypatch.setattr(rawfile, 'CHUNK_SIZE', 16)
+    path = tmp_path / 'file.txt'
+    # Valid UTF-8 up to the latin-1 micro sign in the last line
+    path.write_bytes(('Field [°]\n' * 10).encode('utf-8') + 'µA\n'.encode('latin-1'))
+
+    with rawfile.open_lines(path) as lines:
+        assert list(lines)[0] == 'Field [Â°]\n'
+    assert rawfile.read_text(path).startswith('Field [Â°]\n')
+
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n', '\r'])
+def test_open_lines_across_chunks(tmp_path, monkeypatch, newline):
+    monkeypatch.setattr(rawfile, 'LINE_CHUNK_SIZE', 3)
+    path = tmp_path / 'file.txt'
+    path.write_bytes(CONTENT.replace('\n', newline).encode('utf-8'))
+
+    with rawfile.open_text(path) as file, rawfile.open_lines(path) as lines:
+        assert list(lines) == list(file)
+
+
+def test_open_lines_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+
+    with rawfile.open_lines(path) as lines:
+        assert list(lines) == []
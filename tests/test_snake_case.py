@@ -0,0 +1,50 @@
+import re
+
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+from lakeshore_nomad_plugin.hall.utils import to_snake_case
+
+
+def reference_to_snake_case(string):
+    """The uncached implementation which `to_snake_case` has to reproduce."""
+    string = string.replace('-', '_')
+    string = re.sub(r'(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])', '_', string)
+    string = string.lower()
+    string = re.sub(r'_{2,}', '_', string)
+    string = re.sub(r'\b\d+\b', lambda match: match.group(0).replace('.', '_'), string)
+    string = re.sub(
+        r'\b(?<!\d)[A-Z]{2,}(?!\w)', lambda match: match.group(0).lower(), string
+    )
+    string = string.replace(' ', '_')
+    string = re.sub(r'(?<=/)_', '', string)
+    string = re.sub(r'_(?=/)', '', string)
+    string = re.sub(r'_{2,}', '_', string)
+    return string
+
+
+KEY_ALPHABET = st.sampled_from(
+    list('aAbBzZ019 _-/.@[],()µ') + ['LS', 'AC', 'Hall', 'R12', '°']
+)
+
+
+@given(st.lists(KEY_ALPHABET, max_size=30).map(''.join))
+@example('My_String-Dashed_LS56 Sep AC / test_ls58_/@with_unit 345')
+@example('/entry/measurement/1_IV Curve Measurement/Contact Sets/R12,12/data0')
+def test_to_snake_case_matches_reference(string):
+    assert to_snake_case(string) == reference_to_snake_case(string)
+
+
+@given(st.text(max_size=40))
+def test_to_snake_case_matches_reference_on_any_text(string):
+    assert to_snake_case(string) == reference_to_snake_case(string)
+
+
+def test_to_snake_case_is_cached():
+    to_snake_case.cache_clear()
+    to_snake_case('Hall Mobility')
+    to_snake_case('Hall Mobility')
+
+    info = to_snake_case.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert info.maxsize is not None
@@ -0,0 +1,95 @@
+import codecs
+import io
+import os
+from glob import glob
+
+import pytest
+
+from lakeshore_nomad_plugin.hall import sniff
+from lakeshore_nomad_plugin.hall.measurement_parser import measurement_parser
+from lakeshore_nomad_plugin.hall.instrument_parser import instrument_parser
+
+HMS_FILE = 'tests/data/hall/HMS-Configuration-Pietsch_Hall-TT-Halter_15-350K.txt'
+
+
+@pytest.mark.parametrize('filename', sorted(glob('tests/data/hall/*.txt')))
+def test_sniff_test_files(filename):
+    expected = (
+        sniff.HMS_CONFIGURATION if filename == HMS_FILE else sniff.LAKESHORE_MEASUREMENT
+    )
+    assert sniff.sniff_file(filename) == expected
+
+
+@pytest.mark.parametrize(
+    'content, kind',
+    [
+        (b'[Sample parameters]\r\nA=1\r\n[Measurements]\r\n', 'measurement'),
+        (codecs.BOM_UTF8 + b'\n[Sample parameters]\n[Measurements]\n', 'measurement'),
+        (b'[SystemParameters]\n[Measurement State Machine]\n', 'configuration'),
+        (b'[Measurements]\n[Sample parameters]\n', 'unrelated'),
+        (b'notes\n[Sample parameters]\n[Measurements]\n', 'unrelated'),
+        (b'[Sample parameters]\nA=1\n', 'unrelated'),
+        (b'', 'unrelated'),
+    ],
+)
+def test_classify_header(content, kind):
+    assert sniff.classify_header(content) == kind
+
+
+def test_sniff_reads_bounded_prefix(tmp_path, monkeypatch):
+    large = tmp_path / 'large.txt'
+    large.write_bytes(b'x' * 10 * 1024**2 + b'\n[Sample parameters]\n[Measurements]\n')
+    late = tmp_path / 'late.txt'
+    late.write_bytes(
+        b'[Sample parameters]\n' + b'A=1\n' * sniff.SNIFF_BYTES + b'[Measurements]\n'
+    )
+
+    reads = []
+
+    class RecordingFile(io.FileIO):
+        def read(self, size=-1):
+            reads.append(size)
+            return super().read(size)
+
+    monkeypatch.setattr(sniff, 'open', RecordingFile, raising=False)
+    assert sniff.sniff_file(str(large)) == sniff.UNRELATED
+    assert reads == [sniff.FIRST_CHUNK]
+    assert sniff.sniff_file(str(late)) == sniff.UNRELATED
+    assert sum(reads) == sniff.SNIFF_BYTES + sniff.FIRST_CHUNK
+
+
+def test_sniff_is_cached(tmp_path):
+    path = tmp_path / 'measurement.txt'
+    path.write_bytes(b'[Sample parameters]\n[Measurements]\n')
+    sniff.sniff_cached.cache_clear()
+
+    assert sniff.sniff_file(str(path)) == sniff.LAKESHORE_MEASUREMENT
+    assert sniff.sniff_file(str(path)) == sniff.LAKESHORE_MEASUREMENT
+    assert sniff.sniff_cached.cache_info().hits == 1
+
+    path.write_bytes(b'[SystemParameters]\n[Measurement State Machine]\n\n')
+    assert sniff.sniff_file(str(path)) == sniff.HMS_CONFIGURATION
+
+
+@pytest.mark.parametrize('filename', sorted(glob('tests/data/hall/*.txt')))
+def test_parsers_match_test_files(filename):
+    with open(filename, 'rb') as file:
+        buffer = file.read(8192)
+    decoded = buffer.decode('iso-8859-1')
+    matches = [
+        entry_point.load().is_mainfile(
+            os.path.abspath(filename), 'text/plain', buffer, decoded
+        )
+        for entry_point in (measurement_parser, instrument_parser)
+    ]
+    if filename == HMS_FILE:
+        # The configuration files are matched by their mime type
+        matches[1] = instrument_parser.load().is_mainfile(
+            os.path.abspath(filename),
+            'application/x-wine-extension-ini',
+            buffer,
+            decoded,
+        )
+        assert matches == [False, True]
+    else:
+        assert matches == [True, False]
@@ -0,0 +1,105 @@
+import logging
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from lakeshore_nomad_plugin.hall import reader, synthetic, utils
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import (
+    build_measurement,
+    iter_steps,
+    parse_file,
+    populate_archive,
+)
+from lakeshore_nomad_plugin.hall.schema import HallMeasurement
+
+
+@pytest.mark.parametrize(
+    'encoding, micro_sign, newline',
+    [
+        ('iso-8859-1', 'µ', '\r\n'),
+        ('utf-8', 'µ', '\n'),
+        ('utf-8', 'μ', '\r\n'),
+    ],
+)
+def test_measurement_file_round_trip(tmp_path, encoding, micro_sign, newline):
+    spec = synthetic.MeasurementSpec(
+        steps=6,
+        rows=7,
+        contact_sets=3,
+        encoding=encoding,
+        micro_sign=micro_sign,
+        newline=newline,
+    )
+    path = synthetic.write_measurement_file(str(tmp_path / 'synthetic.txt'), spec)
+
+    steps = parse_file(path)['Measurements']
+    assert list(steps) == [
+        'Variable Temperature Measurement (1)',
+        'Variable Field Measurement (2)',
+        'IV Curve Measurement (3)',
+        'Variable Temperature Measurement (4)',
+        'Variable Field Measurement (5)',
+        'IV Curve Measurement (6)',
+    ]
+    assert steps['Variable Temperature Measurement (1)']['Hall Mobility'].shape == (7,)
+    assert steps['Variable Field Measurement (2)']['Excitation Current_unit'] == 'uA'
+    contact_sets = steps['IV Curve Measurement (3)']['Contact Sets']
+    assert len(contact_sets) == 3
+    assert contact_sets[0]['Current'].shape == (7,)
+    assert len(populate_archive(parse_file(path))) == 6
+
+    template = reader.parse_txt(path)
+    assert len(list(utils.get_measurements(template))) == 6
+
+
+def test_measurement_file_errors(tmp_path):
+    spec = synthetic.MeasurementSpec(
+        steps=1, step_types=[synthetic.IV_CURVE], rows=200, error_rate=0.2
+    )
+    path = synthetic.write_measurement_file(str(tmp_path / 'synthetic.txt'), spec)
+
+    step = parse_file(path)['Measurements']['IV Curve Measurement (1)']
+    contact_set = step['Contact Sets'][0]
+    assert 0.1 < np.isnan(contact_set['Voltage']).mean() < 0.3
+
+
+def test_measurement_file_is_deterministic(tmp_path):
+    spec = synthetic.MeasurementSpec(steps=3, seed=7)
+    first = synthetic.write_measurement_file(str(tmp_path / 'first.txt'), spec)
+    second = synthetic.write_measurement_file(str(tmp_path / 'second.txt'), spec)
+
+    with open(first, 'rb') as file, open(second, 'rb') as other:
+        assert file.read() == other.read()
+
+
+def test_configuration_file_round_trip(tmp_path):
+    spec = synthetic.ConfigurationSpec(temperature_domains=12)
+    path = synthetic.write_configuration_file(str(tmp_path / 'hms.txt'), spec)
+
+    template = reader.parse_txt(path)
+    instrument = utils.get_instrument(template, logging.getLogger(__name__))
+    assert len(instrument.temperature_domain) == 12
+    assert instrument.hms_software_version == '2.4.1'
+
+
+def test_steps_are_streamed(tmp_path):
+    spec = synthetic.MeasurementSpec(steps=100, rows=50)
+    path = synthetic.write_measurement_file(str(tmp_path / 'synthetic.txt'), spec)
+
+    tracemalloc.start()
+    try:
+        steps = [key for key, _ in iter_steps(path)]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert steps == list(parse_file(path)['Measurements'])
+    assert peak < os.path.getsize(path) / 3
+
+    measurement = build_measurement(path, 'synthetic', logging.getLogger(__name__))
+    expected = HallMeasurement(
+        name='synthetic', measurements=populate_archive(parse_file(path))
+    )
+    steps = measurement.m_to_dict()['measurements']
+    assert steps == expected.m_to_dict()['measurements']
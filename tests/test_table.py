@@ -0,0 +1,36 @@
+import numpy as np
+
+from lakeshore_nomad_plugin.hall.table import decode_table, split_header
+from lakeshore_nomad_plugin.hall.tokenizer import Table
+
+
+def test_split_header():
+    assert split_header('Hall Mobility [cm²/(VS)]') == ('Hall Mobility', 'cm²/(VS)')
+    assert split_header('Type') == ('Type', None)
+
+
+def test_decode_table():
+    table = Table(
+        ['Field [G]', 'Type', 'Temperature [K]'],
+        [['1.0', 'n', 'ERROR'], ['2.0E+1', 'p', '300.5']],
+    )
+
+    decoded = decode_table(table)
+
+    assert decoded.values.dtype == np.float64
+    assert decoded.values.shape == (2, 2)
+    assert decoded.text == {'Type': ['n', 'p']}
+    columns = {name: (unit, values) for name, unit, values in decoded.columns()}
+    assert columns['Field'][0] == 'G'
+    np.testing.assert_array_equal(columns['Field'][1], [1.0, 20.0])
+    np.testing.assert_array_equal(columns['Temperature'][1], [np.nan, 300.5])
+    assert np.shares_memory(columns['Temperature'][1], decoded.values)
+    assert columns['Type'] == (None, ['n', 'p'])
+
+
+def test_decode_malformed_table():
+    table = Table(['Current [A]', 'Voltage [V]'], [['1.0', 'x'], ['2.0']])
+
+    decoded = decode_table(table)
+
+    np.testing.assert_array_equal(decoded.values, [[1.0, 2.0], [np.nan, np.nan]])
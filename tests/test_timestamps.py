@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+import pytz
+from hypothesis import given
+from hypothesis import strategies as st
+
+from lakeshore_nomad_plugin.hall.timestamps import (
+    DATE_FORMATS,
+    TimestampParser,
+    parse_duration,
+    step_times,
+)
+from lakeshore_nomad_plugin.hall.utils import convert_date
+
+
+def reference_parse(value):
+    """Parses like the former `convert_date`, which tried `strptime` in turn."""
+    for date_format in DATE_FORMATS:
+        for fmt in (date_format.format, date_format.format.replace(':', '')):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
+    return None
+
+
+@given(
+    st.datetimes(min_value=datetime(1969, 1, 1), max_value=datetime(2068, 12, 31)),
+    st.sampled_from([date_format.format for date_format in DATE_FORMATS]),
+    st.booleans(),
+)
+def test_parse_matches_strptime(value, date_format, strip_colons):
+    string = value.strftime(date_format)
+    if strip_colons:
+        string = string.replace(':', '')
+    assert TimestampParser().parse(string) == value.replace(microsecond=0)
+    assert TimestampParser().parse(string) == reference_parse(string)
+
+
+@given(st.text(alphabet='0123456789/.: APMapm', max_size=24))
+def test_parse_matches_strptime_on_any_text(string):
+    assert TimestampParser().parse(string) == reference_parse(string)
+
+
+def test_parser_remembers_format():
+    timestamps = TimestampParser()
+    assert timestamps.parse('05.10.2022 13:04:05') == datetime(2022, 10, 5, 13, 4, 5)
+    assert timestamps.format == '%d.%m.%Y %H:%M:%S'
+    assert timestamps.parse('3/16/2023 5:57:37 PM') == datetime(2023, 3, 16, 17, 57, 37)
+    assert timestamps.format == '%m/%d/%Y %I:%M:%S %p'
+    assert timestamps.parse('') is None
+    assert timestamps.parse('31.02.2022 13:04:05') is None
+
+
+def test_convert_date():
+    # Timestamps are in local time of the computer converting them
+    expected = datetime(2020, 8, 21, 16, 59, 23).astimezone(pytz.UTC).isoformat()
+    assert convert_date('08/21/20 165923', 'UTC') == expected
+    assert convert_date('no date') is None
+
+
+def test_parse_duration():
+    assert parse_duration('0:05:51') == 351
+    assert parse_duration('0:0:0') == 0
+    assert parse_duration('26:00:01') == 93601
+    with pytest.raises(ValueError):
+        parse_duration('5 min')
+
+
+def test_step_times():
+    timestamps = TimestampParser()
+    times = step_times(
+        {
+            'Start Time': '3/16/2023 5:57:37 PM',
+            'Skipped at': '3/16/2023 6:00:00 PM',
+            'Elapsed Time': '0:02:23',
+        },
+        timestamps,
+    )
+    assert times.start == datetime(2023, 3, 16, 17, 57, 37)
+    assert times.end == datetime(2023, 3, 16, 18, 0, 0)
+    assert times.skipped
+    assert times.duration == 143
+
+    times = step_times({'Start Time': '', 'Elapsed Time': '0:0:0'}, timestamps)
+    assert times == (None, None, False, 0)
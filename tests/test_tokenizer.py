@@ -0,0 +1,77 @@
+import numpy as np
+
+from lakeshore_nomad_plugin.hall import tokenizer
+from lakeshore_nomad_plugin.hall.measurement_parser.parser import parse_file
+
+IV_FILE = 'tests/data/hall/20-154-G_Hall-RT.txt'
+VT_FILE = 'tests/data/hall/22-127-G_20K-320K_TT-Halter_WDH_060722.txt'
+
+
+def test_tokenize_steps():
+    with open(VT_FILE, encoding='ISO-8859-1') as file:
+        tokens = list(tokenizer.tokenize(file))
+
+    sections = [t.name for t in tokens if isinstance(t, tokenizer.Section)]
+    steps = [t for t in tokens if isinstance(t, tokenizer.Step)]
+    assert sections == ['Sample parameters', 'Measurements']
+    assert [s.number for s in steps] == [str(i) for i in range(1, 8)]
+    assert steps[-1].name == 'Go to Temperature 300.0 [K]'
+    assert tokenizer.KeyValue('Temperature Step', '2.0', 'K') in tokens
+
+
+def test_parse_file_contact_sets():
+    data = parse_file(IV_FILE)
+
+    assert data['Sample parameters']['Thickness_unit'] == 'um'
+    iv_curve = data['Measurements']['IV Curve Measurement (1)']
+    assert iv_curve['Dwell Time'] == '2.0'
+    assert [c['Name'] for c in iv_curve['Contact Sets']] == [
+        'R12,12',
+        'R23,23',
+        'R34,34',
+        'R41,41',
+    ]
+    contact_set = iv_curve['Contact Sets'][0]
+    assert contact_set['Best Fit Resistance_unit'] == 'ohm'
+    assert len(contact_set['Current']) == 11
+    assert contact_set['Voltage'][0] == -1.81674e-2
+    assert np.isnan(contact_set['Temperature']).all()
+
+
+def write_scaled_file(path, repeat):
+    """Writes a variable temperature file with its steps repeated `repeat` times."""
+    with open(VT_FILE, encoding='ISO-8859-1', newline='') as file:
+        header, _, steps = file.read().partition('<Step 1:')
+    steps = '<Step 1:' + steps
+    with open(path, 'w', encoding='ISO-8859-1', newline='') as file:
+        file.write(header)
+        for _ in range(repeat):
+            file.write(steps)
+    return path
+
+
+def tokenize_counted(path):
+    """Returns the tokens of a file and how many lines the tokenizer pulled."""
+    pulled = 0
+
+    def lines(file):
+        nonlocal pulled
+        for line in file:
+            pulled += 1
+            yield line
+
+    with open(path, encoding='ISO-8859-1') as file:
+        tokens = list(tokenizer.tokenize(lines(file)))
+    with open(path, encoding='ISO-8859-1') as file:
+        assert pulled == sum(1 for _ in file)
+    return tokens
+
+
+def test_tokenize_scales_linearly(tmp_path):
+    header, small, large = (
+        len(tokenize_counted(write_scaled_file(tmp_path / f'{repeat}.txt', repeat)))
+        for repeat in (0, 4, 64)
+    )
+
+    # Every line is pulled once and 16 times the steps give 16 times the tokens
+    assert large - header == 16 * (small - header)
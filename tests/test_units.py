@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from lakeshore_nomad_plugin.hall import units
+from lakeshore_nomad_plugin.hall.measurement import VariableTemperatureResults
+from lakeshore_nomad_plugin.hall.utils import set_array
+
+
+@pytest.mark.parametrize(
+    'unit, canonical',
+    [
+        ('Sec', 's'),
+        ('ÂµA', 'µA'),
+        ('cm²/(VS)', 'cm^2/(volt * second)'),
+        ('1/cm³', '1/cm^3'),
+        ('ohm cm', 'ohm * cm'),
+        ('K', 'K'),
+    ],
+)
+def test_canonical_unit(unit, canonical):
+    assert units.canonical_unit(unit) == canonical
+
+
+def test_unit_info():
+    assert units.base_unit_factor('kG') == pytest.approx(0.1)
+    assert units.base_unit_factor('ohm cm') == pytest.approx(0.01)
+    assert units.unit_info('ÂµA').quantity.units == units.unit_info('µA').quantity.units
+
+
+def test_unit_conversion():
+    assert units.unit_conversion('G', 'tesla').scale == pytest.approx(1e-4)
+    assert units.unit_conversion(
+        'cm²/(VS)', 'centimeter ** 2 / volt / second'
+    ) == units.Conversion(1, 0)
+    assert units.unit_conversion('uA', 'ampere').apply(2.0) == pytest.approx(2e-6)
+
+
+def test_offset_unit_conversion():
+    conversion = units.unit_conversion('°C', 'kelvin')
+    assert conversion.apply(20.0) == pytest.approx(293.15)
+    assert units.unit_conversion('G', 'tesla').offset == 0
+
+    results = VariableTemperatureResults()
+    set_array(results, 'temperature', np.array([20.0, 30.0]), '°C')
+    np.testing.assert_allclose(
+        results.temperature.to('kelvin').magnitude, [293.15, 303.15]
+    )
+
+
+def test_unit_cache_counters():
+    units.clear_unit_cache()
+
+    for _ in range(3):
+        units.base_unit_factor('nA')
+
+    info = units.unit_cache_info()['unit_info']
+    assert info['misses'] == 1
+    assert info['hits'] == 2
+    assert info['currsize'] == 1
+    assert info['maxsize'] == units.UNIT_CACHE_SIZE